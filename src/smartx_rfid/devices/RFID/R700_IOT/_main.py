@@ -13,6 +13,7 @@ from .reader_config_example import R700_IOT_config_example
 
 
 from smartx_rfid.devices._base import DeviceBase
+from smartx_rfid.devices.reconnect import Backoff, ReconnectPolicy, connect_limiter, get_policy
 
 
 class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
@@ -30,6 +31,7 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
         start_reading: bool = False,
         # Firmware Version
         firmware_version: str = "8.4.1",
+        reconnect_policy: ReconnectPolicy | None = None,
     ):
         """
         Create R700 RFID reader.
@@ -42,6 +44,7 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
             password: Login password
             start_reading: Start reading tags automatically
             firmware_version: Expected firmware version
+            reconnect_policy: Backoff between connection attempts (default: the R700_IOT policy)
         """
         self.name = name
         self.device_type = "rfid"
@@ -66,12 +69,15 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
         self.auth = httpx.BasicAuth(self.username, self.password)
 
         self.tags_to_write = {}
+        self.init_write_vars()
 
         self.is_connected = False
         self.is_reading = False
         self._stop_connection = False
         self._command_lock = asyncio.Lock()  # Lock para evitar comandos concorrentes
         self._session: httpx.AsyncClient | None = None  # Sessão HTTP reutilizável
+        self.backoff = Backoff(reconnect_policy or get_policy("R700_IOT"))
+        self.connect_limiter = connect_limiter
 
         self.firmware_version = firmware_version
 
@@ -139,14 +145,14 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
                 self.is_connected = False
                 self.is_reading = False
 
-                # Configure interface
-                async with self._command_lock:
+                # Configure interface (first request of an attempt, under the shared attempt limit)
+                async with self.connect_limiter.slot(), self._command_lock:
                     success = await self.configure_interface(self._session)
                     if not success:
                         logging.warning(f"{self.name} - Failed to configure interface")
                         await self._session.aclose()
                         self._session = None
-                        await asyncio.sleep(1)
+                        await self.backoff.wait(self.name)
                         continue
 
                 # Check firmware version
@@ -157,7 +163,7 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
                     )
                     await self._session.aclose()
                     self._session = None
-                    await asyncio.sleep(5)
+                    await self.backoff.wait(self.name)
                     continue
 
                 # Stop any ongoing profiles
@@ -167,7 +173,7 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
                         logging.warning(f"{self.name} - Failed to stop profiles")
                         await self._session.aclose()
                         self._session = None
-                        await asyncio.sleep(1)
+                        await self.backoff.wait(self.name)
                         continue
 
                 # Start inventory if needed
@@ -178,7 +184,7 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
                             logging.warning(f"{self.name} - Failed to start inventory")
                             await self._session.aclose()
                             self._session = None
-                            await asyncio.sleep(1)
+                            await self.backoff.wait(self.name)
                             continue
                 if self.start_reading:
                     self.is_reading = True
@@ -192,6 +198,7 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
                         asyncio.create_task(self.write_gpo(pin=i, state=False))
 
                 self.is_connected = True
+                self.backoff.reset()
                 self.on_event(self.name, "connection", True)
 
                 # Manter conexão com stream de dados
@@ -204,7 +211,7 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
                     self._session = None
                 self.is_connected = False
                 self.on_event(self.name, "connection", False)
-                await asyncio.sleep(2)
+                await self.backoff.wait(self.name)
 
     async def write_gpo(
         self,
@@ -235,7 +242,15 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
         except Exception as e:
             logging.warning(f"{self.name} - Failed to set GPO: {e}")
 
-    async def write_epc(self, target_identifier: str | None, target_value: str | None, new_epc: str, password: str):
+    async def write_epc(
+        self,
+        target_identifier: str | None,
+        target_value: str | None,
+        new_epc: str,
+        password: str,
+        wait: bool = False,
+        timeout: float = 5.0,
+    ) -> bool:
         """
         Write new EPC code to RFID tag.
 
@@ -244,9 +259,11 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
             target_value: Current tag value to match
             new_epc: New EPC code to write
             password: Tag access password
-        """
-        """
-        Writes a new EPC (Electronic Product Code) to RFID tags.
+            wait: Wait for the tagAccessEvent reporting the write result
+            timeout: Seconds to wait for the result when ``wait`` is set
+
+        Returns:
+            bool: True if the write was accepted (or, with ``wait``, completed on the tag)
         """
         try:
             validated_tag = WriteTagValidator(
@@ -255,10 +272,17 @@ class R700_IOT(DeviceBase, OnEvent, ReaderHelpers, WriteCommands):
                 new_epc=new_epc,
                 password=password,
             )
-            logging.info(
-                f"{self.name} - Writing EPC: {validated_tag.new_epc} (Current: {validated_tag.target_identifier}={validated_tag.target_value})"
-            )
-            cmd = self.get_write_cmd(validated_tag)
-            await self.send_write_command(cmd)
         except Exception as e:
             logging.warning(f"{self.name} - Write validation error: {e}")
+            return False
+
+        logging.info(
+            f"{self.name} - Writing EPC: {validated_tag.new_epc} (Current: {validated_tag.target_identifier}={validated_tag.target_value})"
+        )
+        write_id, future = self._register_write(validated_tag.new_epc)
+        cmd = self.get_write_cmd(validated_tag, identifier_prefix=f"{write_id}-")
+        success = await self.send_write_command(cmd)
+        if not success or not wait:
+            self._pending_writes.pop(write_id, None)
+            return success
+        return await self.wait_write(write_id, future, timeout)
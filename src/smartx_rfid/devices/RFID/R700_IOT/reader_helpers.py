@@ -155,6 +155,8 @@ class ReaderHelpers:
                                 self.create_task(self.on_tag(tagEvent))
                             else:
                                 asyncio.create_task(self.on_tag(tagEvent))
+                        elif "tagAccessEvent" in jsonEvent:
+                            self.on_tag_access(jsonEvent["tagAccessEvent"])
 
                     except (json.JSONDecodeError, UnicodeDecodeError) as parse_error:
                         logging.warning(f"{self.name} - Failed to parse event: {parse_error}")
@@ -166,6 +168,8 @@ class ReaderHelpers:
             logging.warning(f"{self.name} - Data stream error: {e}")
         finally:
             logging.info(f"{self.name} - Data stream ended")
+            # Results of in-flight writes can no longer arrive
+            self.fail_pending_writes()
             # Se não foi uma desconexão intencional, marcar como desconectado
             if not self._stop_connection:
                 self.is_connected = False
@@ -1,16 +1,142 @@
+import asyncio
+import itertools
 import logging
 
 import httpx
 
+from smartx_rfid.schemas.tag import WriteTagValidator
+
+# Access command result values read as a finished block write
+WRITE_SUCCESS = ("success", "succeeded", "ok")
+WRITE_FAILURE = (
+    "failure",
+    "failed",
+    "error",
+    "tag-not-found",
+    "no-response-from-tag",
+    "insufficient-power",
+    "memory-locked",
+    "memory-overrun",
+    "incorrect-password",
+    "nonspecific-tag-error",
+    "nonspecific-reader-error",
+)
+
 
 class WriteCommands:
     """RFID tag write commands for R700 reader."""
 
-    def get_write_cmd(self, tag):
+    def init_write_vars(self):
+        """Set up tracking of writes waiting for their tagAccessEvent result."""
+        self._write_ids = itertools.count(1)
+        # write id -> {"future", "new_epc", "remaining"}
+        self._pending_writes: dict[str, dict] = {}
+
+    def _register_write(self, new_epc: str) -> tuple[str, asyncio.Future]:
+        write_id = f"w{next(self._write_ids)}"
+        future = asyncio.get_running_loop().create_future()
+        self._pending_writes[write_id] = {"future": future, "new_epc": new_epc, "remaining": {"1", "2", "3"}}
+        return write_id, future
+
+    def _resolve_write(self, write_id: str, success: bool):
+        pending = self._pending_writes.pop(write_id, None)
+        if pending is None:
+            return
+        if not pending["future"].done():
+            pending["future"].set_result(success)
+        self.on_event(self.name, "write", {"epc": pending["new_epc"], "success": success})
+
+    def fail_pending_writes(self):
+        """Resolve every pending write as failed (e.g. when the data stream is lost)."""
+        for write_id in list(self._pending_writes):
+            self._resolve_write(write_id, False)
+
+    def on_tag_access(self, event: dict):
+        """Resolve pending writes from a tagAccessEvent received on the data stream.
+
+        Results are matched by access command identifier (``<write id>-<n>``). A
+        write succeeds once all of its block writes report success and fails on the
+        first one reporting a known failure. Events without identifiers fall back to
+        matching the reported EPC against the EPC being written, unless they carry a
+        status that is not a success.
+
+        Payloads or result values that are not recognized never fail a write: they
+        are logged and passed on as a ``tag_access`` event, and the write stays
+        pending until a known result arrives or ``wait_write`` times out.
+
+        Args:
+            event: Content of the tagAccessEvent
+        """
+        results = None
+        for key in ("accessCommandResults", "commandResults", "results"):
+            if isinstance(event.get(key), list):
+                results = event[key]
+                break
+
+        if not results:
+            statuses = {str(event[key]).lower() for key in ("result", "status") if key in event}
+            if statuses - set(WRITE_SUCCESS):
+                # A failure or an unknown status: the EPC alone does not prove the write
+                self._pass_tag_access(event, f"status {', '.join(sorted(statuses))}")
+                return
+            epc = (event.get("epcHex") or "").lower()
+            for write_id, pending in list(self._pending_writes.items()):
+                if pending["new_epc"] == epc:
+                    self._resolve_write(write_id, True)
+                    return
+            self._pass_tag_access(event, "no matching write")
+            return
+
+        unrecognized = False
+        for result in results:
+            identifier = str(result.get("identifier", ""))
+            write_id, _, command = identifier.rpartition("-")
+            pending = self._pending_writes.get(write_id)
+            if pending is None:
+                unrecognized = True
+                continue
+            status = str(result.get("result", result.get("status", ""))).lower()
+            if status in WRITE_FAILURE:
+                logging.warning(f"{self.name} - Write {write_id} command {command} failed: {status}")
+                self._resolve_write(write_id, False)
+            elif status in WRITE_SUCCESS:
+                pending["remaining"].discard(command)
+                if not pending["remaining"]:
+                    self._resolve_write(write_id, True)
+            else:
+                unrecognized = True
+        if unrecognized:
+            self._pass_tag_access(event, "unrecognized result")
+
+    def _pass_tag_access(self, event: dict, reason: str):
+        logging.info(f"{self.name} - tagAccessEvent not applied to a write ({reason}): {event}")
+        self.on_event(self.name, "tag_access", event)
+
+    async def wait_write(self, write_id: str, future: asyncio.Future, timeout: float) -> bool:
+        """Wait for a registered write result.
+
+        Args:
+            write_id: Write identifier returned when the write was registered
+            future: Future resolved by on_tag_access
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            bool: True if the tag was written, False on failure or timeout
+        """
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"{self.name} - Write {write_id} timed out after {timeout}s")
+            self._pending_writes.pop(write_id, None)
+            return False
+
+    def get_write_cmd(self, tag, identifier_prefix: str = ""):
         """Generate write command for tag programming.
 
         Args:
             tag: Tag data with target and new EPC
+            identifier_prefix: Prefix for access command identifiers, keeps them
+                unique when several configurations go in the same request
 
         Returns:
             dict: Write command for R700 API
@@ -23,7 +149,7 @@ class WriteCommands:
         return {
             "accessCommands": [
                 {
-                    "identifier": "1",
+                    "identifier": f"{identifier_prefix}1",
                     "blockWrite": {
                         "memoryBank": "epc",
                         "wordOffset": 2,
@@ -31,7 +157,7 @@ class WriteCommands:
                     },
                 },
                 {
-                    "identifier": "2",
+                    "identifier": f"{identifier_prefix}2",
                     "blockWrite": {
                         "memoryBank": "epc",
                         "wordOffset": 4,
@@ -39,7 +165,7 @@ class WriteCommands:
                     },
                 },
                 {
-                    "identifier": "3",
+                    "identifier": f"{identifier_prefix}3",
                     "blockWrite": {
                         "memoryBank": "epc",
                         "wordOffset": 6,
@@ -59,12 +185,78 @@ class WriteCommands:
             ],
         }
 
-    async def send_write_command(self, write_command):
+    async def send_write_command(self, write_command) -> bool:
+        """Send one or more access configurations in a single request.
+
+        Uses the persistent session when connected so writes reuse the open
+        TLS connection instead of doing a new handshake each time.
+
+        Args:
+            write_command: Access configuration or list of configurations
+
+        Returns:
+            bool: True if the reader accepted the request
+        """
         if not isinstance(write_command, list):
             write_command = [write_command]
         payload = {"accessConfigurations": write_command}
         try:
-            async with httpx.AsyncClient(auth=self.auth, verify=False, timeout=10.0) as session:
-                await self.post_to_reader(session, self.endpoint_write, payload=payload)
+            async with self._command_lock:
+                if self._session is not None and not self._session.is_closed:
+                    return await self.post_to_reader(self._session, self.endpoint_write, payload=payload)
+                async with httpx.AsyncClient(auth=self.auth, verify=False, timeout=10.0) as session:
+                    return await self.post_to_reader(session, self.endpoint_write, payload=payload)
         except Exception as e:
             logging.warning(f"{self.name} - Failed to Write: {e}")
+            return False
+
+    async def write_epc_many(
+        self, tags: list[dict | WriteTagValidator], wait: bool = False, timeout: float = 5.0
+    ) -> list[dict]:
+        """Write several tags with a single tag-access request.
+
+        Args:
+            tags: Write requests, as dicts with the WriteTagValidator fields or validated objects
+            wait: Wait for each tag's tagAccessEvent instead of only the request acceptance
+            timeout: Seconds to wait for the write results when ``wait`` is set
+
+        Returns:
+            list[dict]: One result per input tag, in order, with
+                ``new_epc``, ``success`` and ``error`` keys
+        """
+        results = []
+        sent = []
+        commands = []
+        for tag in tags:
+            try:
+                validated_tag = tag if isinstance(tag, WriteTagValidator) else WriteTagValidator(**tag)
+            except Exception as e:
+                new_epc = tag.get("new_epc") if isinstance(tag, dict) else None
+                results.append({"new_epc": new_epc, "success": False, "error": str(e)})
+                continue
+
+            write_id, future = self._register_write(validated_tag.new_epc)
+            result = {"new_epc": validated_tag.new_epc, "success": False, "error": None}
+            results.append(result)
+            sent.append((write_id, future, result))
+            commands.append(self.get_write_cmd(validated_tag, identifier_prefix=f"{write_id}-"))
+
+        if not commands:
+            return results
+
+        logging.info(f"{self.name} - Writing {len(commands)} EPC(s) in one request")
+        success = await self.send_write_command(commands)
+        if not success or not wait:
+            for write_id, _, result in sent:
+                self._pending_writes.pop(write_id, None)
+                result["success"] = success
+                if not success:
+                    result["error"] = "Write request rejected by reader"
+            return results
+
+        outcomes = await asyncio.gather(*(self.wait_write(write_id, future, timeout) for write_id, future, _ in sent))
+        for (_, _, result), written in zip(sent, outcomes):
+            result["success"] = written
+            if not written:
+                result["error"] = "Tag write failed or timed out"
+        return results
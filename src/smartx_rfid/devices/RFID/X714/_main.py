@@ -1,17 +1,23 @@
-import asyncio
 import logging
 
 from typing import Callable
 
 from .ble_protocol import BLEProtocol
+from .command_layer import CommandLayer
 from .on_receive import OnReceive
 from .rfid import RfidCommands
 from .serial_protocol import SerialProtocol
 from .tcp_protocol import TCPProtocol
+from .write_buffer import WriteBuffer
 from .write_commands import WriteCommands
 
 from smartx_rfid.utils.event import on_event
 from smartx_rfid.devices._base import DeviceBase
+from smartx_rfid.devices.dns_cache import dns_cache
+from smartx_rfid.devices.heartbeat import heartbeat
+from smartx_rfid.devices.port_discovery import port_discovery
+from smartx_rfid.devices.reconnect import Backoff, ReconnectPolicy, connect_limiter, get_policy
+from smartx_rfid.devices.tcp_listener import tcp_listener
 
 ant_default_config = {
     "1": {"active": True, "power": 22, "rssi": -120},
@@ -21,7 +27,17 @@ ant_default_config = {
 }
 
 
-class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, WriteCommands, TCPProtocol):
+class X714(
+    DeviceBase,
+    SerialProtocol,
+    OnReceive,
+    RfidCommands,
+    BLEProtocol,
+    WriteCommands,
+    TCPProtocol,
+    CommandLayer,
+    WriteBuffer,
+):
     """RFID reader that supports SERIAL, TCP and BLE connections."""
 
     def __init__(
@@ -36,8 +52,14 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
         # TCP
         ip: str | None = "192.168.1.100",
         tcp_port: int = 23,
+        tcp_mode: str = "CLIENT",  # CLIENT (dial out) or SERVER (reader connects in)
+        listen_host: str = "0.0.0.0",
+        tcp_hello: str | None = None,
+        heartbeat_interval: float = 10,
+        heartbeat_timeout: float | None = None,
         # BLE
         ble_name: str = "SMTX",
+        ble_thread: bool = False,
         # GENERIC
         buzzer: bool = False,
         session: int = 1,  # 0, 1, 2, 3
@@ -50,6 +72,7 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
         decode_gtin: bool = False,
         hotspot: bool = True,
         reconnection_time: int = 3,
+        reconnect_policy: ReconnectPolicy | None = None,
         prefix: str = "",
         protected_inventory_password: str | None = None,
         # Antenna config
@@ -58,6 +81,9 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
         active_ant: list[int] | None = [1],
         read_power: int = 22,
         read_rssi: int = -120,
+        # Commands
+        max_in_flight: int = 4,
+        command_timeout: float = 3.0,
     ):
         """
         Create X714 RFID reader.
@@ -70,8 +96,14 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
             vid: USB vendor ID for auto-detect
             pid: USB product ID for auto-detect
             ip: IP address for TCP connection
-            tcp_port: TCP port number
+            tcp_port: TCP port number (listening port in SERVER mode)
+            tcp_mode: CLIENT connects to the reader; SERVER waits for the reader to connect in
+            listen_host: Address to listen on in SERVER mode
+            tcp_hello: First line the reader sends to identify itself in SERVER mode (None identifies it by IP)
+            heartbeat_interval: Seconds between TCP pings
+            heartbeat_timeout: Seconds without data before the TCP peer is considered dead (None disables)
             ble_name: Bluetooth device name
+            ble_thread: Run BLE on a dedicated thread and loop instead of the caller's loop
             buzzer: Make sound when reading tags
             session: EPC session number (0-3)
             start_reading: Start reading tags automatically
@@ -82,13 +114,16 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
             keyboard: Act like keyboard input
             decode_gtin: Decode GTIN barcodes
             hotspot: Enable hotspot mode
-            reconnection_time: Seconds to wait before reconnect
+            reconnection_time: Seconds to wait for a serial port or BLE scan before retrying
+            reconnect_policy: Backoff between connection attempts (default: the X714 policy)
             prefix: Text to add before tag data
             protected_inventory_password: Password for protected reading
             ant_dict: Custom antenna settings
             active_ant: Which antennas to use
             read_power: TX power in dBm
             read_rssi: RSSI threshold in dBm
+            max_in_flight: Maximum commands awaiting a reply at the same time
+            command_timeout: Seconds to wait for a command reply
         """
         DeviceBase.__init__(self)
 
@@ -109,13 +144,27 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
         self.vid = vid
         self.pid = pid
         self.is_auto = self.port == "AUTO"
+        self.port_discovery = port_discovery
 
         # TCP CONFIG
         self.ip = ip
         self.tcp_port = tcp_port
+        if tcp_mode in ["CLIENT", "SERVER"]:
+            self.tcp_mode = tcp_mode
+        else:
+            self.tcp_mode = "CLIENT"
+            logging.warning(f"[{self.name}] Invalid tcp_mode '{tcp_mode}' set to 'CLIENT'")
+        self.listen_host = listen_host
+        self.tcp_hello = tcp_hello
+        self.tcp_listener = tcp_listener
+        self.dns_cache = dns_cache
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.heartbeat = heartbeat
 
         # BLE CONFIG
         self.ble_name = ble_name
+        self.ble_thread = ble_thread
         self.init_ble_vars()
 
         # GENERIC CONFIG
@@ -133,6 +182,8 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
         self.decode_gtin = decode_gtin
         self.hotspot = hotspot
         self.reconnection_time = reconnection_time
+        self.backoff = Backoff(reconnect_policy or get_policy("X714"))
+        self.connect_limiter = connect_limiter
         self.prefix = prefix
         self.protected_inventory_password = protected_inventory_password
 
@@ -150,7 +201,13 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
                 self.ant_dict[ant]["power"] = read_power
                 self.ant_dict[ant]["rssi"] = read_rssi
 
+        # COMMANDS
+        self.init_command_vars(max_in_flight, command_timeout)
+        self.init_write_buffer()
+
         self.transport = None
+        self.reader = None
+        self.writer = None
         self.on_con_lost = None
         self.rx_buffer = bytearray()
         self.last_byte_time = None
@@ -172,16 +229,9 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
         """
         if self.connection_type == "SERIAL":
             self.write_serial(to_send, verbose)
-        elif self.connection_type == "BLE":
-            if hasattr(self, "create_task"):
-                self.create_task(self.write_ble(to_send.encode(), verbose))
-            else:
-                asyncio.create_task(self.write_ble(to_send.encode(), verbose))
         else:
-            if hasattr(self, "create_task"):
-                self.create_task(self.write_tcp(to_send, verbose))
-            else:
-                asyncio.create_task(self.write_tcp(to_send, verbose))
+            # TCP and BLE pay per write, so merge commands sent in the same loop iteration
+            self.queue_write(to_send, verbose)
 
     async def connect(self):
         """Connect to reader using configured connection type."""
@@ -189,6 +239,8 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
             await self.connect_serial()
         elif self.connection_type == "BLE":
             await self.connect_ble()
+        elif self.tcp_mode == "SERVER":
+            await self.listen_tcp()
         else:
             await self.connect_tcp(self.ip, self.tcp_port)
 
@@ -216,6 +268,7 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
                     except Exception:
                         pass
             elif self.connection_type == "TCP":
+                self.tcp_listener.unregister(self)
                 if getattr(self, "writer", None):
                     try:
                         self.writer.close()
@@ -234,5 +287,7 @@ class X714(DeviceBase, SerialProtocol, OnReceive, RfidCommands, BLEProtocol, Wri
         except Exception:
             pass
 
+        self.port_discovery.release(self)
+
         # final cleanup of device tasks
         await self.shutdown()
@@ -4,7 +4,10 @@ import sys
 import threading
 from typing import Optional
 
-from bleak import BleakClient, BleakScanner
+from bleak import BleakClient
+
+from smartx_rfid.devices.ble_scanner import BLEScannerService, ble_scanner
+from smartx_rfid.devices.reconnect import ConnectLimiter
 
 if sys.platform == "win32":
     from bleak.backends.winrt.util import allow_sta
@@ -19,6 +22,7 @@ if allow_sta:
 SERVICE_UUID = "6E400001-B5A3-F393-E0A9-E50E24DCCA9E"
 CHARACTERISTIC_RX = "6E400002-B5A3-F393-E0A9-E50E24DCCA9E"  # Write (ESP32 receives)
 CHARACTERISTIC_TX = "6E400003-B5A3-F393-E0A9-E50E24DCCA9E"  # Notify (ESP32 sends)
+BLE_IDLE_FLUSH = 0.1  # Seconds before an unterminated notification line is delivered
 
 
 class BLEProtocol:
@@ -28,16 +32,128 @@ class BLEProtocol:
         self.connected_ble_event = asyncio.Event()
         self.ble_stop = False
         self.notify_enabled = False
+        self.ble_scanner = ble_scanner
+        # Loop running connect_and_run, and the caller's loop when BLE runs in its own thread
+        self._ble_loop: asyncio.AbstractEventLoop | None = None
+        self._ble_main_loop: asyncio.AbstractEventLoop | None = None
+        self._ble_posted: list[tuple] = []
+        self._ble_post_lock = threading.Lock()
+        self._ble_post_scheduled = False
+        # Notification reassembly
+        self.ble_rx_buffer = bytearray()
+        self._ble_last_rx = 0.0
+        self._ble_flush_handle: asyncio.TimerHandle | None = None
+
+    def _post_to_main(self, func, *args):
+        """Run a callback on the caller's loop.
+
+        In thread mode calls are queued and handed over with a single
+        call_soon_threadsafe per batch; otherwise they run immediately.
+        """
+        main_loop = self._ble_main_loop
+        if main_loop is None or main_loop.is_closed():
+            func(*args)
+            return
+        with self._ble_post_lock:
+            self._ble_posted.append((func, args))
+            if self._ble_post_scheduled:
+                return
+            self._ble_post_scheduled = True
+        main_loop.call_soon_threadsafe(self._run_ble_posted)
+
+    def _run_ble_posted(self):
+        with self._ble_post_lock:
+            posted, self._ble_posted = self._ble_posted, []
+            self._ble_post_scheduled = False
+        for func, args in posted:
+            try:
+                func(*args)
+            except Exception as e:
+                logging.warning(f"{self.name} - [BLE Callback Error] {e}")
+
+    # ---------------- Framing ----------------
+    def on_ble_data(self, data: bytes | bytearray):
+        """Reassemble GATT notifications into lines.
+
+        Uses the same framing as serial: bytes are buffered and every complete
+        newline-terminated line is passed to on_receive, so lines split across
+        notifications or packed several per notification are delivered whole.
+        A trailing partial line is flushed after ``BLE_IDLE_FLUSH`` seconds
+        without data, for firmware that does not terminate its notifications.
+
+        Args:
+            data: Notification payload
+        """
+        buffer = self.ble_rx_buffer
+        buffer += data
+        loop = asyncio.get_running_loop()
+        self._ble_last_rx = loop.time()
+
+        lines = []
+        start = 0
+        end = buffer.find(b"\n")
+        while end != -1:
+            line = bytes(buffer[start:end])
+            if line.strip():
+                lines.append(line)
+            start = end + 1
+            end = buffer.find(b"\n", start)
+        del buffer[:start]
+
+        if lines:
+            self._post_to_main(self._receive_ble_lines, lines)
+        if buffer and self._ble_flush_handle is None:
+            self._ble_flush_handle = loop.call_later(BLE_IDLE_FLUSH, self._flush_ble_partial)
+
+    def _flush_ble_partial(self):
+        self._ble_flush_handle = None
+        if not self.ble_rx_buffer:
+            return
+        loop = asyncio.get_running_loop()
+        remaining = self._ble_last_rx + BLE_IDLE_FLUSH - loop.time()
+        if remaining > 0:
+            self._ble_flush_handle = loop.call_later(remaining, self._flush_ble_partial)
+            return
+        line = bytes(self.ble_rx_buffer)
+        self.ble_rx_buffer.clear()
+        if line.strip():
+            self._post_to_main(self._receive_ble_lines, [line])
+
+    def _receive_ble_lines(self, lines: list[bytes]):
+        for line in lines:
+            self.on_receive(line)
+
+    def _reset_ble_framing(self):
+        if self._ble_flush_handle is not None:
+            self._ble_flush_handle.cancel()
+            self._ble_flush_handle = None
+        self.ble_rx_buffer.clear()
 
     # ---------------- Utilities ----------------
+    def ble_payload_size(self) -> int:
+        """Return the largest payload of one GATT write (ATT MTU minus 3)."""
+        mtu = getattr(self.client_ble, "mtu_size", None) or 23
+        return max(mtu - 3, 20)
+
     async def write_ble(self, data: bytes, verbose: bool = False) -> bool:
-        """Send data via BLE with connection check and lock."""
+        """Send data via BLE with connection check and lock.
+
+        Data longer than the negotiated MTU is split into MTU-sized writes,
+        sent back to back while holding the lock so chunks are not interleaved.
+        """
+        ble_loop = self._ble_loop
+        if ble_loop is not None and ble_loop is not asyncio.get_running_loop():
+            # The client belongs to the BLE thread loop
+            future = asyncio.run_coroutine_threadsafe(self.write_ble(data, verbose), ble_loop)
+            return await asyncio.wrap_future(future)
         if not self.client_ble or not self.client_ble.is_connected:
             logging.warning(f"{self.name} - ⚠️ BLE client not connected")
             return False
+        size = self.ble_payload_size()
         async with self.client_ble_lock:
             try:
-                await self.client_ble.write_gatt_char(CHARACTERISTIC_RX, data)
+                for offset in range(0, len(data), size):
+                    await self.client_ble.write_gatt_char(CHARACTERISTIC_RX, data[offset : offset + size])
                 if verbose:
                     logging.info(f"{self.name} - [BLE TX] {data}")
                 return True
@@ -46,16 +162,16 @@ class BLEProtocol:
                 return False
 
     async def scan_for_device(self) -> Optional[str]:
-        """Scan for devices whose name starts with the defined prefix."""
+        """Wait on the shared scanner for a device whose name starts with the defined prefix."""
         while not self.ble_stop:
             logging.info(f"{self.name} - 🔍 Scanning BLE devices...")
             try:
-                devices = await BleakScanner.discover(timeout=5.0)
-                for d in devices:
-                    if d.name and d.name.startswith(self.ble_name):
-                        logging.info(f"{self.name} - ✅ Device found: {d.address} ({d.name})")
-                        return d.address
-                logging.warning(f"{self.name} - ❌ Device not found, retrying in 3s...")
+                address = await self.ble_scanner.find(self.ble_name, owner=self, timeout=5.0)
+                if address:
+                    logging.info(f"{self.name} - ✅ Device found: {address}")
+                    return address
+                logging.warning(f"{self.name} - ❌ Device not found, still scanning...")
+                continue
             except Exception as e:
                 logging.warning(f"{self.name} - [Scan Error] {e}")
             await asyncio.sleep(self.reconnection_time)
@@ -64,12 +180,13 @@ class BLEProtocol:
     # ---------------- Main Connection ----------------
     async def connect_and_run(self):
         """Main BLE connection and operation loop."""
+        self._ble_loop = asyncio.get_running_loop()
         while not self.ble_stop:
             try:
                 # Se já estava conectado antes, emite o evento de desconexão
                 if self.is_connected:
                     self.is_connected = False
-                    self.on_event(self.name, "connection", False)
+                    self._post_to_main(self.on_event, self.name, "connection", False)
 
                 # Escolhe o endereço conforme o modo
                 if self.is_auto:
@@ -84,26 +201,28 @@ class BLEProtocol:
                 client = BleakClient(address)
 
                 try:
-                    await asyncio.wait_for(client.connect(), timeout=5.0)
+                    async with self.connect_limiter.slot():
+                        await asyncio.wait_for(client.connect(), timeout=5.0)
                 except asyncio.TimeoutError:
                     logging.warning(f"{self.name} - ⏰ Connection attempt timed out")
-                    await asyncio.sleep(self.reconnection_time)
+                    await self.backoff.wait(self.name)
                     continue
 
                 if not client.is_connected:
                     logging.warning(f"{self.name} - ❌ Failed to connect.")
-                    await asyncio.sleep(self.reconnection_time)
+                    await self.backoff.wait(self.name)
                     continue
+                self.backoff.reset()
 
                 async with client:
                     logging.info(f"{self.name} - 🔗 Connected to device")
                     self.client_ble = client
                     self.connected_ble_event.set()
+                    self._reset_ble_framing()
 
                     # Notification callback
                     def handle_notification(sender, data: bytearray):
-                        decoded = data.decode(errors="ignore")
-                        self.on_receive(decoded)
+                        self.on_ble_data(data)
 
                     # Habilita notificações automaticamente
                     self.notify_enabled = False
@@ -113,9 +232,9 @@ class BLEProtocol:
                                 try:
                                     await client.start_notify(char.uuid, handle_notification)
                                     self.is_connected = True
-                                    self.on_event(self.name, "connection", True)
+                                    self._post_to_main(self.on_event, self.name, "connection", True)
                                     logging.info(f"{self.name} - ✅ BLE connection successfully established.")
-                                    self.config_reader()
+                                    self._post_to_main(self.config_reader)
                                     self.notify_enabled = True
                                 except Exception as e:
                                     logging.warning(f"{self.name} - [Notify Error] {char.uuid}: {e}")
@@ -134,24 +253,43 @@ class BLEProtocol:
 
             except BleakError as e:
                 logging.warning(f"{self.name} - [BLE Error] {e}")
-                await asyncio.sleep(self.reconnection_time)
+                await self.backoff.wait(self.name)
             except Exception as e:
                 logging.warning(f"{self.name} - [Unexpected BLE Error] {e}")
-                await asyncio.sleep(self.reconnection_time)
+                await self.backoff.wait(self.name)
             finally:
                 self.connected_ble_event.clear()
                 self.client_ble = None
+                self.ble_scanner.release(self)
+                self._post_to_main(self.fail_pending_commands)
+
+    # ---------------- Entry Point ----------------
+    async def connect_ble(self):
+        """Run the BLE loop.
+
+        By default connect_and_run runs as a tracked task on the running loop.
+        With ``ble_thread`` it runs on its own loop in a daemon thread instead,
+        and callbacks are marshalled back to this loop in batches.
+        """
+        if not self.ble_thread:
+            await self.create_task(self.connect_and_run())
+            return
 
-    # ---------------- Thread Wrapper ----------------
-    def connect_ble(self):
-        """Run BLE loop in a separate thread (ideal for FastAPI)."""
+        self._ble_main_loop = asyncio.get_running_loop()
+        # The shared scanner and attempt limit live on the caller's loop; the thread needs its own
+        self.ble_scanner = BLEScannerService()
+        self.connect_limiter = ConnectLimiter(1)
 
         def run_loop():
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             loop.run_until_complete(self.connect_and_run())
 
-        threading.Thread(target=run_loop, daemon=True).start()
+        thread = threading.Thread(target=run_loop, name=f"BLE-{self.name}", daemon=True)
+        thread.start()
+        # Keep the caller's connect task alive while the thread runs
+        while thread.is_alive():
+            await asyncio.sleep(1)
 
     def stop(self):
         """Request BLE loop stop."""
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from collections import deque
+
+
+class CommandLayer:
+    """Request/response correlation for X714 commands.
+
+    A command registers a future under the prefix of the reply it expects
+    (e.g. ``#set_cmd:``); ``resolve_command`` completes the oldest future
+    waiting on that prefix when the reply arrives. The reader answers in
+    order, so several commands can be kept in flight up to ``max_in_flight``.
+    """
+
+    def init_command_vars(self, max_in_flight: int = 4, command_timeout: float = 3.0):
+        self.max_in_flight = max_in_flight
+        self.command_timeout = command_timeout
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        # expected reply prefix -> futures waiting for it, oldest first
+        self._pending_commands: dict[str, deque[asyncio.Future]] = {}
+
+    async def send_command(
+        self, command: str, expect: str, timeout: float | None = None, verbose: bool = True
+    ) -> str | None:
+        """Send a command and wait for its reply.
+
+        Args:
+            command: Command to send
+            expect: Lowercase prefix of the expected reply
+            timeout: Seconds to wait for the reply (defaults to command_timeout)
+            verbose: Show sent data in logs
+
+        Returns:
+            str | None: The reply line, or None on timeout or connection loss
+        """
+        timeout = self.command_timeout if timeout is None else timeout
+        async with self._in_flight:
+            future = asyncio.get_running_loop().create_future()
+            waiting = self._pending_commands.setdefault(expect, deque())
+            waiting.append(future)
+            try:
+                self.write(command, verbose)
+                return await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                logging.warning(f"{self.name} - No '{expect}' reply after {timeout}s")
+                return None
+            finally:
+                try:
+                    waiting.remove(future)
+                except ValueError:
+                    pass
+                if not waiting and self._pending_commands.get(expect) is waiting:
+                    del self._pending_commands[expect]
+
+    def resolve_command(self, data: str) -> bool:
+        """Complete the oldest command waiting for this reply.
+
+        Args:
+            data: Received line, already lowercased
+
+        Returns:
+            bool: True if a pending command was resolved
+        """
+        for prefix, waiting in self._pending_commands.items():
+            if data.startswith(prefix):
+                while waiting:
+                    future = waiting.popleft()
+                    if not future.done():
+                        future.set_result(data)
+                        return True
+        return False
+
+    def fail_pending_commands(self):
+        """Resolve every pending command with None (e.g. when the connection is lost)."""
+        for waiting in self._pending_commands.values():
+            while waiting:
+                future = waiting.popleft()
+                if not future.done():
+                    future.set_result(None)
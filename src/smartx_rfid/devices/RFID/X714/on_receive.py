@@ -19,6 +19,9 @@ class OnReceive:
         if verbose:
             self.on_event(self.name, "receive", data)
 
+        if self._pending_commands:
+            self.resolve_command(data)
+
         if data.startswith("#read:"):
             self.on_start() if data.endswith("on") else self.on_stop()
 
@@ -42,7 +45,7 @@ class OnReceive:
     def on_start(self):
         """Called when reader starts reading tags."""
         self.is_reading = True
-        self.clear_tags()
+        self.run_background(self.clear_tags())
         self.on_event(self.name, "reading", True)
 
     def on_stop(self):
@@ -1,41 +1,78 @@
 import asyncio
+import logging
 
 
 class RfidCommands:
     """RFID reader control commands for X714."""
 
-    async def start_inventory(self):
-        """Start reading RFID tags."""
+    async def start_inventory(self) -> bool:
+        """Start reading RFID tags.
+
+        Returns:
+            bool: True once the reader confirms with #read:on
+        """
         if self.is_gpi_trigger_on or not self.is_connected:
-            return
-        self.write("#READ:ON")
-        self.on_start()
+            return False
+        reply = await self.send_command("#READ:ON", "#read:")
+        return reply == "#read:on"
+
+    async def stop_inventory(self) -> bool:
+        """Stop reading RFID tags.
 
-    async def stop_inventory(self):
-        """Stop reading RFID tags."""
+        Returns:
+            bool: True once the reader confirms with #read:off
+        """
         if self.is_gpi_trigger_on or not self.is_connected:
-            return
-        self.write("#READ:OFF")
-        self.on_stop()
+            return False
+        reply = await self.send_command("#READ:OFF", "#read:")
+        return reply == "#read:off"
+
+    async def clear_tags(self) -> bool:
+        """Clear all stored tags from memory.
 
-    def clear_tags(self):
-        """Clear all stored tags from memory."""
-        self.write("#CLEAR")
+        Returns:
+            bool: True once the reader confirms with #tags_cleared
+        """
+        return await self.send_command("#CLEAR", "#tags_cleared", verbose=False) is not None
+
+    def run_background(self, coro):
+        """Run a command coroutine from a sync callback (tracked by the device if possible)."""
+        if hasattr(self, "create_task"):
+            return self.create_task(coro)
+        return asyncio.create_task(coro)
 
     def config_reader(self):
         """Configure reader settings like antennas, session, etc."""
-        # Start Reading
+        self.run_background(self.setup_reader())
+
+    async def setup_reader(self) -> bool:
+        """Send the settings, then start or stop reading, each after the previous reply.
+
+        Returns:
+            bool: True if the reader acknowledged the configuration
+        """
+        configured = await self.configure()
         if self.start_reading:
-            if hasattr(self, "create_task"):
-                self.create_task(self.start_inventory())
-            else:
-                asyncio.create_task(self.start_inventory())
+            await self.start_inventory()
         else:
-            if hasattr(self, "create_task"):
-                self.create_task(self.stop_inventory())
-            else:
-                asyncio.create_task(self.stop_inventory())
-
+            await self.stop_inventory()
+        return configured
+
+    async def configure(self) -> bool:
+        """Send reader settings and wait for the reader to confirm them.
+
+        Returns:
+            bool: True if the reader acknowledged the configuration
+        """
+        reply = await self.send_command(self.get_config_cmd(), "#set_cmd:")
+        if reply is None:
+            logging.warning(f"{self.name} - Reader did not confirm configuration")
+            return False
+        self.write_extra_config()
+        return True
+
+    def get_config_cmd(self) -> str:
+        """Build the #set_cmd command with antennas, session and reading options."""
         set_cmd = "#set_cmd:"
 
         # ANTENNAS
@@ -50,8 +87,6 @@ class RfidCommands:
 
         # START_READING
         set_cmd += f"|START_READING:{self.start_reading}"
-        if self.start_reading:
-            self.on_start()
 
         # GPI_START
         set_cmd += f"|GPI_START:{self.gpi_start}"
@@ -76,9 +111,23 @@ class RfidCommands:
 
         set_cmd = set_cmd.lower()
         set_cmd = set_cmd.replace("true", "on").replace("false", "off")
-        self.write(set_cmd)
-
-        # OTHER CONFIG
+        return set_cmd
+
+    def update_settings(self, ant_dict: dict | None = None, session: int | None = None, buzzer: bool | None = None):
+        """Change reading settings in place; resent to the reader if connected (no reconnection)."""
+        if ant_dict is not None:
+            self.ant_dict = ant_dict
+        if session is not None:
+            if session not in [0, 1, 2, 3]:
+                raise ValueError(f"Invalid session '{session}'")
+            self.session = session
+        if buzzer is not None:
+            self.buzzer = buzzer
+        if self.is_connected:
+            self.write(self.get_config_cmd())
+
+    def write_extra_config(self):
+        """Send hotspot, prefix and protected inventory settings."""
         self.write(f"#hotspot:{'on' if self.hotspot else 'off'}")
         self.write(f"#prefix:{self.prefix}")
         if self.protected_inventory_password is not None:
@@ -90,4 +139,4 @@ class RfidCommands:
         while getattr(self, "_running", True):
             await asyncio.sleep(30)
             if self.is_connected:
-                self.clear_tags()
+                await self.clear_tags()
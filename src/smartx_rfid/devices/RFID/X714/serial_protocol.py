@@ -1,7 +1,6 @@
 import asyncio
 import logging
 
-import serial.tools.list_ports
 import serial_asyncio
 
 
@@ -25,6 +24,7 @@ class SerialProtocol(asyncio.Protocol):
         logging.warning(f"{self.name} - ⚠️ Serial connection lost.")
         self.transport = None
         self.is_connected = False
+        self.fail_pending_commands()
         self.on_event(self.name, "connection", False)
 
         if self.on_con_lost:
@@ -54,38 +54,36 @@ class SerialProtocol(asyncio.Protocol):
         while getattr(self, "_running", True):
             self.on_con_lost = asyncio.Event()
 
-            # If AUTO mode, try to detect port by VID/PID
+            # If AUTO mode, get a port matching VID/PID from the shared discovery
             if self.is_auto:
                 logging.info(f"{self.name} - 🔍 Auto-detecting port by VID={self.vid:04x} and PID={self.pid:04x}...")
-                ports = serial.tools.list_ports.comports()
-                found_port = None
-                for p in ports:
-                    # p.vid and p.pid are integers (e.g. 0x0001 == 1 decimal)
-                    if p.vid == self.vid and p.pid == self.pid:
-                        found_port = p.device
-                        logging.info(f"{self.name} - ✅ Detected port: {found_port}")
-                        break
+                found_port = await self.port_discovery.acquire(
+                    self.vid, self.pid, owner=self, timeout=self.reconnection_time
+                )
 
                 if found_port is None:
                     logging.info(f"{self.name} - ⚠️ No port with VID={self.vid} and PID={self.pid} found.")
-                    logging.info(f"{self.name} - ⏳ Retrying in {self.reconnection_time} seconds...")
-                    await asyncio.sleep(self.reconnection_time)
-                    continue  # try to detect again in next loop
-                else:
-                    self.port = found_port
+                    # acquire returns at once with a short timeout and a fresh cache
+                    await self.backoff.wait(self.name)
+                    continue
+                logging.info(f"{self.name} - ✅ Detected port: {found_port}")
+                self.port = found_port
 
             try:
                 logging.info(f"{self.name} - 🔌 Trying to connect to {self.port} at {self.baudrate} bps...")
                 await serial_asyncio.create_serial_connection(loop, lambda: self, self.port, baudrate=self.baudrate)
                 logging.info(f"{self.name} - 🟢 Successfully connected.")
+                self.backoff.reset()
                 await self.on_con_lost.wait()
                 logging.info(f"{self.name} - 🔄 Connection lost. Attempting to reconnect...")
             except Exception as e:
                 logging.warning(f"{self.name} - ❌ Connection error: {e}")
+                # The port could not be opened; let another device claim it
+                if self.is_auto:
+                    self.port_discovery.release(self)
 
             # If in AUTO mode, reset port to "AUTO" to force detection next loop
             if self.is_auto:
                 self.port = "AUTO"
 
-            logging.info(f"{self.name} - ⏳ Waiting {self.reconnection_time} seconds before retrying...")
-            await asyncio.sleep(self.reconnection_time)
+            await self.backoff.wait(self.name)
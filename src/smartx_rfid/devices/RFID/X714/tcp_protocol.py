@@ -1,45 +1,197 @@
 import asyncio
 import logging
-import socket
+from collections import deque
 
 
 class TCPHelpers:
-    async def monitor_connection(self):
-        while self.is_connected:
-            await asyncio.sleep(self.reconnection_time)
-            if (self.writer and self.writer.is_closing()) or (self.reader and self.reader.at_eof()):
-                self.is_connected = False
-                logging.info(f"{self.name} - [DISCONNECTED] Socket closed.")
-                break
+    def start_heartbeat_tcp(self):
+        """Register the connection with the shared heartbeat scheduler."""
+        self.heartbeat.register(
+            self,
+            ping=lambda: self.write_tcp("ping", verbose=False),
+            interval=self.heartbeat_interval,
+            timeout=self.heartbeat_timeout,
+            is_alive=lambda: self.writer is not None and not self.writer.is_closing(),
+            on_dead=self.on_heartbeat_dead,
+        )
+
+    def on_heartbeat_dead(self):
+        """Close a connection the heartbeat found dead so the connect loop reconnects."""
+        logging.info(f"{self.name} - [DISCONNECTED] Heartbeat lost.")
+        self.is_connected = False
+        if self.writer:
+            self.writer.close()
 
-            await self.write_tcp("ping", verbose=False)
+    def attach_tcp_peer(self, protocol: "TCPLineProtocol"):
+        """Use a connection accepted by the TCP listener (server mode)."""
+        if self.writer is not None and self.writer is not protocol:
+            # The reader reconnected before the old socket was noticed dead
+            logging.info(f"{self.name} - Replacing previous connection")
+            self.writer.close()
+        self.writer = protocol
+        self.reader = None
+        self.is_connected = True
+        self.on_connected()
+        self.start_heartbeat_tcp()
+
+    def detach_tcp_peer(self, protocol: "TCPLineProtocol"):
+        """Forget an accepted connection once it closes."""
+        if self.writer is not protocol:
+            return
+        self.heartbeat.unregister(self)
+        self.writer = None
+        self.is_connected = False
+        self.fail_pending_commands()
+        self.on_event(self.name, "connection", False)
+        logging.info(f"🔌 [DISCONNECTED] {self.name} - Waiting for the reader to connect again...")
 
     async def receive_data_tcp(self):
-        buffer = ""
-        try:
-            while True:
-                try:
-                    data = await asyncio.wait_for(self.reader.read(1024), timeout=0.1)
-                except asyncio.TimeoutError:
-                    # Timeout: process what's in the buffer as a command
-                    if buffer:
-                        self.on_receive(buffer.strip())
-                        buffer = ""
-                    continue
+        """Wait until the connection closes; lines are delivered by TCPLineProtocol."""
+        await self.writer.wait_closed()
+        if self.is_connected:
+            self.is_connected = False
+            logging.warning(f"[RECEIVE ERROR] {self.name} - Connection lost")
 
-                if not data:
-                    raise ConnectionError("Connection lost")
 
-                buffer += data.decode(errors="ignore")
+class TCPLineProtocol(asyncio.BufferedProtocol):
+    """Newline-delimited receive path for X714 TCP connections.
 
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    self.on_receive(line.strip())
+    The socket is read straight into a preallocated buffer and every complete
+    line is passed to ``device.on_receive``. A partial line is kept until its
+    delimiter arrives; only while one is buffered an idle timer is armed that
+    flushes it after ``idle_flush`` seconds without data, so an idle connection
+    costs nothing.
 
-        except Exception as e:
-            if self.is_connected:
-                self.is_connected = False
-                logging.warning(f"[RECEIVE ERROR] {e}")
+    The protocol also exposes the subset of ``asyncio.StreamWriter`` used by the
+    device (write, drain, is_closing, close, wait_closed) and is stored as
+    ``device.writer``.
+    """
+
+    def __init__(self, device, buffer_size: int = 65536, idle_flush: float = 0.1):
+        self.device = device
+        self.idle_flush = idle_flush
+        self.transport: asyncio.Transport | None = None
+
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._partial = bytearray()
+        self._last_rx = 0.0
+        self._idle_handle: asyncio.TimerHandle | None = None
+
+        self._loop = asyncio.get_running_loop()
+        self._closed = self._loop.create_future()
+        self._paused = False
+        # One future per coroutine waiting in drain() while writing is paused
+        self._drain_waiters: deque[asyncio.Future] = deque()
+
+    # ---------------- Receive ----------------
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint):
+        return self._view
+
+    def buffer_updated(self, nbytes):
+        buffer = self._buffer
+        self._last_rx = self._loop.time()
+        if self.device is not None:
+            self.device.heartbeat.mark_rx(self.device)
+
+        start = 0
+        end = buffer.find(b"\n", 0, nbytes)
+        while end != -1:
+            if self._partial:
+                self._partial += self._view[start:end]
+                line = bytes(self._partial)
+                self._partial.clear()
+            else:
+                line = bytes(self._view[start:end])
+            if line.strip():
+                self.on_line(line)
+            start = end + 1
+            end = buffer.find(b"\n", start, nbytes)
+
+        if start < nbytes:
+            self._partial += self._view[start:nbytes]
+
+        if self._partial and self._idle_handle is None:
+            self._idle_handle = self._loop.call_later(self.idle_flush, self._on_idle)
+
+    def _on_idle(self):
+        self._idle_handle = None
+        if not self._partial:
+            return
+        # Data kept arriving since the timer was armed: wait for the rest of the idle period
+        remaining = self._last_rx + self.idle_flush - self._loop.time()
+        if remaining > 0:
+            self._idle_handle = self._loop.call_later(remaining, self._on_idle)
+            return
+        line = bytes(self._partial)
+        self._partial.clear()
+        if line.strip():
+            self.on_line(line)
+
+    def on_line(self, line: bytes):
+        """Deliver a complete line to the device."""
+        self.device.on_receive(line)
+
+    def eof_received(self):
+        return False
+
+    def connection_lost(self, exc):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        self.transport = None
+        if not self._closed.done():
+            self._closed.set_result(None)
+        self._wake_drain_waiters(ConnectionResetError("Connection lost"))
+
+    # ---------------- Flow control ----------------
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        self._wake_drain_waiters()
+
+    def _wake_drain_waiters(self, exc: Exception | None = None):
+        while self._drain_waiters:
+            waiter = self._drain_waiters.popleft()
+            if waiter.done():
+                continue
+            if exc is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(exc)
+
+    # ---------------- Writer interface ----------------
+    def write(self, data: bytes):
+        if self.transport is None:
+            raise ConnectionResetError("Connection lost")
+        self.transport.write(data)
+
+    async def drain(self):
+        if self.transport is None or self.transport.is_closing():
+            raise ConnectionResetError("Connection lost")
+        if self._paused:
+            waiter = self._loop.create_future()
+            self._drain_waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._drain_waiters:
+                    self._drain_waiters.remove(waiter)
+
+    def is_closing(self) -> bool:
+        return self.transport is None or self.transport.is_closing()
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+    async def wait_closed(self):
+        await asyncio.shield(self._closed)
 
 
 class TCPProtocol(TCPHelpers):
@@ -48,56 +200,46 @@ class TCPProtocol(TCPHelpers):
             try:
                 logging.info(f"Connecting: {self.name} - {ip}:{port}")
 
-                # Verifica IP antes (evita travar no DNS)
-                try:
-                    resolved_ip = socket.gethostbyname(ip)
-                except OSError:
-                    raise ValueError(f"Invalid IP address: {ip}")
+                # Resolve and connect holding a slot of the shared attempt limit
+                loop = asyncio.get_running_loop()
+                async with self.connect_limiter.slot():
+                    # asyncio.timeout, unlike wait_for on 3.11, never drops a cancellation racing the connect
+                    try:
+                        async with asyncio.timeout(3):
+                            resolved_ip = await self.dns_cache.resolve(ip, port)
+                    except OSError:
+                        raise ValueError(f"Invalid IP address: {ip}")
 
-                # Tenta abrir conexão com timeout real
-                connect_task = asyncio.open_connection(resolved_ip, port)
-                self.reader, self.writer = await asyncio.wait_for(connect_task, timeout=3)
+                    # Tenta abrir conexão com timeout real
+                    async with asyncio.timeout(3):
+                        _, self.writer = await loop.create_connection(lambda: TCPLineProtocol(self), resolved_ip, port)
+                self.reader = None
 
                 self.is_connected = True
+                self.backoff.reset()
                 self.on_connected()
                 logging.info(f"✅ [CONNECTED] {self.name} - {ip}:{port}")
 
-                # Cria tasks de leitura e monitoramento (usando tracking se disponível)
-                tasks = [
-                    self.create_task(self.receive_data_tcp())
-                    if hasattr(self, "create_task")
-                    else asyncio.create_task(self.receive_data_tcp()),
-                    self.create_task(self.monitor_connection())
-                    if hasattr(self, "create_task")
-                    else asyncio.create_task(self.monitor_connection()),
-                    self.create_task(self.periodic_ping(10))
-                    if hasattr(self, "create_task")
-                    else asyncio.create_task(self.periodic_ping(10)),
-                ]
-
-                # Espera até que uma delas finalize
-                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
-
-                # Cancela o resto
-                for t in pending:
-                    t.cancel()
+                # Recebe até a conexão fechar; ping e liveness ficam no heartbeat compartilhado
+                self.start_heartbeat_tcp()
+                try:
+                    await self.receive_data_tcp()
+                finally:
+                    self.heartbeat.unregister(self)
 
                 self.is_connected = False
+                self.fail_pending_commands()
                 self.on_event(self.name, "connection", False)
                 logging.info(f"🔌 [DISCONNECTED] {self.name} - Reconnecting...")
 
             except asyncio.TimeoutError:
                 logging.warning(f"⏱️ [TIMEOUT] {self.name} - No response from {ip}:{port}")
-                continue
             except ValueError as e:
                 logging.warning(f"❌ [INVALID IP] {self.name}: {e}")
-                continue
             except OSError as e:
                 logging.warning(f"💥 [NETWORK ERROR] {self.name}: {e}")
-                continue
             except Exception as e:
                 logging.warning(f"❌ [UNEXPECTED ERROR] {self.name}: {e}")
-                continue
 
             # Garante desconexão limpa
             if self.writer:
@@ -110,8 +252,32 @@ class TCPProtocol(TCPHelpers):
                 self.reader = None
                 self.is_connected = False
 
-            logging.info(f"🔁 Retrying {self.name} in {self.reconnection_time}s...")
-            await asyncio.sleep(self.reconnection_time)
+            await self.backoff.wait(self.name)
+
+    async def listen_tcp(self):
+        """Server mode: wait for the reader to connect to the shared TCP listener."""
+        while True:
+            try:
+                await self.tcp_listener.register(
+                    self, self.tcp_port, host=self.listen_host, ip=self.ip, hello=self.tcp_hello
+                )
+                self.backoff.reset()
+                break
+            except ValueError:
+                raise
+            except OSError as e:
+                logging.warning(f"💥 [LISTEN ERROR] {self.name} - {self.listen_host}:{self.tcp_port}: {e}")
+            except Exception as e:
+                logging.warning(f"❌ [UNEXPECTED ERROR] {self.name}: {e}")
+            await self.backoff.wait(self.name)
+
+        try:
+            # Connections are attached and detached by the listener until cancelled
+            await asyncio.get_running_loop().create_future()
+        finally:
+            self.tcp_listener.unregister(self)
+            if self.writer:
+                self.writer.close()
 
     async def write_tcp(self, data: str, verbose: bool = True):
         if self.is_connected and self.writer:
@@ -126,8 +292,3 @@ class TCPProtocol(TCPHelpers):
                 if self.is_connected:
                     self.is_connected = False
                     self.on_event(self.name, "connection", False)
-
-    async def periodic_ping(self, interval: int):
-        while self.is_connected:
-            await asyncio.sleep(interval)
-            await self.write_tcp("ping", verbose=False)
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+
+
+class WriteBuffer:
+    """Coalesce X714 commands queued in the same loop iteration.
+
+    Commands are collected by ``queue_write`` and flushed once per loop
+    iteration: on TCP as a single newline-joined write, on BLE packed into as
+    few MTU-sized GATT writes as possible. Order is preserved.
+    """
+
+    def init_write_buffer(self):
+        self._write_queue: list[tuple[str, bool]] = []
+        self._flush_handle: asyncio.Handle | None = None
+
+    def queue_write(self, to_send: str, verbose: bool = True):
+        """Queue a command for the next flush.
+
+        Args:
+            to_send: Command to send
+            verbose: Show sent data in logs
+        """
+        self._write_queue.append((to_send, verbose))
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush_writes)
+
+    def _flush_writes(self):
+        self._flush_handle = None
+        commands, self._write_queue = self._write_queue, []
+        if not commands:
+            return
+
+        for command, verbose in commands:
+            if verbose:
+                logging.info(f"{self.name} - 📤 Sending: {command}")
+        lines = [command for command, _ in commands]
+
+        if self.connection_type == "BLE":
+            self.create_task(self._write_ble_packets(self.pack_ble_lines(lines, self.ble_payload_size())))
+        else:
+            self.create_task(self.write_tcp("\n".join(lines), verbose=False))
+
+    @staticmethod
+    def pack_ble_lines(lines: list[str], limit: int) -> list[bytes]:
+        """Pack newline-separated commands into packets of at most ``limit`` bytes.
+
+        A command longer than ``limit`` is sent in a packet of its own, which
+        write_ble then splits into MTU-sized chunks.
+
+        Args:
+            lines: Commands in send order
+            limit: Maximum packet size in bytes (ATT MTU minus 3)
+
+        Returns:
+            list[bytes]: Packets in send order
+        """
+        packets = []
+        current = b""
+        for line in lines:
+            encoded = line.encode()
+            if not current:
+                current = encoded
+            elif len(current) + 1 + len(encoded) <= limit:
+                current += b"\n" + encoded
+            else:
+                packets.append(current)
+                current = encoded
+        if current:
+            packets.append(current)
+        return packets
+
+    async def _write_ble_packets(self, packets: list[bytes]):
+        for packet in packets:
+            if not await self.write_ble(packet):
+                break
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from smartx_rfid.schemas.tag import WriteTagValidator
 
@@ -5,7 +6,13 @@ from smartx_rfid.schemas.tag import WriteTagValidator
 class WriteCommands:
     """RFID tag write commands for X714."""
 
-    async def write_epc(self, target_identifier: str | None, target_value: str | None, new_epc: str, password: str):
+    async def write_epc(
+        self,
+        target_identifier: str | None,
+        target_value: str | None,
+        new_epc: str,
+        password: str,
+    ) -> bool:
         """Write new EPC code to RFID tag.
 
         Args:
@@ -13,6 +20,10 @@ class WriteCommands:
             target_value: Current tag value to match
             new_epc: New EPC code to write
             password: Tag access password
+
+        Returns:
+            bool: True if the command was sent. The reader's reply to #WRITE is
+            not parsed, so the write itself is not confirmed.
         """
         try:
             validated_tag = WriteTagValidator(
@@ -23,13 +34,27 @@ class WriteCommands:
             )
         except Exception as e:
             logging.warning(f"{self.name} - {e}")
-            return
+            return False
         identifier = validated_tag.target_identifier
         value = validated_tag.target_value
         epc = validated_tag.new_epc
         password = validated_tag.password
         logging.info(f"{self.name} - Writing EPC: {epc} (Current: {identifier}={value})")
         if identifier is None:
-            self.write(f"#WRITE:{epc};{password}", False)
+            command = f"#WRITE:{epc};{password}"
         else:
-            self.write(f"#WRITE:{epc};{password};{identifier};{value}", False)
+            command = f"#WRITE:{epc};{password};{identifier};{value}"
+
+        self.write(command, False)
+        return True
+
+    async def write_epc_many(self, tags: list[dict]) -> list[bool]:
+        """Send several write commands; those of one loop iteration go out in one write.
+
+        Args:
+            tags: Write requests as dicts with the write_epc arguments
+
+        Returns:
+            list[bool]: Whether each command was sent, in order
+        """
+        return list(await asyncio.gather(*(self.write_epc(**tag) for tag in tags)))
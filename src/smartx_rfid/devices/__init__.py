@@ -1,11 +1,31 @@
 # GENERIC
 from .generic.SERIAL._main import SERIAL
 from .generic.TCP._main import TCP
+from .generic.decoders import (
+    FrameDecoder,
+    DelimiterDecoder,
+    FixedSizeDecoder,
+    LengthPrefixedDecoder,
+    StxEtxDecoder,
+    get_decoder,
+)
 
 # RFID DEVICES
 from .RFID.X714._main import X714
 from .RFID.R700_IOT._main import R700_IOT
 from .RFID.R700_IOT.reader_config_example import R700_IOT_config_example
 
+# Shared services
+from .heartbeat import HeartbeatService, heartbeat
+from .ble_scanner import BLEScannerService, ble_scanner
+from .port_discovery import PortDiscoveryService, port_discovery
+from .tcp_listener import TCPListenerService, tcp_listener
+from .dns_cache import DNSCache, dns_cache
+from .reconnect import ReconnectPolicy, ConnectLimiter, connect_limiter, get_policy, set_policy
+from .startup import StartupScheduler
+from .event_bus import EventBus, Subscription, event_bus
+from .handler_pool import ThreadedDispatcher
+
 # Device Manager
 from .device_manager import DeviceManager
+from .sharding import ShardedDeviceManager
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from typing import Callable
+
+
+def _bleak_scanner_factory(detection_callback):
+    from bleak import BleakScanner
+
+    return BleakScanner(detection_callback=detection_callback)
+
+
+class BLEScannerService:
+    """Process-wide BLE discovery shared by all BLE devices.
+
+    Instead of every device running its own ``BleakScanner.discover`` window,
+    one continuous scan runs while at least one device is waiting. Every
+    advertisement updates a short-lived cache (address -> name, RSSI) and
+    resolves waiting devices whose name prefix matches, so a device that is
+    already advertising is found as soon as its next advertisement arrives.
+
+    Addresses handed out are claimed by the requesting device until released,
+    so several readers with the same name prefix get distinct addresses.
+
+    Args:
+        scanner_factory: Builds a scanner from a detection callback. The scanner
+            must provide async ``start()`` and ``stop()`` (BleakScanner by default)
+        cache_ttl: Seconds an advertisement stays valid in the cache
+    """
+
+    def __init__(self, scanner_factory: Callable | None = None, cache_ttl: float = 10.0):
+        self._scanner_factory = scanner_factory or _bleak_scanner_factory
+        self.cache_ttl = cache_ttl
+
+        self._scanner = None
+        self._scan_lock = asyncio.Lock()
+        # address -> {"name", "rssi", "seen"}
+        self._cache: dict[str, dict] = {}
+        # (name prefix, owner, future)
+        self._waiters: list[tuple[str, object, asyncio.Future]] = []
+        # address -> owner
+        self._claims: dict[str, object] = {}
+
+    @property
+    def is_scanning(self) -> bool:
+        return self._scanner is not None
+
+    def get_devices(self) -> dict[str, dict]:
+        """Return the fresh cache entries as address -> {"name", "rssi", "seen"}."""
+        self._prune()
+        return {address: dict(info) for address, info in self._cache.items()}
+
+    async def find(self, name_prefix: str, owner=None, timeout: float | None = 5.0) -> str | None:
+        """Wait for a device whose name starts with ``name_prefix``.
+
+        Args:
+            name_prefix: Advertised name prefix to match
+            owner: Object claiming the address (addresses claimed by others are skipped)
+            timeout: Seconds to wait for a matching advertisement (None waits forever)
+
+        Returns:
+            str | None: Device address, or None on timeout
+        """
+        address = self._match_cache(name_prefix, owner)
+        if address is not None:
+            self._claims[address] = owner
+            return address
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (name_prefix, owner, future)
+        self._waiters.append(waiter)
+        try:
+            await self._start()
+            address = await asyncio.wait_for(future, timeout=timeout)
+            return address
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if not self._waiters:
+                await self._stop()
+
+    def release(self, owner):
+        """Release every address claimed by ``owner``."""
+        for address in [a for a, o in self._claims.items() if o is owner]:
+            del self._claims[address]
+
+    def on_detection(self, device, advertisement_data):
+        """Scanner detection callback: update the cache and resolve matching waiters."""
+        name = getattr(device, "name", None) or getattr(advertisement_data, "local_name", None)
+        if not name:
+            return
+        address = device.address
+        self._cache[address] = {
+            "name": name,
+            "rssi": getattr(advertisement_data, "rssi", None),
+            "seen": time.monotonic(),
+        }
+
+        if address in self._claims:
+            return
+        for name_prefix, owner, future in self._waiters:
+            if not future.done() and name.startswith(name_prefix):
+                self._claims[address] = owner
+                future.set_result(address)
+                return
+
+    def _match_cache(self, name_prefix: str, owner) -> str | None:
+        self._prune()
+        best = None
+        for address, info in self._cache.items():
+            claimed_by = self._claims.get(address, owner)
+            if claimed_by is not owner or not info["name"].startswith(name_prefix):
+                continue
+            # Prefer the strongest signal
+            if best is None or (info["rssi"] or -999) > (self._cache[best]["rssi"] or -999):
+                best = address
+        return best
+
+    def _prune(self):
+        expired = time.monotonic() - self.cache_ttl
+        for address in [a for a, info in self._cache.items() if info["seen"] < expired]:
+            del self._cache[address]
+
+    async def _start(self):
+        async with self._scan_lock:
+            if self._scanner is not None:
+                return
+            scanner = self._scanner_factory(self.on_detection)
+            await scanner.start()
+            self._scanner = scanner
+            logging.info("🔍 BLE scan started")
+
+    async def _stop(self):
+        async with self._scan_lock:
+            if self._scanner is None or self._waiters:
+                return
+            scanner, self._scanner = self._scanner, None
+            try:
+                await scanner.stop()
+            except Exception as e:
+                logging.warning(f"[BLE Scan Stop Error] {e}")
+            logging.info("🔍 BLE scan stopped")
+
+
+# Process-wide scanner shared by all BLE devices on the main loop
+ble_scanner = BLEScannerService()
@@ -2,20 +2,68 @@ import logging
 import os
 import json
 from smartx_rfid.devices import SERIAL, TCP, R700_IOT, X714
+from smartx_rfid.devices.generic.decoders import get_decoder
+from smartx_rfid.devices.reconnect import ReconnectPolicy, get_policy
+from smartx_rfid.devices.startup import StartupScheduler
+from smartx_rfid.devices.event_bus import EventBus
+from smartx_rfid.devices.handler_pool import ThreadedDispatcher
 import asyncio
 from typing import List, Dict, Optional, Tuple
 from smartx_rfid.schemas.tag import WriteTagValidator
 from typing import Callable
 import inspect
+import contextlib
+
+# JSON keys that can be applied to a running device (key -> update_settings argument)
+RUNTIME_SETTINGS = {
+    "X714": {"ANT_DICT": "ant_dict", "SESSION": "session", "BUZZER": "buzzer"},
+}
 
 
 class DeviceManager:
-    def __init__(self, devices_path: str, example_path: str = "", event_func: Callable | None = None):
+    def __init__(
+        self,
+        devices_path: str,
+        example_path: str = "",
+        event_func: Callable | None = None,
+        event_bus: Optional[EventBus] = None,
+        handler_threads: int = 0,
+        startup_concurrency: int = 16,
+        startup_interval: float = 0.05,
+        startup_timeout: float = 30.0,
+        names: Optional[set] = None,
+    ):
         self.devices = []
+        # name -> device, kept in sync with self.devices
+        self._devices_by_name: dict[str, object] = {}
         self._devices_path = devices_path
+        # Only these device files are loaded (None for all), e.g. the devices of one worker shard
+        self._names = names
         self._example_path = example_path
         self._connect_tasks = []
+        # name -> connect task and name -> parsed JSON of the running devices
+        self._tasks_by_name: dict[str, asyncio.Task] = {}
+        self._configs: dict[str, dict] = {}
+        self._connecting = False
+        self._watch_task: asyncio.Task | None = None
+        # (mtime, size) of the device files when they were last read
+        self._files: dict[str, Tuple[int, int]] = {}
+        # Run a blocking event_func in a thread pool instead of on the event loop
+        self.dispatcher: Optional[ThreadedDispatcher] = None
+        if handler_threads > 0 and event_func is not None:
+            event_func = self.dispatcher = ThreadedDispatcher(event_func, max_workers=handler_threads)
         self._event_func: Callable | None = event_func
+        # With a bus, devices publish to it and event_func becomes one of its subscribers;
+        # "block" keeps every event, as event_func received them without a bus
+        self.event_bus = event_bus
+        if event_bus is not None:
+            if event_func is not None:
+                # A dispatcher only queues, it does not need a thread of its own
+                event_bus.subscribe(event_func, policy="block", thread=self.dispatcher is None)
+            self._event_func = event_bus.publish
+        # Paces connect_devices so a large fleet does not connect all at once
+        self.startup = StartupScheduler(startup_concurrency, startup_interval, startup_timeout)
+        self._startup_task: asyncio.Task | None = None
 
     def __len__(self):
         return len(self.devices)
@@ -29,7 +77,31 @@ class DeviceManager:
 
     def load_devices(self):
         self.devices = []
+        self._devices_by_name = {}
+        self._configs = {}
+
+        if self.dispatcher is not None:
+            self.dispatcher.start()
+
+        self._files = self._snapshot_files()
+        configs, _ = self._read_configs()
+        for name, data in configs.items():
+            self.add_device(name, data.get("READER", "UNKNOWN"), data)
+            if name in self._devices_by_name:
+                self._configs[name] = data
 
+        # Assign event handlers to devices
+        self.assign_event_function()
+
+    def _read_configs(self) -> Tuple[Dict[str, dict], set]:
+        """
+        Parse the device JSON files.
+
+        Returns the configs by device name and the names of files that could
+        not be read (e.g. caught while being written).
+        """
+        configs = {}
+        unreadable = set()
         try:
             # Create directory if it does not exist
             if not os.path.exists(self._devices_path):
@@ -37,12 +109,15 @@ class DeviceManager:
                 logging.info(f"📁 Directory created: {self._devices_path}")
         except Exception as e:
             logging.error(f"❌ Error checking/creating directory '{self._devices_path}': {e}")
-            return
+            return configs, unreadable
 
         # Iterate over JSON files in the directory
         for filename in os.listdir(self._devices_path):
             if filename.endswith(".json"):
                 filepath = os.path.join(self._devices_path, filename)
+                name = filename.replace(".json", "")
+                if self._names is not None and name not in self._names:
+                    continue
                 logging.info(f"📄 File: {filename}")
                 try:
                     with open(filepath, "r", encoding="utf-8") as f:
@@ -51,16 +126,14 @@ class DeviceManager:
                     if data.get("READER") is None:
                         os.remove(filepath)
                         continue
-                    name = filename.replace(".json", "")
-                    device_type = data.get("READER", "UNKNOWN")
-                    self.add_device(name, device_type, data)
+                    configs[name] = data
                 except json.JSONDecodeError as e:
                     logging.error(f"❌ JSON decode error: {e}")
+                    unreadable.add(name)
                 except Exception as e:
                     logging.error(f"❌ Error processing file '{filename}': {e}")
-
-        # Assign event handlers to devices
-        self.assign_event_function()
+                    unreadable.add(name)
+        return configs, unreadable
 
     def add_device(self, name, device_type, data):
         logging.info(f"🔍 Adding device: {name}")
@@ -75,12 +148,26 @@ class DeviceManager:
                     vid=data.get("VID", 1),
                     pid=data.get("PID", 1),
                     baudrate=data.get("BAUDRATE", 115200),
+                    decoder=get_decoder(data.get("DECODER")),
+                    reconnect_policy=ReconnectPolicy.from_config(data.get("RECONNECT"), get_policy(device_type)),
                 )
             )
 
         ### TCP
         elif device_type == "TCP":
-            self.devices.append(TCP(name=name, ip=data.get("IP"), port=data.get("PORT", 23)))
+            self.devices.append(
+                TCP(
+                    name=name,
+                    ip=data.get("IP"),
+                    port=data.get("PORT", 23),
+                    decoder=get_decoder(data.get("DECODER")),
+                    separator=data.get("SEPARATOR", "\n"),
+                    limit=data.get("LIMIT", 65536),
+                    partial_timeout=data.get("PARTIAL_TIMEOUT", 0.1),
+                    high_water=data.get("HIGH_WATER", 65536),
+                    reconnect_policy=ReconnectPolicy.from_config(data.get("RECONNECT"), get_policy(device_type)),
+                )
+            )
 
         ### X714
         elif device_type == "X714":
@@ -94,12 +181,17 @@ class DeviceManager:
                     pid=data.get("PID", 1),
                     ip=data.get("IP", "192.168.1.101"),
                     tcp_port=data.get("TCP_PORT", 23),
+                    tcp_mode=data.get("TCP_MODE", "CLIENT"),
+                    listen_host=data.get("LISTEN_HOST", "0.0.0.0"),
+                    tcp_hello=data.get("TCP_HELLO", None),
                     ble_name=data.get("BLE_NAME", "SMTX"),
+                    ble_thread=data.get("BLE_THREAD", False),
                     buzzer=data.get("BUZZER", True),
                     session=data.get("SESSION", 1),
                     start_reading=data.get("START_READING", False),
                     gpi_start=data.get("GPI_START", False),
                     ant_dict=data.get("ANT_DICT", None),
+                    reconnect_policy=ReconnectPolicy.from_config(data.get("RECONNECT"), get_policy(device_type)),
                 )
             )
 
@@ -113,6 +205,7 @@ class DeviceManager:
                     password=data.get("PASSWORD", "impinj"),
                     start_reading=data.get("START_READING", True),
                     reading_config=data.get("READING_CONFIG", {}),
+                    reconnect_policy=ReconnectPolicy.from_config(data.get("RECONNECT"), get_policy(device_type)),
                 )
             )
 
@@ -121,6 +214,7 @@ class DeviceManager:
             logging.warning(f"⚠️ Unknown reader type '{device_type}'. Device '{name}' was not added.")
             return  # Exit early if device is invalid
 
+        self._devices_by_name[name] = self.devices[-1]
         logging.info(f"✅ Device '{name}' added successfully.")
 
     async def connect_devices(self, force: bool = False):
@@ -130,7 +224,7 @@ class DeviceManager:
         When forcing, previous tasks will be cancelled and devices disconnected first.
         """
         # If there are active connect tasks and caller didn't request a force, skip.
-        existing = [t for t in getattr(self, "_connect_tasks", []) if not t.done()]
+        existing = [t for t in getattr(self, "_connect_tasks", []) + [self._startup_task] if t and not t.done()]
         if existing and not force:
             logging.info("Connect tasks already running; skipping new connect.")
             return
@@ -149,24 +243,53 @@ class DeviceManager:
         # reload device definitions
         self.load_devices()
 
-        tasks = []
-        for device in self.devices:
-            try:
-                logging.info(f"🚀 Starting connection for device: '{device.name}'")
-                # run device.connect inside a runner that ensures cleanup on cancel
-                task = asyncio.create_task(self._device_connect_runner(device))
-                tasks.append(task)
-            except Exception as e:
-                logging.error(f"❌ Error starting connection for device: '{device.name}': {e}")
+        self._connecting = True
+        # devices are started in the background by priority and at a limited pace
+        if self.devices:
+            logging.info(f"Starting {len(self.devices)} device(s).")
+            self._startup_task = asyncio.create_task(
+                self.startup.run(list(self.devices), self._start_scheduled, priority=self._priority)
+            )
+
+    def _priority(self, device) -> float:
+        """Startup priority of a device (PRIORITY in its JSON, higher starts first)."""
+        return (self._configs.get(device.name) or {}).get("PRIORITY", 0)
+
+    def _start_scheduled(self, device):
+        # Skip devices removed (or replaced by a reload) while waiting for their turn
+        if self._devices_by_name.get(device.name) is not device or device.name in self._tasks_by_name:
+            return None
+        return self._start_device(device)
 
-        # keep tasks running in background; store handles for later cancellation
-        self._connect_tasks = tasks
-        if len(tasks) > 0:
-            logging.info(f"Started {len(tasks)} device connect task(s).")
+    async def wait_startup(self):
+        """Wait until every device started by connect_devices is connected or timed out."""
+        if self._startup_task is not None:
+            await asyncio.shield(self._startup_task)
+
+    def get_startup_report(self) -> Dict[str, Optional[float]]:
+        """Seconds each device took to connect at startup (None if it did not connect in time)."""
+        return dict(self.startup.report)
+
+    def _start_device(self, device):
+        """Start the connect task of one device."""
+        try:
+            logging.info(f"🚀 Starting connection for device: '{device.name}'")
+            # run device.connect inside a runner that ensures cleanup on cancel
+            task = asyncio.create_task(self._device_connect_runner(device))
+            self._connect_tasks.append(task)
+            self._tasks_by_name[device.name] = task
+            return task
+        except Exception as e:
+            logging.error(f"❌ Error starting connection for device: '{device.name}': {e}")
 
     async def cancel_connect_tasks(self):
         """Cancel any ongoing connect tasks and wait for their cancellation to complete."""
+        if self._startup_task is not None:
+            self._startup_task.cancel()
+            await asyncio.gather(self._startup_task, return_exceptions=True)
+            self._startup_task = None
         tasks = list(getattr(self, "_connect_tasks", []) or [])
+        self._tasks_by_name = {}
         if not tasks:
             self._connect_tasks = []
             return
@@ -241,21 +364,146 @@ class DeviceManager:
             except Exception as e:
                 logging.exception(f"Erro ao desconectar device {device}: {e}")
             finally:
-                # Remove da lista de controle
+                # Remove da lista de controle e do índice por nome
                 try:
                     self.devices.remove(device)
                 except ValueError:
                     pass
+                if self._devices_by_name.get(device.name) is device:
+                    del self._devices_by_name[device.name]
 
                 # Remove referência local
                 del device
 
+        # Handle the events already queued and stop the handler threads (restarted by load_devices)
+        if self.dispatcher is not None:
+            await asyncio.to_thread(self.dispatcher.close)
+
+    async def reload_devices(self) -> Dict[str, List[str]]:
+        """
+        Apply changes of the device files without touching unchanged devices.
+
+        New files add (and connect) devices, deleted files remove them and
+        changed files restart only their device. Changes limited to runtime
+        settings (see RUNTIME_SETTINGS) are pushed to the running device
+        without reconnecting. Files that can not be parsed are left as they are.
+
+        Returns the names of the devices that were added, removed, restarted and updated.
+        """
+        self._files = self._snapshot_files()
+        configs, unreadable = self._read_configs()
+        report = {"added": [], "removed": [], "restarted": [], "updated": []}
+
+        for name in list(self._configs):
+            if name not in configs and name not in unreadable:
+                await self._remove_device(name)
+                report["removed"].append(name)
+
+        for name, data in configs.items():
+            previous = self._configs.get(name)
+            if previous == data:
+                continue
+            if previous is None:
+                if self._add_and_start(name, data):
+                    report["added"].append(name)
+            elif self._apply_runtime_settings(name, previous, data):
+                report["updated"].append(name)
+            else:
+                await self._remove_device(name)
+                if self._add_and_start(name, data):
+                    report["restarted"].append(name)
+
+        changes = {key: value for key, value in report.items() if value}
+        if changes:
+            logging.info(f"🔄 Devices reloaded: {changes}")
+        return report
+
+    def _add_and_start(self, name: str, data: dict) -> bool:
+        self.add_device(name, data.get("READER", "UNKNOWN"), data)
+        device = self.get_device(name)
+        if device is None:
+            return False
+        self._configs[name] = data
+        if self._event_func is not None:
+            device.on_event = self._event_func
+        if self._connecting:
+            self._start_device(device)
+        return True
+
+    async def _remove_device(self, name: str):
+        """Stop one device and forget it."""
+        device = self._devices_by_name.pop(name, None)
+        self._configs.pop(name, None)
+        task = self._tasks_by_name.pop(name, None)
+        if task is not None:
+            # The connect runner closes the device resources when cancelled
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            if task in self._connect_tasks:
+                self._connect_tasks.remove(task)
+        elif device is not None:
+            await self._close_device_resources(device)
+        if device in self.devices:
+            self.devices.remove(device)
+
+    def _apply_runtime_settings(self, name: str, previous: dict, data: dict) -> bool:
+        """Push runtime-safe changes to a running device. Returns False if it must be restarted."""
+        runtime = RUNTIME_SETTINGS.get(data.get("READER"), {})
+        changed = {key for key in previous.keys() | data.keys() if previous.get(key) != data.get(key)}
+        if not changed <= runtime.keys() or any(key not in data for key in changed):
+            return False
+
+        device = self.get_device(name)
+        try:
+            device.update_settings(**{runtime[key]: data[key] for key in changed})
+        except Exception as e:
+            logging.warning(f"⚠️ Could not update '{name}' in place, restarting: {e}")
+            return False
+        self._configs[name] = data
+        return True
+
+    def _snapshot_files(self) -> Dict[str, Tuple[int, int]]:
+        """Return (mtime, size) of every device file."""
+        snapshot = {}
+        try:
+            with os.scandir(self._devices_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return snapshot
+
+    async def watch_devices(self, interval: float = 2.0):
+        """Poll devices_path and reload the devices whenever a file changes. Runs until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            if self._snapshot_files() == self._files:
+                continue
+            try:
+                await self.reload_devices()
+            except Exception as e:
+                logging.error(f"❌ Error reloading devices: {e}")
+
+    def start_watching(self, interval: float = 2.0):
+        """Start watching devices_path for changes in the background."""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self.watch_devices(interval))
+
+    async def stop_watching(self):
+        """Stop watching devices_path."""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+
     def get_devices(self):
         """Return a list of device names."""
         return [device.name for device in self.devices]
 
     def get_device_config(self, name: str):
-        if name not in [device.name for device in self.devices]:
+        if name not in self._devices_by_name:
             return None
         try:
             with open(os.path.join(self._devices_path, f"{name}.json"), "r", encoding="utf-8") as f:
@@ -308,7 +556,7 @@ class DeviceManager:
         return len(self.devices)
 
     def get_device(self, name: str):
-        return next((device for device in self.devices if device.name == name), None)
+        return self._devices_by_name.get(name)
 
     def get_device_info(self, name: Optional[str] = None) -> List[Dict]:
         """
@@ -318,12 +566,7 @@ class DeviceManager:
         If name is provided, returns info for the specified device only.
         """
         if name is None:
-            info_list = []
-            for device in self.devices:
-                info = self._get_single_device_info(device.name)
-                if info:
-                    info_list.append(info)
-            return info_list
+            return [self._device_info(device) for device in self.devices]
 
         info = self._get_single_device_info(name)
         return [info] if info else []
@@ -335,9 +578,12 @@ class DeviceManager:
         device = self.get_device(name)
         if not device:
             return None
+        return self._device_info(device)
 
+    @staticmethod
+    def _device_info(device) -> Dict:
         is_connected: bool = device.is_connected
-        is_reading: bool = device.is_reading if is_connected else False
+        is_reading: bool = getattr(device, "is_reading", False) if is_connected else False
         is_gpi_trigger_on: bool = getattr(device, "is_gpi_trigger_on", False)
         return {
             "name": device.name,
@@ -352,7 +598,7 @@ class DeviceManager:
         Check if any device is currently reading tags.
         """
         for device in self.devices:
-            if device.is_connected and device.is_reading:
+            if device.is_connected and getattr(device, "is_reading", False):
                 return True
         return False
 
@@ -422,35 +668,73 @@ class DeviceManager:
             logging.error(f"❌ Error stopping inventory on device '{name}': {e}")
             return False
 
-    async def start_inventory_all(self) -> Dict[str, bool]:
+    async def start_inventory_all(
+        self, concurrency: Optional[int] = None, timeout: Optional[float] = 15.0, detailed: bool = False
+    ) -> Dict[str, bool] | Dict[str, Dict]:
         """
-        Start inventory on all connected RFID devices.
+        Start inventory on all connected RFID devices at the same time.
+
+        Args:
+                concurrency: Maximum devices commanded at once (None for no limit)
+                timeout: Seconds each device may take before it counts as failed (None waits forever)
+                detailed: Return {"success", "elapsed", "error"} per device instead of a bool
 
         Returns a dictionary with device names as keys and success status as values.
         """
-        results = {}
+        names = []
+        skipped = {}
         for device in self.devices:
             if device.device_type == "rfid" and device.is_connected:
                 if not getattr(device, "is_gpi_trigger_on", False):
-                    success = await self.start_inventory(device.name)
-                    results[device.name] = success
+                    names.append(device.name)
                 else:
                     logging.info(f"⚠️ Skipping device '{device.name}' (GPI trigger is on).")
-                    results[device.name] = False
-        return results
+                    skipped[device.name] = {"success": False, "elapsed": 0.0, "error": "gpi_trigger"}
 
-    async def stop_inventory_all(self) -> Dict[str, bool]:
+        results = await self._run_on_devices(names, self.start_inventory, concurrency, timeout)
+        results.update(skipped)
+        return results if detailed else {name: result["success"] for name, result in results.items()}
+
+    async def stop_inventory_all(
+        self, concurrency: Optional[int] = None, timeout: Optional[float] = 15.0, detailed: bool = False
+    ) -> Dict[str, bool] | Dict[str, Dict]:
         """
-        Stop inventory on all connected RFID devices.
+        Stop inventory on all connected RFID devices at the same time.
+
+        Args:
+                concurrency: Maximum devices commanded at once (None for no limit)
+                timeout: Seconds each device may take before it counts as failed (None waits forever)
+                detailed: Return {"success", "elapsed", "error"} per device instead of a bool
 
         Returns a dictionary with device names as keys and success status as values.
         """
-        results = {}
-        for device in self.devices:
-            if device.device_type == "rfid" and device.is_connected:
-                success = await self.stop_inventory(device.name)
-                results[device.name] = success
-        return results
+        names = [device.name for device in self.devices if device.device_type == "rfid" and device.is_connected]
+        results = await self._run_on_devices(names, self.stop_inventory, concurrency, timeout)
+        return results if detailed else {name: result["success"] for name, result in results.items()}
+
+    async def _run_on_devices(
+        self, names: List[str], operation: Callable, concurrency: Optional[int], timeout: Optional[float]
+    ) -> Dict[str, Dict]:
+        """Run ``operation(name)`` for every device concurrently and time each one."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+        async def run(name: str) -> Tuple[str, Dict]:
+            async with semaphore or contextlib.nullcontext():
+                started = loop.time()
+                error = None
+                try:
+                    success = await asyncio.wait_for(operation(name), timeout)
+                except asyncio.TimeoutError:
+                    logging.warning(f"⏱️ Device '{name}' did not answer within {timeout}s.")
+                    success, error = False, "timeout"
+                except Exception as e:
+                    success, error = False, str(e)
+                if not success and error is None:
+                    error = "failed"
+                return name, {"success": success, "elapsed": loop.time() - started, "error": error}
+
+        return dict(await asyncio.gather(*(run(name) for name in names)))
 
     async def write_epc(self, device_name: str, write_tag: WriteTagValidator) -> Tuple[bool, Optional[str]]:
         device = self.get_device(device_name)
@@ -461,7 +745,9 @@ class DeviceManager:
             return False, f"Device '{device_name}' does not support writing EPC."
 
         try:
-            await device.write_epc(**write_tag.model_dump())
+            success = await device.write_epc(**write_tag.model_dump())
+            if success is False:
+                return False, f"Write on device '{device_name}' failed."
             return True, None
         except Exception as e:
             return False, str(e)
@@ -0,0 +1,99 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from typing import Awaitable, Callable
+
+
+class DNSCache:
+    """Asynchronous host name resolution with a TTL cache shared by all devices.
+
+    Lookups go through ``loop.getaddrinfo`` (a worker thread), so a slow
+    resolver never blocks the event loop. Results are cached for ``ttl``
+    seconds and failures for ``negative_ttl`` seconds; concurrent lookups of
+    the same host share one request. IP literals are returned as they are.
+
+    Args:
+        ttl: Seconds a resolved address is reused
+        negative_ttl: Seconds a failed lookup is remembered
+        getaddrinfo: Async resolver with the signature of ``loop.getaddrinfo``
+            (the running loop's by default)
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        getaddrinfo: Callable[..., Awaitable[list]] | None = None,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._getaddrinfo = getaddrinfo
+
+        # host -> (address or None for a failure, expires at)
+        self._cache: dict[str, tuple[str | None, float]] = {}
+        # host -> lookup in progress
+        self._pending: dict[str, asyncio.Future] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, host: str, port: int = 0) -> str:
+        """Return an IPv4 address for ``host``.
+
+        Raises:
+            OSError: If the host can not be resolved
+        """
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Lookups of another (closed) loop can not be awaited
+            self._loop = loop
+            self._pending.clear()
+
+        cached = self._cache.get(host)
+        if cached is not None and cached[1] > time.monotonic():
+            self.hits += 1
+            if cached[0] is None:
+                raise OSError(f"Could not resolve {host}")
+            return cached[0]
+
+        self.misses += 1
+        pending = self._pending.get(host)
+        if pending is None:
+            pending = self._pending[host] = loop.create_task(self._lookup(host, port))
+        return await asyncio.shield(pending)
+
+    def invalidate(self, host: str | None = None):
+        """Forget one host, or every host if None."""
+        if host is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(host, None)
+
+    async def _lookup(self, host: str, port: int) -> str:
+        getaddrinfo = self._getaddrinfo or self._loop.getaddrinfo
+        try:
+            infos = await getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_STREAM)
+            if not infos:
+                raise OSError(f"No address for {host}")
+            address = infos[0][4][0]
+        except OSError as e:
+            logging.warning(f"🌐 Could not resolve {host}: {e}")
+            self._cache[host] = (None, time.monotonic() + self.negative_ttl)
+            raise
+        finally:
+            self._pending.pop(host, None)
+
+        self._cache[host] = (address, time.monotonic() + self.ttl)
+        return address
+
+
+# Process-wide cache shared by all devices
+dns_cache = DNSCache()
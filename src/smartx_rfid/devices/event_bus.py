@@ -0,0 +1,308 @@
+import asyncio
+import inspect
+import logging
+from collections import deque
+from typing import Callable, Iterable
+
+# What a full subscriber queue does with a new event
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class Subscription:
+    """One subscriber of an EventBus with its own bounded queue and delivery task.
+
+    Use EventBus.subscribe to create one.
+    """
+
+    def __init__(
+        self,
+        handler: Callable,
+        devices: Iterable[str] | None,
+        event_types: Iterable[str] | None,
+        tags: Iterable[str] | None,
+        maxsize: int,
+        policy: str,
+        name: str,
+        max_overflow: int = 100_000,
+        thread: bool = True,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Invalid policy '{policy}', expected one of {POLICIES}")
+        self.handler = handler
+        self.devices = set(devices) if devices is not None else None
+        self.event_types = set(event_types) if event_types is not None else None
+        self.tags = set(tags) if tags is not None else None
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name
+        self.max_overflow = max_overflow
+        # Sync handlers run in a worker thread so a blocking one never stalls the loop
+        self.thread = thread and not inspect.iscoroutinefunction(handler)
+
+        self._queue: deque = deque()
+        # Events of a BLOCK subscriber published while its queue was full (up to max_overflow)
+        self._overflow: deque = deque()
+        self._ready: asyncio.Event | None = None
+        self._space: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._busy = False
+
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+
+    def matches(self, name: str, event_type: str, data) -> bool:
+        if self.devices is not None and name not in self.devices:
+            return False
+        if self.event_types is not None and event_type not in self.event_types:
+            return False
+        if self.tags is not None:
+            if not isinstance(data, dict):
+                return False
+            if data.get("epc") not in self.tags and data.get("tid") not in self.tags:
+                return False
+        return True
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue) + len(self._overflow)
+
+    def is_full(self) -> bool:
+        return len(self._queue) >= self.maxsize
+
+    def put(self, event: tuple):
+        """Enqueue without blocking, applying the overflow policy."""
+        if self.is_full():
+            if self.policy == DROP_NEWEST:
+                self.dropped += 1
+                return
+            if self.policy == DROP_OLDEST:
+                self._queue.popleft()
+                self.dropped += 1
+            elif len(self._overflow) >= self.max_overflow:
+                # Hard limit of a BLOCK subscriber that can not keep up
+                self.dropped += 1
+                return
+            else:
+                self._overflow.append(event)
+                self.max_depth = max(self.max_depth, self.depth)
+                self._wakeup()
+                return
+        self._queue.append(event)
+        self.max_depth = max(self.max_depth, self.depth)
+        self._wakeup()
+
+    async def wait_for_space(self):
+        while self.is_full() and self._task is not None and self._loop is asyncio.get_running_loop():
+            self._space.clear()
+            await self._space.wait()
+
+    def _wakeup(self):
+        if self._ready is not None:
+            self._ready.set()
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Start delivering on ``loop`` (a task of another, closed loop is replaced)."""
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        self._loop = loop
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        if self._queue or self._overflow:
+            self._ready.set()
+        self._task = loop.create_task(self._deliver())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._loop = None
+        self._busy = False
+
+    async def _deliver(self):
+        while True:
+            if not self._queue and not self._overflow:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            if self._queue:
+                event = self._queue.popleft()
+                if self._overflow:
+                    self._queue.append(self._overflow.popleft())
+            else:
+                event = self._overflow.popleft()
+            self._space.set()
+
+            self._busy = True
+            try:
+                if self.thread:
+                    result = await asyncio.to_thread(self.handler, *event)
+                else:
+                    result = self.handler(*event)
+                if inspect.isawaitable(result):
+                    await result
+                self.delivered += 1
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"❌ Error in event subscriber '{self.name}' for '{event[0]}': {e}")
+            finally:
+                self._busy = False
+
+            # Let other subscribers and protocols run between handlers that did not suspend
+            await asyncio.sleep(0)
+
+    def get_metrics(self) -> dict:
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "queue_depth": self.depth,
+            "overflow": len(self._overflow),
+            "max_depth": self.max_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+class EventBus:
+    """Fan-out of device events to any number of subscribers.
+
+    Devices publish with the ``on_event(name, event_type, data)`` signature,
+    so ``device.on_event = bus.publish`` is all a device needs. Publishing only
+    appends to the queues of the matching subscribers and never runs handlers
+    or blocks; each subscriber drains its own queue in a task, one event at a
+    time. Coroutine handlers run on the loop and must not block. Plain
+    functions run in a worker thread (``asyncio.to_thread``) unless
+    subscribed with ``thread=False``, so a blocking one (a database write...)
+    only delays its own events.
+
+    Subscribers can filter by device name, event type and tag (EPC or TID of
+    "tag" events). When a subscriber's queue is full, ``drop_oldest`` discards
+    the oldest queued event, ``drop_newest`` discards the new one and ``block``
+    keeps the event: ``publish`` parks it beyond the limit (up to
+    ``max_overflow`` events, newer ones are dropped) and ``publish_async``
+    waits for room.
+
+    Usage:
+        event_bus.subscribe(save_tags, event_types=["tag"], maxsize=10_000)
+        event_bus.subscribe(on_connection, devices=["R700_1"], event_types=["connection"])
+        manager = DeviceManager("devices", event_bus=event_bus)
+    """
+
+    def __init__(self):
+        self._subscriptions: list[Subscription] = []
+        self.published = 0
+        self.unmatched = 0
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        handler: Callable,
+        devices: Iterable[str] | None = None,
+        event_types: Iterable[str] | None = None,
+        tags: Iterable[str] | None = None,
+        maxsize: int = 1000,
+        policy: str = DROP_OLDEST,
+        name: str | None = None,
+        max_overflow: int = 100_000,
+        thread: bool = True,
+    ) -> Subscription:
+        """Register a handler called with (name, event_type, data).
+
+        Args:
+            handler: Function or coroutine function
+            devices: Only events of these device names (None for all)
+            event_types: Only these event types (None for all)
+            tags: Only "tag" events whose EPC or TID is listed (None for all events)
+            maxsize: Events queued for this subscriber at most
+            policy: What to do when the queue is full (drop_oldest, drop_newest or block)
+            name: Name used in logs and metrics (the handler's name by default)
+            max_overflow: Events a ``block`` subscriber keeps beyond ``maxsize`` at most
+            thread: Run a plain function handler in a worker thread (False for
+                quick handlers that must run on the loop)
+
+        Returns:
+            The Subscription, to unsubscribe or read its metrics
+        """
+        subscription = Subscription(
+            handler,
+            devices,
+            event_types,
+            tags,
+            maxsize,
+            policy,
+            name or getattr(handler, "__qualname__", repr(handler)),
+            max_overflow,
+            thread,
+        )
+        self._subscriptions.append(subscription)
+        try:
+            subscription.start(asyncio.get_running_loop())
+        except RuntimeError:
+            # No running loop yet; started on the first publish
+            pass
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.stop()
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, name: str, event_type: str, data=None):
+        """Queue an event for every matching subscriber. Never blocks."""
+        self.published += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Published from outside the loop (e.g. a sync test); delivered once a loop runs
+            loop = None
+        matched = False
+        for subscription in self._subscriptions:
+            if subscription.matches(name, event_type, data):
+                matched = True
+                subscription.put((name, event_type, data))
+                if loop is not None and subscription._loop is not loop:
+                    subscription.start(loop)
+        if not matched:
+            self.unmatched += 1
+
+    async def publish_async(self, name: str, event_type: str, data=None):
+        """Like publish, but wait while a matching ``block`` subscriber is full."""
+        for subscription in self._subscriptions:
+            if subscription.policy == BLOCK and subscription.matches(name, event_type, data):
+                await subscription.wait_for_space()
+        self.publish(name, event_type, data)
+
+    async def drain(self, timeout: float | None = None):
+        """Wait until every queued event has been handled."""
+
+        async def idle():
+            while any(s.depth or s._busy for s in self._subscriptions):
+                await asyncio.sleep(0.005)
+
+        await asyncio.wait_for(idle(), timeout)
+
+    def close(self):
+        """Stop every delivery task (queued events are kept)."""
+        for subscription in self._subscriptions:
+            subscription.stop()
+
+    def get_metrics(self) -> dict:
+        """Published events and per-subscriber queue depth (and overflow), drops and errors."""
+        return {
+            "published": self.published,
+            "unmatched": self.unmatched,
+            "subscribers": [subscription.get_metrics() for subscription in self._subscriptions],
+        }
+
+
+# Process-wide bus devices can publish to
+event_bus = EventBus()
@@ -1,14 +1,21 @@
 import asyncio
 import logging
-import time
+import re
 
-import serial.tools.list_ports
 import serial_asyncio
 from typing import Callable
+from smartx_rfid.utils.crc import crc16, verify_crc
 from smartx_rfid.utils.event import on_event
 
 
 from smartx_rfid.devices._base import DeviceBase
+from smartx_rfid.devices.generic.decoders import FrameDecoder
+from smartx_rfid.devices.port_discovery import port_discovery
+from smartx_rfid.devices.reconnect import Backoff, ReconnectPolicy, get_policy
+
+# Message delimiters and incomplete-message timeout (seconds)
+DELIMITERS = re.compile(rb"[\r\n]")
+RX_TIMEOUT = 0.3
 
 
 class SERIAL(DeviceBase, asyncio.Protocol):
@@ -35,6 +42,8 @@ class SERIAL(DeviceBase, asyncio.Protocol):
         vid: int = 1,
         pid: int = 1,
         reconnection_time: int = 3,
+        decoder: FrameDecoder | None = None,
+        reconnect_policy: ReconnectPolicy | None = None,
     ):
         """
         Initialize the SERIAL protocol handler.
@@ -45,7 +54,10 @@ class SERIAL(DeviceBase, asyncio.Protocol):
                 baudrate: Communication baudrate
                 vid: USB Vendor ID for auto-detection
                 pid: USB Product ID for auto-detection
-                reconnection_time: Delay between reconnection attempts
+                reconnection_time: Seconds to wait for a matching port in AUTO mode
+                decoder: Binary frame decoder; when set, frames are emitted as "frame"
+                        events (bytes or memoryview) instead of text lines
+                reconnect_policy: Backoff between connection attempts (default: the SERIAL policy)
         """
         DeviceBase.__init__(self)
         self.name = name
@@ -56,12 +68,16 @@ class SERIAL(DeviceBase, asyncio.Protocol):
         self.vid = vid
         self.pid = pid
         self.reconnection_time = reconnection_time
+        self.backoff = Backoff(reconnect_policy or get_policy("SERIAL"))
+        self.decoder = decoder
 
         self.transport = None
         self.on_con_lost = None
         self.rx_buffer = bytearray()
         self.last_byte_time = None
+        self._timeout_handle: asyncio.TimerHandle | None = None
         self.is_auto = self.port == "AUTO"
+        self.port_discovery = port_discovery
 
         self.is_connected = False
         self.is_reading = False
@@ -84,44 +100,55 @@ class SERIAL(DeviceBase, asyncio.Protocol):
         Callback invoked when data is received from the serial port.
 
         Handles incoming data with automatic message parsing and timeout management.
-        Messages are delimited by '\n' or '\r' characters.
+        Messages are delimited by '\n' or '\r' characters, unless a decoder
+        is configured, in which case it splits the binary frames.
 
         Args:
                 data: Raw bytes received from the serial port
         """
-        now = time.time()
-        self.rx_buffer += data
-        self.last_byte_time = now
-
-        # Cancela tarefa anterior de timeout
-        if hasattr(self, "_timeout_task") and self._timeout_task and not self._timeout_task.done():
-            self._timeout_task.cancel()
-
-        # Cria nova tarefa de timeout
-        async def timeout_clear():
-            await asyncio.sleep(0.3)  # 300 ms
-            if self.last_byte_time and (time.time() - self.last_byte_time) >= 0.3:
-                if self.rx_buffer:
-                    self.rx_buffer.clear()
-                    logging.warning("⚠️ Buffer cleared due to 300ms timeout without receiving data.")
-
-        self._timeout_task = self.create_task(timeout_clear())
-
-        # Processa mensagens completas
-        while b"\n" in self.rx_buffer or b"\r" in self.rx_buffer:
-            # Encontra posição do primeiro delimitador
-            positions = [p for p in [self.rx_buffer.find(b"\n"), self.rx_buffer.find(b"\r")] if p != -1]
-            pos = min(positions)
-
-            # Extrai mensagem em bytes e converte para string
-            message_bytes = self.rx_buffer[:pos]
-            message = message_bytes.decode(errors="ignore").strip("\r\n")
-
-            # Remove mensagem do buffer
-            self.rx_buffer = self.rx_buffer[pos + 1 :]
-
-            if message:
+        loop = asyncio.get_running_loop()
+        self.last_byte_time = loop.time()
+
+        if self.decoder is not None:
+            for frame in self.decoder.feed(data):
+                self.on_event(self.name, "frame", frame)
+            if self.decoder.pending and self._timeout_handle is None:
+                self._timeout_handle = loop.call_later(RX_TIMEOUT, self._on_rx_timeout)
+            return
+
+        buffer = self.rx_buffer
+        buffer += data
+
+        # Processa mensagens completas numa única passada
+        start = 0
+        for match in DELIMITERS.finditer(buffer):
+            end = match.start()
+            if end > start:
+                message = buffer[start:end].decode(errors="ignore")
                 self.on_event(self.name, "receive", message)
+            start = end + 1
+        if start:
+            del buffer[:start]
+
+        # Um único timer, armado só enquanto há mensagem incompleta no buffer
+        if buffer and self._timeout_handle is None:
+            self._timeout_handle = loop.call_later(RX_TIMEOUT, self._on_rx_timeout)
+
+    def _on_rx_timeout(self):
+        """Clear an incomplete message after RX_TIMEOUT seconds without data."""
+        self._timeout_handle = None
+        if not self.rx_buffer and not (self.decoder and self.decoder.pending):
+            return
+        loop = asyncio.get_running_loop()
+        remaining = self.last_byte_time + RX_TIMEOUT - loop.time()
+        if remaining > 0:
+            # Bytes arrived since the timer was armed: wait for the rest of the period
+            self._timeout_handle = loop.call_later(remaining, self._on_rx_timeout)
+            return
+        self.rx_buffer.clear()
+        if self.decoder is not None:
+            self.decoder.reset()
+        logging.warning("⚠️ Buffer cleared due to 300ms timeout without receiving data.")
 
     def connection_lost(self, exc):
         """
@@ -134,6 +161,9 @@ class SERIAL(DeviceBase, asyncio.Protocol):
         self.transport = None
         self.is_connected = False
         self.step = 0
+        if self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+            self._timeout_handle = None
 
         if self.on_con_lost:
             self.on_con_lost.set()
@@ -182,41 +212,39 @@ class SERIAL(DeviceBase, asyncio.Protocol):
         while self._running:
             self.on_con_lost = asyncio.Event()
 
-            # If AUTO mode, try to detect port by VID/PID
+            # If AUTO mode, get a port matching VID/PID from the shared discovery
             if self.is_auto:
                 logging.info("🔍 Auto-detecting port")
-                ports = serial.tools.list_ports.comports()
-                found_port = None
-                for p in ports:
-                    # p.vid and p.pid are integers (e.g. 0x0001 == 1 decimal)
-                    if p.vid == self.vid and p.pid == self.pid:
-                        found_port = p.device
-                        logging.info(f"✅ Detected port: {found_port}")
-                        break
+                found_port = await self.port_discovery.acquire(
+                    self.vid, self.pid, owner=self, timeout=self.reconnection_time
+                )
 
                 if found_port is None:
                     logging.warning(f"⚠️ No port with VID={self.vid} and PID={self.pid} found.")
-                    logging.info(f"⏳ Retrying in {self.reconnection_time} seconds...")
-                    await asyncio.sleep(self.reconnection_time)
-                    continue  # try to detect again in next loop
-                else:
-                    self.port = found_port
+                    # acquire returns at once with a short timeout and a fresh cache
+                    await self.backoff.wait(self.name)
+                    continue
+                logging.info(f"✅ Detected port: {found_port}")
+                self.port = found_port
 
             try:
                 logging.info(f"🔌 Trying to connect to {self.port} at {self.baudrate} bps...")
                 await serial_asyncio.create_serial_connection(loop, lambda: self, self.port, baudrate=self.baudrate)
                 logging.info("🟢 Successfully connected.")
+                self.backoff.reset()
                 await self.on_con_lost.wait()
                 logging.info("🔄 Connection lost. Attempting to reconnect...")
             except Exception as e:
                 logging.warning(f"❌ Connection error: {e}")
+                # The port could not be opened; let another device claim it
+                if self.is_auto:
+                    self.port_discovery.release(self)
 
             # If in AUTO mode, reset port to "AUTO" to force detection next loop
             if self.is_auto:
                 self.port = "AUTO"
 
-            logging.info("⏳ Waiting 3 seconds before retrying...")
-            await asyncio.sleep(3)
+            await self.backoff.wait(self.name)
 
     async def close(self):
         """Shut down background tasks and close transport for this device."""
@@ -230,6 +258,8 @@ class SERIAL(DeviceBase, asyncio.Protocol):
         except Exception:
             pass
 
+        self.port_discovery.release(self)
+
         # close transport if present
         try:
             if self.transport:
@@ -245,31 +275,26 @@ class SERIAL(DeviceBase, asyncio.Protocol):
 
     def crc16(self, data: bytes, poly=0x8408):
         """
-        Calculate CRC16 checksum for data validation.
+        Calculate CRC16 checksum for an outgoing frame.
 
         Args:
-            data: Input bytes to calculate checksum
-            poly: CRC polynomial value
+                data: Input bytes (last 2 bytes are excluded from calculation)
+                poly: CRC polynomial (default: 0x8408, CRC-16/MCRF4XX)
 
         Returns:
-            int: 16-bit checksum value
+                int: 16-bit CRC checksum
         """
+        return crc16(data[:-2], poly)  # exclude last two bytes (CRC placeholder)
+
+    def verify_crc(self, frame: bytes, poly=0x8408) -> bool:
         """
-        Calculate CRC-16/CCITT-FALSE checksum.
+        Check the CRC16 of an incoming frame (last 2 bytes, low byte first).
 
         Args:
-                data: Input bytes (last 2 bytes are excluded from calculation)
-                poly: CRC polynomial (default: 0x8408 for CCITT-FALSE)
+                frame: Received frame including the CRC
+                poly: CRC polynomial
 
         Returns:
-                int: 16-bit CRC checksum
+                bool: True if the CRC matches
         """
-        crc = 0xFFFF
-        for byte in data[:-2]:  # exclude last two bytes (CRC placeholder)
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc = (crc >> 1) ^ poly
-                else:
-                    crc >>= 1
-        return crc & 0xFFFF
+        return verify_crc(frame, poly)
@@ -2,12 +2,16 @@ import asyncio
 import logging
 
 from .helpers import Helpers
+from .send_queue import SendQueue
 from smartx_rfid.utils.event import on_event
 from typing import Callable
 from smartx_rfid.devices._base import DeviceBase
+from smartx_rfid.devices.generic.decoders import FrameDecoder
+from smartx_rfid.devices.heartbeat import heartbeat
+from smartx_rfid.devices.reconnect import Backoff, ReconnectPolicy, connect_limiter, get_policy
 
 
-class TCP(DeviceBase, Helpers):
+class TCP(DeviceBase, Helpers, SendQueue):
     """TCP connection handler for network communication."""
 
     def __init__(
@@ -15,6 +19,14 @@ class TCP(DeviceBase, Helpers):
         name: str = "GENERIC_TCP",
         ip: str = "192.168.1.101",
         port: int = 23,
+        heartbeat_interval: float = 3,
+        heartbeat_timeout: float | None = None,
+        decoder: FrameDecoder | None = None,
+        separator: bytes | str = b"\n",
+        limit: int = 65536,
+        partial_timeout: float | None = 0.1,
+        high_water: int = 65536,
+        reconnect_policy: ReconnectPolicy | None = None,
     ):
         """
         Create TCP connection.
@@ -23,6 +35,15 @@ class TCP(DeviceBase, Helpers):
             name: Device name
             ip: IP address to connect
             port: TCP port number
+            heartbeat_interval: Seconds between pings
+            heartbeat_timeout: Seconds without data before the peer is considered dead (None disables)
+            decoder: Binary frame decoder; when set, frames are emitted as "frame"
+                events (bytes or memoryview) instead of text lines
+            separator: Line terminator
+            limit: Maximum line length in bytes (longer lines are dropped)
+            partial_timeout: Seconds a line without separator waits before it is emitted (None waits forever)
+            high_water: Queued bytes above which write() waits for the queue to be sent
+            reconnect_policy: Backoff between connection attempts (default: the TCP policy)
         """
         DeviceBase.__init__(self)
         self.name = name
@@ -30,6 +51,15 @@ class TCP(DeviceBase, Helpers):
 
         self.ip = ip
         self.port = port
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.heartbeat = heartbeat
+        self.backoff = Backoff(reconnect_policy or get_policy("TCP"))
+        self.connect_limiter = connect_limiter
+        self.decoder = decoder
+        self.separator = separator.encode() if isinstance(separator, str) else separator
+        self.limit = limit
+        self.partial_timeout = partial_timeout
 
         self.reader = None
         self.writer = None
@@ -37,29 +67,30 @@ class TCP(DeviceBase, Helpers):
         self.is_connected = False
         self.on_event: Callable = on_event
 
+        self.init_send_queue(high_water)
+
     async def connect(self):
         """Connect to TCP server and keep connection alive."""
         while self._running:
             try:
                 logging.info(f"Connecting: {self.name} - {self.ip}:{self.port}")
-                self.reader, self.writer = await asyncio.wait_for(
-                    asyncio.open_connection(self.ip, self.port), timeout=3
-                )
+                # asyncio.timeout, unlike wait_for on 3.11, never drops a cancellation racing the connect
+                async with self.connect_limiter.slot(), asyncio.timeout(3):
+                    self.reader, self.writer = await asyncio.open_connection(self.ip, self.port, limit=self.limit)
                 self.is_connected = True
+                self.backoff.reset()
+                if self.decoder is not None:
+                    self.decoder.reset()
                 self.on_event(self.name, "connection", True)
 
-                # Start the receive and monitor tasks
-                tasks = [
-                    self.create_task(self.receive_data()),
-                    self.create_task(self.monitor_connection()),
-                ]
-
-                # Wait until one of the tasks completes (e.g. disconnection)
-                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
-
-                # Cancel any remaining tasks
-                for task in pending:
-                    task.cancel()
+                # Receive until disconnection; pings and liveness run on the shared heartbeat
+                self.start_sender()
+                self.start_heartbeat()
+                try:
+                    await self.receive_data()
+                finally:
+                    self.heartbeat.unregister(self)
+                    self.stop_sender()
 
                 self.is_connected = False
                 self.on_event(self.name, "connection", False)
@@ -69,7 +100,7 @@ class TCP(DeviceBase, Helpers):
                 self.on_event(self.name, "connection", False)
                 logging.error(f"[CONNECTION ERROR] {e}")
 
-            await asyncio.sleep(3)
+            await self.backoff.wait(self.name)
 
     async def close(self):
         # stop connect loop
@@ -89,23 +120,3 @@ class TCP(DeviceBase, Helpers):
             pass
 
         await self.shutdown()
-
-    async def write(self, data: str, verbose=True):
-        """
-        Send data through TCP connection.
-
-        Args:
-            data: Text to send
-            verbose: Show sent data in logs
-        """
-        if self.is_connected and self.writer:
-            try:
-                data = data + "\n"
-                self.writer.write(data.encode())
-                await self.writer.drain()
-                if verbose:
-                    logging.info(f"[SENT] {data.strip()}")
-            except Exception as e:
-                logging.warning(f"[SEND ERROR] {e}")
-                self.is_connected = False
-                self.on_event(self.name, "connection", False)
@@ -5,40 +5,115 @@ import logging
 class Helpers:
     """Helper functions for TCP connection management."""
 
-    async def monitor_connection(self):
-        """Check if TCP connection is still alive."""
-        while self.is_connected:
-            await asyncio.sleep(3)
-            if (self.writer and self.writer.is_closing()) or (self.reader and self.reader.at_eof()):
-                self.is_connected = False
-                logging.info("[DISCONNECTED] Socket closed.")
-                break
+    def start_heartbeat(self):
+        """Register the connection with the shared heartbeat scheduler."""
+        self.heartbeat.register(
+            self,
+            ping=lambda: self.write("ping", verbose=False),
+            interval=self.heartbeat_interval,
+            timeout=self.heartbeat_timeout,
+            is_alive=lambda: not ((self.writer and self.writer.is_closing()) or (self.reader and self.reader.at_eof())),
+            on_dead=self.on_heartbeat_dead,
+        )
 
-            await self.write("ping", verbose=False)
+    def on_heartbeat_dead(self):
+        """Close a connection the heartbeat found dead so the connect loop reconnects."""
+        self.is_connected = False
+        logging.info("[DISCONNECTED] Socket closed.")
+        if self.writer:
+            self.writer.close()
 
     async def receive_data(self):
-        """Receive and process incoming TCP data."""
-        buffer = ""
+        """
+        Receive and process incoming TCP data.
+
+        Lines end with ``self.separator`` (stripped of surrounding whitespace,
+        empty lines skipped) and are emitted as "receive" events. All lines
+        completed by one read are emitted in the same batch, so a burst is
+        handled with one wake-up.
+
+        Partial line: if no byte arrives for ``partial_timeout`` seconds while
+        bytes without a separator are buffered, they are emitted as a line of
+        their own and the next bytes start a new line. The timer restarts with
+        every read, so a line split across TCP segments stays one line. With
+        ``partial_timeout=None`` a partial line waits for its separator. A
+        partial line left at EOF is always emitted. Lines longer than
+        ``limit`` are dropped.
+        """
+        if self.decoder is not None:
+            await self.receive_frames()
+            return
+
+        reader = self.reader
+        separator = self.separator
+        buffer = bytearray()
+        # Bytes of buffer already searched for the separator
+        searched = 0
+        # Set while the rest of an oversized line is being skipped
+        dropping = False
         try:
             while True:
                 try:
-                    data = await asyncio.wait_for(self.reader.read(1024), timeout=0.1)
+                    async with asyncio.timeout(self.partial_timeout if buffer else None):
+                        data = await reader.read(65536)
                 except asyncio.TimeoutError:
-                    # Timeout: process what's in the buffer as a command
-                    if buffer:
-                        await self.on_received_cmd(buffer.strip())
-                        buffer = ""
+                    # Idle since the last byte: the partial line is complete
+                    self.emit_lines([bytes(buffer)])
+                    buffer.clear()
+                    searched = 0
                     continue
 
                 if not data:
+                    if buffer and not dropping:
+                        self.emit_lines([bytes(buffer)])
                     raise ConnectionError("Connection lost")
+                self.heartbeat.mark_rx(self)
+                buffer += data
+
+                lines = []
+                start = 0
+                while (end := buffer.find(separator, max(start, searched))) >= 0:
+                    if dropping:
+                        dropping = False
+                    elif end - start > self.limit:
+                        logging.warning(f"[RECEIVE] Line longer than {self.limit} bytes dropped")
+                    else:
+                        lines.append(bytes(buffer[start:end]))
+                    start = end + len(separator)
+                del buffer[:start]
+                # A separator may start in the last bytes and end in the next read
+                searched = max(0, len(buffer) - len(separator) + 1)
+
+                if len(buffer) > self.limit:
+                    if not dropping:
+                        logging.warning(f"[RECEIVE] Line longer than {self.limit} bytes dropped")
+                    dropping = True
+                    buffer.clear()
+                    searched = 0
+                self.emit_lines(lines)
+
+        except Exception as e:
+            self.is_connected = False
+            logging.error(f"[RECEIVE ERROR] {e}")
 
-                buffer += data.decode(errors="ignore")
+    def emit_lines(self, lines: list[bytes]):
+        """Emit a batch of received lines as "receive" events."""
+        for raw in lines:
+            line = raw.decode(errors="ignore").strip()
+            if line:
+                self.on_event(self.name, "receive", line)
+
+    async def receive_frames(self):
+        """Receive binary data and emit the frames split by the decoder."""
+        try:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    raise ConnectionError("Connection lost")
+                self.heartbeat.mark_rx(self)
 
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    # event received
-                    self.on_event(self.name, "receive", line.strip())
+                for frame in self.decoder.feed(data):
+                    self.on_event(self.name, "frame", frame)
 
         except Exception as e:
             self.is_connected = False
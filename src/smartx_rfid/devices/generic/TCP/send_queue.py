@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from collections import deque
+
+
+class SendQueue:
+    """Outbound queue for generic TCP connections.
+
+    ``write`` only appends the encoded message to a queue; a writer task
+    started per connection hands everything queued to the transport with one
+    ``writelines`` call per loop iteration and waits on ``drain()`` only when
+    the transport buffer is above its own limit. ``write`` waits only while
+    more than ``high_water`` bytes are queued, so bursts of small commands cost
+    one syscall instead of one per message.
+    """
+
+    def init_send_queue(self, high_water: int = 65536):
+        self.high_water = high_water
+        self._send_queue: deque[bytes] = deque()
+        self._queued_bytes = 0
+        self._send_ready = asyncio.Event()
+        self._send_space = asyncio.Event()
+        self._send_space.set()
+        self._sender: asyncio.Task | None = None
+        self._send_stats = {"bytes_sent": 0, "messages_sent": 0, "writes": 0, "max_queue_depth": 0}
+
+    def get_send_stats(self) -> dict:
+        """Return queue depth, queued bytes and totals sent on this device."""
+        return {"queue_depth": len(self._send_queue), "queued_bytes": self._queued_bytes, **self._send_stats}
+
+    async def write(self, data: str, verbose=True):
+        """
+        Queue data to send through the TCP connection.
+
+        Args:
+            data: Text to send
+            verbose: Show sent data in logs
+        """
+        if not (self.is_connected and self.writer):
+            logging.warning(f"[SEND ERROR] {self.name} - not connected")
+            return
+
+        encoded = (data + "\n").encode()
+        self._send_queue.append(encoded)
+        self._queued_bytes += len(encoded)
+        self._send_stats["max_queue_depth"] = max(self._send_stats["max_queue_depth"], len(self._send_queue))
+        self._send_ready.set()
+        if verbose:
+            logging.info(f"[SENT] {data}")
+
+        if self._queued_bytes > self.high_water:
+            self._send_space.clear()
+            await self._send_space.wait()
+
+    def start_sender(self):
+        """Start the writer task for the current connection."""
+        self.stop_sender()
+        self._sender = self.create_task(self._send_loop(self.writer))
+
+    def stop_sender(self):
+        """Stop the writer task and drop messages that were not sent."""
+        if self._sender is not None:
+            self._sender.cancel()
+            self._sender = None
+        self._send_queue.clear()
+        self._queued_bytes = 0
+        self._send_ready.clear()
+        # Release writers blocked on a full queue
+        self._send_space.set()
+
+    async def _send_loop(self, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                await self._send_ready.wait()
+                self._send_ready.clear()
+                if not self._send_queue:
+                    continue
+
+                batch = list(self._send_queue)
+                self._send_queue.clear()
+                size = self._queued_bytes
+                self._queued_bytes = 0
+                self._send_space.set()
+
+                writer.writelines(batch)
+                stats = self._send_stats
+                stats["writes"] += 1
+                stats["messages_sent"] += len(batch)
+                stats["bytes_sent"] += size
+                # Returns at once unless the transport buffer is above its limit
+                await writer.drain()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.warning(f"[SEND ERROR] {e}")
+            self.is_connected = False
+            self.on_event(self.name, "connection", False)
+            writer.close()
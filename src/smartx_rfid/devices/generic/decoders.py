@@ -0,0 +1,267 @@
+import logging
+
+from smartx_rfid.utils.crc import verify_crc
+
+
+class FrameDecoder:
+    """
+    Incremental frame decoder for the generic SERIAL and TCP devices.
+
+    ``feed`` takes the bytes of each read and returns the complete frames they
+    finish. While nothing is buffered the chunk is parsed in place and frames
+    are returned as ``memoryview`` slices of it (the chunk is immutable, so the
+    views stay valid); only a trailing partial frame is copied into the
+    internal buffer. Frames completed from buffered data are returned as
+    ``bytes``.
+
+    Subclasses implement ``_scan(buf, end)`` returning the ``(start, stop)``
+    spans of complete frames and the number of bytes consumed.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes of an incomplete frame."""
+        return len(self._buffer)
+
+    def reset(self):
+        """Drop any incomplete frame (e.g. after a receive timeout)."""
+        self._buffer.clear()
+
+    def feed(self, data: bytes) -> list[bytes | memoryview]:
+        """
+        Add received bytes and return the frames completed by them.
+
+        Args:
+            data: Bytes from one read
+
+        Returns:
+            list[bytes | memoryview]: Complete frames, in order
+        """
+        if not self._buffer:
+            view = memoryview(data)
+            spans, consumed = self._scan(data, len(data))
+            frames = [view[start:stop] for start, stop in spans]
+            if consumed < len(data):
+                self._buffer += view[consumed:]
+            return frames
+
+        buffer = self._buffer
+        buffer += data
+        spans, consumed = self._scan(buffer, len(buffer))
+        frames = [bytes(buffer[start:stop]) for start, stop in spans]
+        if consumed:
+            del buffer[:consumed]
+            self._consumed(consumed)
+        return frames
+
+    def _scan(self, buf, end: int) -> tuple[list[tuple[int, int]], int]:
+        raise NotImplementedError
+
+    def _consumed(self, count: int):
+        """Hook for decoders keeping offsets into the buffer."""
+
+
+class DelimiterDecoder(FrameDecoder):
+    """
+    Frames terminated by a delimiter (not included in the frame).
+
+    Args:
+        delimiter: Frame terminator
+        max_length: Incomplete frames longer than this are dropped
+    """
+
+    def __init__(self, delimiter: bytes = b"\n", max_length: int = 65536):
+        super().__init__()
+        self.delimiter = delimiter
+        self.max_length = max_length
+        # Where the delimiter search resumes in the buffer
+        self._searched = 0
+
+    def _scan(self, buf, end):
+        spans = []
+        start = 0
+        size = len(self.delimiter)
+        # Buffered bytes were already searched (minus a possibly split delimiter)
+        resume = max(self._searched - size + 1, 0) if buf is self._buffer else 0
+        position = buf.find(self.delimiter, resume, end)
+        while position != -1:
+            spans.append((start, position))
+            start = position + size
+            position = buf.find(self.delimiter, start, end)
+
+        if end - start > self.max_length:
+            logging.warning(f"⚠️ Frame longer than {self.max_length} bytes without delimiter dropped.")
+            start = end
+        # The bytes left over become the buffer and have all been searched
+        self._searched = end - start
+        return spans, start
+
+    def reset(self):
+        super().reset()
+        self._searched = 0
+
+
+class FixedSizeDecoder(FrameDecoder):
+    """
+    Frames of a fixed number of bytes.
+
+    Args:
+        size: Frame size in bytes
+    """
+
+    def __init__(self, size: int):
+        super().__init__()
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self.size = size
+
+    def _scan(self, buf, end):
+        count = end // self.size
+        return [(n * self.size, (n + 1) * self.size) for n in range(count)], count * self.size
+
+
+class LengthPrefixedDecoder(FrameDecoder):
+    """
+    Frames carrying their length in a header field. Frames include the header.
+
+    Args:
+        length_size: Size of the length field in bytes (1, 2 or 4)
+        byteorder: "big" or "little"
+        length_offset: Position of the length field in the header
+        length_adjustment: Added to the field value to get the bytes after the length field
+            (e.g. 2 when a CRC follows the payload and is not counted)
+        max_length: Frames announcing more bytes than this are treated as corrupt
+    """
+
+    def __init__(
+        self,
+        length_size: int = 2,
+        byteorder: str = "big",
+        length_offset: int = 0,
+        length_adjustment: int = 0,
+        max_length: int = 65536,
+    ):
+        super().__init__()
+        if length_size not in (1, 2, 4):
+            raise ValueError("length_size must be 1, 2 or 4")
+        self.length_size = length_size
+        self.byteorder = byteorder
+        self.length_offset = length_offset
+        self.length_adjustment = length_adjustment
+        self.max_length = max_length
+
+    def _scan(self, buf, end):
+        spans = []
+        start = 0
+        header = self.length_offset + self.length_size
+        while end - start >= header:
+            field = buf[start + self.length_offset : start + header]
+            length = int.from_bytes(field, self.byteorder) + self.length_adjustment
+            if length < 0 or length > self.max_length:
+                # Corrupt length: skip one byte and try to resynchronize
+                logging.warning(f"⚠️ Invalid frame length {length}, resynchronizing.")
+                start += 1
+                continue
+            stop = start + header + length
+            if stop > end:
+                break
+            spans.append((start, stop))
+            start = stop
+        return spans, start
+
+
+class StxEtxDecoder(FrameDecoder):
+    """
+    STX ... ETX frames, optionally followed by a CRC-16 (low byte first).
+
+    Frames are returned without STX, ETX and CRC. Bytes before an STX are
+    discarded, and frames with a wrong CRC are dropped and counted in
+    ``crc_errors``. Payloads must not contain the ETX byte (no escaping).
+
+    Args:
+        stx: Start byte
+        etx: End byte
+        crc: Verify a CRC-16/MCRF4XX of the payload after ETX
+        max_length: Incomplete frames longer than this are dropped
+    """
+
+    def __init__(self, stx: int = 0x02, etx: int = 0x03, crc: bool = True, max_length: int = 65536):
+        super().__init__()
+        self.stx = bytes([stx])
+        self.etx = bytes([etx])
+        self.crc_size = 2 if crc else 0
+        self.max_length = max_length
+        self.crc_errors = 0
+
+    def _scan(self, buf, end):
+        spans = []
+        start = 0
+        while True:
+            begin = buf.find(self.stx, start, end)
+            if begin == -1:
+                # No frame start: nothing worth keeping
+                return spans, end
+            stop = buf.find(self.etx, begin + 1, end)
+            if stop == -1 or stop + 1 + self.crc_size > end:
+                if end - begin > self.max_length:
+                    logging.warning(f"⚠️ Frame longer than {self.max_length} bytes without ETX dropped.")
+                    return spans, end
+                return spans, begin
+            if self.crc_size:
+                payload_crc = bytes(buf[begin + 1 : stop]) + bytes(buf[stop + 1 : stop + 3])
+                if not verify_crc(payload_crc):
+                    self.crc_errors += 1
+                    logging.warning("⚠️ Frame dropped: CRC mismatch.")
+                    start = stop + 1 + self.crc_size
+                    continue
+            spans.append((begin + 1, stop))
+            start = stop + 1 + self.crc_size
+
+
+DECODERS = {
+    "DELIMITER": (DelimiterDecoder, {"DELIMITER": "delimiter", "MAX_LENGTH": "max_length"}),
+    "FIXED_SIZE": (FixedSizeDecoder, {"SIZE": "size"}),
+    "LENGTH_PREFIXED": (
+        LengthPrefixedDecoder,
+        {
+            "LENGTH_SIZE": "length_size",
+            "BYTEORDER": "byteorder",
+            "LENGTH_OFFSET": "length_offset",
+            "LENGTH_ADJUSTMENT": "length_adjustment",
+            "MAX_LENGTH": "max_length",
+        },
+    ),
+    "STX_ETX": (StxEtxDecoder, {"STX": "stx", "ETX": "etx", "CRC": "crc", "MAX_LENGTH": "max_length"}),
+}
+
+
+def get_decoder(config: dict | str | None) -> FrameDecoder | None:
+    """
+    Build a decoder from a device JSON ``DECODER`` entry.
+
+    Example:
+        {"TYPE": "LENGTH_PREFIXED", "LENGTH_SIZE": 2, "BYTEORDER": "little"}
+        "DELIMITER"
+
+    Delimiters may be given as strings (e.g. "\\r\\n"); STX/ETX as integers.
+
+    Returns:
+        FrameDecoder | None: None when no decoder is configured
+    """
+    if not config:
+        return None
+    if isinstance(config, str):
+        config = {"TYPE": config}
+
+    decoder_type = str(config.get("TYPE", "")).upper()
+    if decoder_type not in DECODERS:
+        raise ValueError(f"Unknown decoder type '{decoder_type}'. Use one of {list(DECODERS)}")
+
+    decoder_class, options = DECODERS[decoder_type]
+    kwargs = {arg: config[key] for key, arg in options.items() if key in config}
+    if isinstance(kwargs.get("delimiter"), str):
+        kwargs["delimiter"] = kwargs["delimiter"].encode()
+    return decoder_class(**kwargs)
@@ -0,0 +1,195 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+class ThreadedDispatcher:
+    """Runs a blocking event handler in a thread pool, one serial lane per device.
+
+    Wraps an ``on_event(name, event_type, data)`` handler (a database insert,
+    a synchronous HTTP call...) so calling it only queues the event and
+    returns. Events of one device are handled in order, one at a time; events
+    of different devices run in parallel on up to ``max_workers`` threads.
+    A lane gives its thread back after ``batch`` events so busy devices do
+    not starve the others.
+
+    Handler run times are sampled to report their distribution.
+
+    Usage:
+        manager = DeviceManager("devices", event_func=ThreadedDispatcher(save_event, max_workers=8))
+        # or
+        event_bus.subscribe(ThreadedDispatcher(save_event), event_types=["tag"], thread=False)
+
+    Args:
+        handler: Called with (name, event_type, data) in a worker thread
+        max_workers: Threads of the pool
+        max_pending: Events queued across all devices at most; newer ones are dropped
+        batch: Events a lane handles before yielding its thread
+        samples: Latest handler run times kept for the latency distribution
+    """
+
+    def __init__(
+        self,
+        handler: Callable,
+        max_workers: int = 4,
+        max_pending: int = 100_000,
+        batch: int = 32,
+        samples: int = 10_000,
+    ):
+        self.handler = handler
+        self.max_pending = max_pending
+        self.batch = batch
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="smartx-handler")
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # device name -> queued (event_type, data, queued_at); a lane exists while it has a runner
+        self._lanes: dict[str, deque] = {}
+        # Bumped when lanes are discarded so runners of the old lanes exit
+        self._generation = 0
+        self._pending = 0
+        self._closed = False
+
+        self._run_times: deque = deque(maxlen=samples)
+        self._wait_times: deque = deque(maxlen=samples)
+        self.handled = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def __call__(self, name: str, event_type: str, data=None):
+        """Queue an event. Never blocks."""
+        with self._lock:
+            if self._closed or self._pending >= self.max_pending:
+                self.dropped += 1
+                return
+            lane = self._lanes.get(name)
+            if lane is not None:
+                self._pending += 1
+                lane.append((event_type, data, time.perf_counter()))
+                return
+            try:
+                # Under the lock so close() cannot shut the pool down in between
+                self._executor.submit(self._run_lane, name, self._generation)
+            except RuntimeError:
+                # The interpreter is shutting down
+                self.dropped += 1
+                return
+            self._pending += 1
+            self._lanes[name] = deque([(event_type, data, time.perf_counter())])
+
+    def _run_lane(self, name: str, generation: int):
+        for _ in range(self.batch):
+            with self._lock:
+                lane = self._lanes.get(name)
+                if lane is None or generation != self._generation:
+                    # Discarded by close(wait=False), maybe already replaced after start()
+                    return
+                if not lane:
+                    del self._lanes[name]
+                    self._idle.notify_all()
+                    return
+                event_type, data, queued_at = lane.popleft()
+
+            started = time.perf_counter()
+            failed = False
+            try:
+                self.handler(name, event_type, data)
+            except Exception as e:
+                logging.error(f"❌ Error in threaded handler for '{name}': {e}")
+                failed = True
+            finished = time.perf_counter()
+
+            with self._lock:
+                self._pending -= 1
+                if failed:
+                    self.errors += 1
+                else:
+                    self.handled += 1
+                self._run_times.append(finished - started)
+                self._wait_times.append(started - queued_at)
+
+        # Yield the thread; the lane keeps its place in the pool's queue
+        with self._lock:
+            if generation != self._generation:
+                return
+            try:
+                self._executor.submit(self._run_lane, name, generation)
+            except RuntimeError:
+                # The interpreter is shutting down
+                discarded = len(self._lanes.pop(name, ()))
+                self._pending -= discarded
+                self.dropped += discarded
+                self._idle.notify_all()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until every queued event was handled. Returns False on timeout."""
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._lanes, timeout)
+
+    def close(self, wait: bool = True):
+        """Stop accepting events and shut the pool down.
+
+        With ``wait`` the queued events are handled first (this blocks), otherwise
+        they are discarded and counted as dropped.
+        """
+        with self._lock:
+            self._closed = True
+            if not wait:
+                discarded = sum(len(lane) for lane in self._lanes.values())
+                self._pending -= discarded
+                self.dropped += discarded
+                self._lanes.clear()
+                self._generation += 1
+                self._idle.notify_all()
+        if wait:
+            self.wait_idle()
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def start(self):
+        """Accept events again after close() with a new pool."""
+        with self._lock:
+            if not self._closed:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="smartx-handler")
+            self._closed = False
+
+    @staticmethod
+    def _distribution(values) -> dict:
+        if not values:
+            return {"count": 0, "mean": None, "p50": None, "p90": None, "p99": None, "max": None}
+        ordered = sorted(values)
+
+        def percentile(p: float) -> float:
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return {
+            "count": len(ordered),
+            "mean": sum(ordered) / len(ordered),
+            "p50": percentile(0.5),
+            "p90": percentile(0.9),
+            "p99": percentile(0.99),
+            "max": ordered[-1],
+        }
+
+    def get_stats(self) -> dict:
+        """Handled, dropped and failed events with the handler run and queue wait times (seconds)."""
+        with self._lock:
+            run_times = list(self._run_times)
+            wait_times = list(self._wait_times)
+            stats = {
+                "handled": self.handled,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "pending": self._pending,
+                "active_lanes": len(self._lanes),
+            }
+        stats["latency"] = self._distribution(run_times)
+        stats["wait"] = self._distribution(wait_times)
+        return stats
@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from typing import Callable
+
+
+class _HeartbeatEntry:
+    __slots__ = (
+        "device",
+        "ping",
+        "interval",
+        "timeout",
+        "is_alive",
+        "on_dead",
+        "last_rx",
+        "rx_since",
+        "rx_after_ping",
+    )
+
+    def __init__(self, device, ping, interval, timeout, is_alive, on_dead, now):
+        self.device = device
+        self.ping = ping
+        self.interval = interval
+        self.timeout = timeout
+        self.is_alive = is_alive
+        self.on_dead = on_dead
+        self.last_rx = now
+        # Oldest ping not followed by any received data
+        self.rx_since: float | None = None
+        self.rx_after_ping: float | None = None
+
+
+class HeartbeatService:
+    """Shared ping and liveness scheduler for connected devices.
+
+    All registered devices share one timer: entries are kept in a heap ordered
+    by their next due time and a single ``call_at`` handle is armed for the
+    earliest one. Each device is pinged on its own interval, with jitter so
+    pings from many devices do not line up.
+
+    A device is considered dead when ``is_alive()`` returns False or, if a
+    ``timeout`` is set, when no bytes were received for that long (devices
+    report received data with ``mark_rx``).
+
+    ``rx_after_ping`` is the time from a ping to the next received bytes of
+    any kind. The readers send no distinct reply to ``ping``, so no RTT is
+    measured: on an idle connection this approximates it, on a reader
+    streaming tags it is only the gap to the next tag.
+
+    Usage:
+        heartbeat.register(device, ping=lambda: device.write("ping"), interval=10)
+        heartbeat.mark_rx(device)  # from the receive path
+        heartbeat.unregister(device)
+    """
+
+    def __init__(self, jitter: float = 0.1):
+        """
+        Args:
+            jitter: Fraction of the interval used to randomize each ping (0.1 = ±10%)
+        """
+        self.jitter = jitter
+        self._entries: dict[object, _HeartbeatEntry] = {}
+        self._heap: list[tuple[float, int, _HeartbeatEntry]] = []
+        self._seq = itertools.count()
+        self._handle: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def register(
+        self,
+        device,
+        ping: Callable,
+        interval: float = 10.0,
+        timeout: float | None = None,
+        is_alive: Callable[[], bool] | None = None,
+        on_dead: Callable[[], None] | None = None,
+    ):
+        """Start pinging a device.
+
+        Args:
+            device: Device object, used as the registration key
+            ping: Sends a ping; may return a coroutine
+            interval: Seconds between pings
+            timeout: Seconds without received bytes before the device is dead (None disables)
+            is_alive: Returns False when the connection is known to be closed
+            on_dead: Called once when the device is detected dead; it is unregistered first
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._entries and not self._loop.is_closed():
+                # The timer serves one loop; entries of a running loop are not stale
+                raise RuntimeError("Heartbeat service is in use by another running event loop")
+            # Entries of a closed loop can not be resumed
+            self._reset(loop)
+
+        now = loop.time()
+        entry = _HeartbeatEntry(device, ping, interval, timeout, is_alive, on_dead, now)
+        self._entries[device] = entry
+        # First ping at a random point of the interval spreads devices registered together
+        self._push(entry, now + random.uniform(0, interval))
+
+    def unregister(self, device):
+        """Stop pinging a device. Its heap entry is dropped lazily."""
+        self._entries.pop(device, None)
+        if not self._entries and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+            self._heap.clear()
+
+    def mark_rx(self, device):
+        """Record that bytes were received from a device."""
+        entry = self._entries.get(device)
+        if entry is None:
+            return
+        now = self._loop.time()
+        entry.last_rx = now
+        if entry.rx_since is not None:
+            entry.rx_after_ping = now - entry.rx_since
+            entry.rx_since = None
+
+    def get_stats(self) -> dict[str, dict]:
+        """Return time from ping to next data, interval and seconds since last data per device name."""
+        now = self._loop.time() if self._loop else 0.0
+        return {
+            getattr(entry.device, "name", str(entry.device)): {
+                "rx_after_ping": entry.rx_after_ping,
+                "interval": entry.interval,
+                "last_rx_age": now - entry.last_rx,
+            }
+            for entry in self._entries.values()
+        }
+
+    def _reset(self, loop: asyncio.AbstractEventLoop):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._entries.clear()
+        self._heap.clear()
+        self._tasks.clear()
+        self._loop = loop
+
+    def _push(self, entry: _HeartbeatEntry, due: float):
+        heapq.heappush(self._heap, (due, next(self._seq), entry))
+        if self._handle is None or due < self._handle.when():
+            if self._handle is not None:
+                self._handle.cancel()
+            self._handle = self._loop.call_at(due, self._run)
+
+    def _run(self):
+        self._handle = None
+        now = self._loop.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, entry = heapq.heappop(self._heap)
+            if self._entries.get(entry.device) is not entry:
+                continue
+            if self._check(entry, now):
+                spread = random.uniform(1 - self.jitter, 1 + self.jitter)
+                heapq.heappush(self._heap, (now + entry.interval * spread, next(self._seq), entry))
+
+        if self._heap:
+            self._handle = self._loop.call_at(self._heap[0][0], self._run)
+
+    def _check(self, entry: _HeartbeatEntry, now: float) -> bool:
+        """Ping a live device; report a dead one. Returns True if it stays scheduled."""
+        dead = entry.is_alive is not None and not entry.is_alive()
+        if not dead and entry.timeout is not None and now - entry.last_rx > entry.timeout:
+            dead = True
+
+        if dead:
+            name = getattr(entry.device, "name", entry.device)
+            logging.warning(f"{name} - 💔 Heartbeat lost ({now - entry.last_rx:.1f}s since last data)")
+            self._entries.pop(entry.device, None)
+            if entry.on_dead is not None:
+                try:
+                    entry.on_dead()
+                except Exception as e:
+                    logging.warning(f"{name} - Error in heartbeat on_dead: {e}")
+            return False
+
+        if entry.rx_since is None:
+            entry.rx_since = now
+        try:
+            result = entry.ping()
+            if asyncio.iscoroutine(result):
+                task = self._loop.create_task(result)
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except Exception as e:
+            logging.warning(f"{getattr(entry.device, 'name', entry.device)} - Heartbeat ping error: {e}")
+        return True
+
+
+# Process-wide scheduler shared by all devices
+heartbeat = HeartbeatService()
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from typing import Callable
+
+import serial.tools.list_ports
+
+
+class PortDiscoveryService:
+    """USB serial port discovery shared by all AUTO-mode serial devices.
+
+    ``comports()`` runs in a worker thread and its result is cached for
+    ``ttl`` seconds; concurrent requests share the enumeration in progress,
+    so a hub reset with many readers reconnecting costs one enumeration per
+    TTL instead of one per device.
+
+    Ports matching a VID/PID are assigned to one device at a time, so several
+    readers with the same VID/PID get distinct ports. Devices waiting for a
+    port are woken as soon as an enumeration finds a new one.
+
+    Args:
+        comports: Port enumeration function (serial.tools.list_ports.comports by default)
+        ttl: Seconds an enumeration result stays valid
+        poll_interval: Seconds between enumerations while devices are waiting
+    """
+
+    def __init__(self, comports: Callable | None = None, ttl: float = 2.0, poll_interval: float = 1.0):
+        self._comports = comports or serial.tools.list_ports.comports
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+
+        # (vid, pid) -> sorted port names
+        self._ports: dict[tuple[int, int], list[str]] = {}
+        self._scanned_at: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # port -> owner
+        self._assigned: dict[str, object] = {}
+        self._waiters: list[asyncio.Future] = []
+
+    async def get_ports(self, vid: int, pid: int) -> list[str]:
+        """Return the ports matching a VID/PID, enumerating only if the cache is stale."""
+        await self.refresh()
+        return list(self._ports.get((vid, pid), []))
+
+    async def acquire(self, vid: int, pid: int, owner, timeout: float | None = None) -> str | None:
+        """Assign a free port matching a VID/PID to ``owner``.
+
+        An owner keeps getting the same port while it is present.
+
+        Args:
+            vid: USB vendor ID
+            pid: USB product ID
+            owner: Object the port is assigned to
+            timeout: Seconds to wait for a matching port (None waits forever)
+
+        Returns:
+            str | None: Port name, or None if none became available in time
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            await self.refresh()
+            port = self._pick(vid, pid, owner)
+            if port is not None:
+                self._assigned[port] = owner
+                return port
+
+            wait = self.poll_interval
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                wait = min(wait, remaining)
+
+            # Woken early by any enumeration that changes the port list
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def release(self, owner):
+        """Release every port assigned to ``owner``."""
+        for port in [p for p, o in self._assigned.items() if o is owner]:
+            del self._assigned[port]
+
+    async def refresh(self, force: bool = False):
+        """Enumerate ports in a worker thread unless the cache is fresh."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._refresh_task = None
+            self._waiters.clear()
+
+        if not force and self._scanned_at is not None and time.monotonic() - self._scanned_at < self.ttl:
+            return
+        if self._refresh_task is None:
+            self._refresh_task = loop.create_task(self._enumerate())
+        await asyncio.shield(self._refresh_task)
+
+    async def _enumerate(self):
+        try:
+            found = await asyncio.to_thread(self._comports)
+        except Exception as e:
+            logging.warning(f"⚠️ Error listing serial ports: {e}")
+            found = []
+        finally:
+            self._refresh_task = None
+
+        ports: dict[tuple[int, int], list[str]] = {}
+        for p in found:
+            # p.vid and p.pid are integers (e.g. 0x0001 == 1 decimal)
+            if p.vid is None or p.pid is None:
+                continue
+            ports.setdefault((p.vid, p.pid), []).append(p.device)
+        for devices in ports.values():
+            devices.sort()
+
+        changed = ports != self._ports
+        self._ports = ports
+        self._scanned_at = time.monotonic()
+
+        # Forget assignments of ports that disappeared
+        present = {device for devices in ports.values() for device in devices}
+        for port in [p for p in self._assigned if p not in present]:
+            del self._assigned[port]
+
+        if changed:
+            for waiter in self._waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _pick(self, vid: int, pid: int, owner) -> str | None:
+        candidates = self._ports.get((vid, pid), [])
+        for port in candidates:
+            if self._assigned.get(port) is owner:
+                return port
+        for port in candidates:
+            if port not in self._assigned:
+                return port
+        return None
+
+
+# Process-wide discovery shared by all serial devices
+port_discovery = PortDiscoveryService()
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import random
+from contextlib import asynccontextmanager
+
+
+class ReconnectPolicy:
+    """Exponential backoff with full jitter.
+
+    The n-th consecutive failed attempt waits a random time between 0 and
+    ``min(cap, base * factor**n)``. Randomizing the whole interval spreads
+    devices that lost their connection together, so they do not retry in
+    lockstep after a network blip.
+
+    Args:
+        base: Upper bound of the first delay in seconds
+        cap: Maximum delay in seconds
+        factor: Growth of the upper bound per failed attempt
+    """
+
+    def __init__(self, base: float = 1.0, cap: float = 30.0, factor: float = 2.0):
+        self.base = base
+        self.cap = cap
+        self.factor = factor
+
+    @classmethod
+    def from_config(cls, config: dict | None, default: "ReconnectPolicy | None" = None) -> "ReconnectPolicy | None":
+        """Build a policy from a device JSON ``RECONNECT`` entry (BASE, CAP, FACTOR)."""
+        if not config:
+            return default
+        default = default or cls()
+        return cls(
+            base=config.get("BASE", default.base),
+            cap=config.get("CAP", default.cap),
+            factor=config.get("FACTOR", default.factor),
+        )
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay before retry number ``attempt`` (0 for the first retry)."""
+        # Bound the exponent so large attempt counts do not overflow
+        upper = min(self.cap, self.base * self.factor ** min(attempt, 64))
+        return random.uniform(0, upper)
+
+
+class Backoff:
+    """Per-device retry state for a ReconnectPolicy.
+
+    Usage:
+        backoff = Backoff(get_policy("X714"))
+        while running:
+            if await try_connect():
+                backoff.reset()
+                ...
+            await backoff.wait(name)
+    """
+
+    def __init__(self, policy: ReconnectPolicy):
+        self.policy = policy
+        self.attempt = 0
+
+    def reset(self):
+        """Start over from the first delay (call after a successful connection)."""
+        self.attempt = 0
+
+    def next_delay(self) -> float:
+        delay = self.policy.delay(self.attempt)
+        self.attempt += 1
+        return delay
+
+    async def wait(self, name: str = ""):
+        """Sleep for the next backoff delay."""
+        delay = self.next_delay()
+        logging.info(f"{name} - 🔁 Retrying in {delay:.1f}s (attempt {self.attempt})")
+        await asyncio.sleep(delay)
+
+
+class ConnectLimiter:
+    """Process-wide limit on concurrent connection attempts.
+
+    Only the attempt itself (resolve, connect, handshake) holds a slot; an
+    established connection does not. This caps the burst of simultaneous
+    connects that devices, DNS and the network see after an outage.
+
+    Args:
+        max_concurrent: Connection attempts allowed at the same time
+    """
+
+    def __init__(self, max_concurrent: int = 16):
+        self.max_concurrent = max_concurrent
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Limit the current semaphore was created with
+        self._limit = max_concurrent
+        self.in_flight = 0
+        self.waiting = 0
+
+    def set_limit(self, max_concurrent: int):
+        """Change the limit. It takes effect once no attempt is in progress."""
+        self.max_concurrent = max_concurrent
+
+    def _stale(self) -> bool:
+        return self.in_flight == 0 and self.waiting == 0 and self._limit != self.max_concurrent
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one connection-attempt slot."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._semaphore is None or self._stale():
+            # A semaphore of another (closed) loop can not be awaited
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._limit = self.max_concurrent
+            self.in_flight = self.waiting = 0
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+# Default policy per device type (the READER value of the device JSON)
+RECONNECT_POLICIES: dict[str, ReconnectPolicy] = {
+    "SERIAL": ReconnectPolicy(base=1.0, cap=10.0),
+    "TCP": ReconnectPolicy(base=1.0, cap=30.0),
+    "X714": ReconnectPolicy(base=1.0, cap=30.0),
+    "R700_IOT": ReconnectPolicy(base=2.0, cap=60.0),
+}
+
+
+def get_policy(device_type: str) -> ReconnectPolicy:
+    """Return the reconnection policy configured for a device type."""
+    return RECONNECT_POLICIES.get(device_type) or ReconnectPolicy()
+
+
+def set_policy(device_type: str, policy: ReconnectPolicy):
+    """Replace the default policy of a device type (affects devices created afterwards)."""
+    RECONNECT_POLICIES[device_type] = policy
+
+
+# Process-wide limit shared by all devices
+connect_limiter = ConnectLimiter()
@@ -0,0 +1,454 @@
+import asyncio
+import inspect
+import itertools
+import logging
+import multiprocessing
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from smartx_rfid.devices.device_manager import DeviceManager
+
+# DeviceManager methods a worker runs for the parent
+PROXIED_METHODS = {
+    "get_device_info",
+    "any_device_reading",
+    "start_inventory",
+    "stop_inventory",
+    "start_inventory_all",
+    "stop_inventory_all",
+    "write_epc",
+    "get_startup_report",
+    "reload_devices",
+}
+
+
+class _ShardWorker:
+    """Runs one DeviceManager in a worker process and talks to the parent over a pipe.
+
+    Messages to the parent:
+        ("ready", None), ("events", [(name, event_type, data), ...]),
+        ("result", call_id, value), ("error", call_id, message)
+    Messages from the parent:
+        ("call", call_id, method, args, kwargs), ("stop",)
+    """
+
+    # Calls answered by the worker itself rather than its DeviceManager
+    WORKER_METHODS = {"set_devices"}
+
+    def __init__(self, conn, devices_path: str, names: List[str], batch_size: int, flush_interval: float, options):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.manager = DeviceManager(devices_path, event_func=self.on_event, names=set(names), **options)
+        self._batch: list = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped: asyncio.Event | None = None
+        # Calls from the parent still running
+        self._calls: set[asyncio.Task] = set()
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        threading.Thread(target=self._receive, daemon=True).start()
+
+        await self.manager.connect_devices()
+        self.conn.send(("ready", None))
+        await self._stopped.wait()
+
+        # Calls still running are answered with an error before the devices go away
+        for task in self._calls:
+            task.cancel()
+        await asyncio.gather(*self._calls, return_exceptions=True)
+
+        await self.manager.cancel_connect_tasks()
+        await self.manager.disconnect_devices()
+        self.flush()
+        self.conn.close()
+
+    def on_event(self, name: str, event_type: str, data):
+        if isinstance(data, memoryview):
+            # Frames may be views of a receive buffer
+            data = bytes(data)
+        self._batch.append((name, event_type, data))
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.flush_interval, self.flush)
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        try:
+            self.conn.send(("events", batch))
+        except Exception as e:
+            logging.error(f"❌ Could not send {len(batch)} event(s) to the parent: {e}")
+
+    def _receive(self):
+        # Blocking reads stay off the event loop
+        while True:
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                message = ("stop",)
+            self._loop.call_soon_threadsafe(self._handle, message)
+            if message[0] == "stop":
+                return
+
+    def _handle(self, message):
+        if message[0] == "stop":
+            self._stopped.set()
+        elif message[0] == "call":
+            task = self._loop.create_task(self._call(*message[1:]))
+            self._calls.add(task)
+            task.add_done_callback(self._calls.discard)
+
+    def set_devices(self, names: List[str]):
+        """Replace the device files this worker runs (applied by the next reload_devices)."""
+        self.manager._names = set(names)
+
+    async def _call(self, call_id: int, method: str, args: tuple, kwargs: dict):
+        try:
+            if method in self.WORKER_METHODS:
+                target = self
+            elif method in PROXIED_METHODS:
+                target = self.manager
+            else:
+                raise AttributeError(f"'{method}' can not be called on a shard")
+            result = getattr(target, method)(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            reply = ("result", call_id, result)
+        except asyncio.CancelledError:
+            reply = ("error", call_id, "CancelledError: the shard is stopping")
+        except Exception as e:
+            reply = ("error", call_id, f"{type(e).__name__}: {e}")
+        # Events emitted while handling the command arrive before its result
+        self.flush()
+        self.conn.send(reply)
+
+
+def _worker_main(conn, devices_path, names, batch_size, flush_interval, options):
+    asyncio.run(_ShardWorker(conn, devices_path, names, batch_size, flush_interval, options).run())
+
+
+class _Shard:
+    def __init__(self, index: int, names: List[str]):
+        self.index = index
+        self.names = names
+        self.process: multiprocessing.Process | None = None
+        self.conn = None
+        self.ready: asyncio.Future | None = None
+        self.events = 0
+        self.batches = 0
+
+
+class ShardedDeviceManager:
+    """Runs the devices of a DeviceManager in several worker processes.
+
+    Each worker process has its own event loop and DeviceManager with a subset
+    of the device files, so one busy reader or slow parsing only delays the
+    devices of its own shard. Devices are spread evenly by name; a
+    ``SHARD`` entry in the device JSON pins a device to a worker.
+    ``reload_devices`` (or ``start_watching``) gives device files added later
+    to the emptiest worker; devices already running keep their worker.
+
+    Worker events are batched (up to ``batch_size`` events or ``flush_interval``
+    seconds) and sent over a pipe; the parent calls ``event_func(name,
+    event_type, data)`` for each of them on its own loop, as DeviceManager
+    does. Commands are sent to the worker that owns the device and are
+    awaited, so they are all coroutines here. Event data must be picklable.
+
+    Usage:
+        manager = ShardedDeviceManager("devices", event_func=on_event, workers=4)
+        await manager.connect_devices()
+        await manager.start_inventory("R700_1")
+        await manager.close()
+
+    Args:
+        devices_path: Directory of the device JSON files
+        event_func: Called with (name, event_type, data) for every device event
+        workers: Number of worker processes
+        batch_size: Events sent to the parent in one message at most
+        flush_interval: Seconds an event may wait for a batch to fill
+        **options: Passed to the DeviceManager of every worker (e.g. startup_concurrency)
+    """
+
+    def __init__(
+        self,
+        devices_path: str,
+        event_func: Callable | None = None,
+        workers: int = 2,
+        batch_size: int = 256,
+        flush_interval: float = 0.02,
+        **options,
+    ):
+        self._devices_path = devices_path
+        self._event_func = event_func
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._options = options
+        self._shards: List[_Shard] = []
+        self._shard_by_name: Dict[str, _Shard] = {}
+        # call id -> (future of the result, shard running the call)
+        self._pending: Dict[int, Tuple[asyncio.Future, _Shard]] = {}
+        self._call_ids = itertools.count()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._watch_task: asyncio.Task | None = None
+
+    def __len__(self):
+        return len(self._shard_by_name)
+
+    def assign_shards(self) -> List[List[str]]:
+        """Return the device names of each worker."""
+        configs, _ = DeviceManager(self._devices_path)._read_configs()
+        shards = [[] for _ in range(self.workers)]
+        self._place(configs, shards)
+        return shards
+
+    def _place(self, configs: Dict[str, dict], shards: List[List[str]]) -> Dict[str, int]:
+        """Add the devices of ``configs`` to ``shards`` and return the worker index of each."""
+        placed = {}
+        unpinned = []
+        for name in sorted(configs):
+            shard = configs[name].get("SHARD")
+            if isinstance(shard, int) and 0 <= shard < self.workers:
+                shards[shard].append(name)
+                placed[name] = shard
+            else:
+                unpinned.append(name)
+        for name in unpinned:
+            # Fill the emptiest shard first so pinned devices count too
+            index = min(range(len(shards)), key=lambda i: len(shards[i]))
+            shards[index].append(name)
+            placed[name] = index
+        return placed
+
+    async def connect_devices(self):
+        """Start the workers and wait until each one has started its devices."""
+        if self._shards:
+            logging.info("Shards already running; skipping new connect.")
+            return
+
+        self._loop = asyncio.get_running_loop()
+        # A forked child would inherit the parent's running loop and threads
+        context = multiprocessing.get_context("spawn")
+        for index, names in enumerate(self.assign_shards()):
+            shard = _Shard(index, names)
+            shard.conn, child_conn = context.Pipe()
+            shard.process = context.Process(
+                target=_worker_main,
+                args=(child_conn, self._devices_path, names, self.batch_size, self.flush_interval, self._options),
+                name=f"smartx-shard-{index}",
+                daemon=True,
+            )
+            shard.ready = self._loop.create_future()
+            shard.process.start()
+            child_conn.close()
+            threading.Thread(target=self._receive, args=(shard,), daemon=True).start()
+
+            self._shards.append(shard)
+            for name in names:
+                self._shard_by_name[name] = shard
+            logging.info(f"🧩 Shard {index} started with {len(names)} device(s)")
+
+        await asyncio.gather(*(shard.ready for shard in self._shards))
+
+    async def reload_devices(self) -> Dict[str, List[str]]:
+        """Apply changes of the device files on every worker (see DeviceManager.reload_devices).
+
+        New device files are given to a worker first; removed devices free
+        their place.
+        """
+        configs, _ = DeviceManager(self._devices_path)._read_configs()
+        new = {name: data for name, data in configs.items() if name not in self._shard_by_name}
+        placed = self._place(new, [shard.names for shard in self._shards])
+        for name, index in placed.items():
+            self._shard_by_name[name] = self._shards[index]
+        await asyncio.gather(*(self._call(shard, "set_devices", shard.names) for shard in self._shards))
+
+        report = {"added": [], "removed": [], "restarted": [], "updated": []}
+        for result in await self._call_all("reload_devices"):
+            for key, names in result.items():
+                report[key] += names
+        for name in report["removed"]:
+            shard = self._shard_by_name.pop(name, None)
+            if shard is not None and name in shard.names:
+                shard.names.remove(name)
+        return report
+
+    async def watch_devices(self, interval: float = 2.0):
+        """Reload the devices whenever a device file changes. Runs until cancelled."""
+        files = DeviceManager(self._devices_path)
+        snapshot = files._snapshot_files()
+        while True:
+            await asyncio.sleep(interval)
+            current = files._snapshot_files()
+            if current == snapshot:
+                continue
+            snapshot = current
+            try:
+                await self.reload_devices()
+            except Exception as e:
+                logging.error(f"❌ Error reloading devices: {e}")
+
+    def start_watching(self, interval: float = 2.0):
+        """Start watching the device files for changes in the background."""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self.watch_devices(interval))
+
+    async def stop_watching(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+
+    async def close(self, timeout: float = 10.0):
+        """Disconnect every device and stop the workers."""
+        await self.stop_watching()
+        shards, self._shards = self._shards, []
+        self._shard_by_name = {}
+        for shard in shards:
+            try:
+                shard.conn.send(("stop",))
+            except OSError:
+                pass
+        for shard in shards:
+            await asyncio.to_thread(shard.process.join, timeout)
+            if shard.process.is_alive():
+                logging.warning(f"⚠️ Shard {shard.index} did not stop, terminating it")
+                shard.process.terminate()
+                await asyncio.to_thread(shard.process.join, timeout)
+            shard.conn.close()
+
+    def _receive(self, shard: _Shard):
+        # One thread per worker keeps its pipe drained without blocking the loop
+        while True:
+            try:
+                message = shard.conn.recv()
+            except (EOFError, OSError):
+                self._loop.call_soon_threadsafe(self._shard_lost, shard)
+                return
+            self._loop.call_soon_threadsafe(self._handle, shard, message)
+
+    def _handle(self, shard: _Shard, message):
+        kind = message[0]
+        if kind == "events":
+            shard.batches += 1
+            shard.events += len(message[1])
+            self._dispatch(message[1])
+        elif kind == "ready":
+            if not shard.ready.done():
+                shard.ready.set_result(None)
+        elif kind in ("result", "error"):
+            future, _ = self._pending.pop(message[1], (None, None))
+            if future is None or future.done():
+                return
+            if kind == "result":
+                future.set_result(message[2])
+            else:
+                future.set_exception(RuntimeError(message[2]))
+
+    def _dispatch(self, batch: list):
+        if self._event_func is None:
+            return
+        for name, event_type, data in batch:
+            try:
+                self._event_func(name, event_type, data)
+            except Exception as e:
+                logging.error(f"❌ Error in event handler for '{name}': {e}")
+
+    def _shard_lost(self, shard: _Shard):
+        if shard in self._shards:
+            logging.error(f"❌ Shard {shard.index} stopped unexpectedly")
+        if not shard.ready.done():
+            shard.ready.set_exception(RuntimeError(f"Shard {shard.index} stopped before it was ready"))
+        for future, owner in list(self._pending.values()):
+            if owner is shard and not future.done():
+                future.set_exception(RuntimeError(f"Shard {shard.index} stopped"))
+
+    async def _call(self, shard: _Shard, method: str, *args, **kwargs):
+        call_id = next(self._call_ids)
+        future = self._loop.create_future()
+        self._pending[call_id] = (future, shard)
+        try:
+            shard.conn.send(("call", call_id, method, args, kwargs))
+            return await future
+        finally:
+            self._pending.pop(call_id, None)
+
+    async def _call_all(self, method: str, *args, **kwargs) -> list:
+        return await asyncio.gather(*(self._call(shard, method, *args, **kwargs) for shard in self._shards))
+
+    def get_shard(self, name: str) -> Optional[int]:
+        """Return the worker index that runs a device."""
+        shard = self._shard_by_name.get(name)
+        return shard.index if shard else None
+
+    async def get_device_info(self, name: Optional[str] = None) -> List[Dict]:
+        """Return device connection and reading status (see DeviceManager.get_device_info)."""
+        if name is not None:
+            shard = self._shard_by_name.get(name)
+            return await self._call(shard, "get_device_info", name) if shard else []
+        return [info for infos in await self._call_all("get_device_info") for info in infos]
+
+    async def any_device_reading(self) -> bool:
+        return any(await self._call_all("any_device_reading"))
+
+    async def start_inventory(self, name: str) -> bool:
+        shard = self._shard_by_name.get(name)
+        if shard is None:
+            logging.warning(f"⚠️ Device '{name}' not found.")
+            return False
+        return await self._call(shard, "start_inventory", name)
+
+    async def stop_inventory(self, name: str) -> bool:
+        shard = self._shard_by_name.get(name)
+        if shard is None:
+            logging.warning(f"⚠️ Device '{name}' not found.")
+            return False
+        return await self._call(shard, "stop_inventory", name)
+
+    async def start_inventory_all(self, **kwargs) -> Dict:
+        """Start inventory on every shard at the same time (see DeviceManager.start_inventory_all)."""
+        results = {}
+        for result in await self._call_all("start_inventory_all", **kwargs):
+            results.update(result)
+        return results
+
+    async def stop_inventory_all(self, **kwargs) -> Dict:
+        """Stop inventory on every shard at the same time (see DeviceManager.stop_inventory_all)."""
+        results = {}
+        for result in await self._call_all("stop_inventory_all", **kwargs):
+            results.update(result)
+        return results
+
+    async def write_epc(self, device_name: str, write_tag):
+        shard = self._shard_by_name.get(device_name)
+        if shard is None:
+            return False, f"Device '{device_name}' not found."
+        return await self._call(shard, "write_epc", device_name, write_tag)
+
+    async def get_startup_report(self) -> Dict[str, Optional[float]]:
+        report = {}
+        for result in await self._call_all("get_startup_report"):
+            report.update(result)
+        return report
+
+    def get_ipc_stats(self) -> List[Dict]:
+        """Events and batches received from each worker."""
+        return [
+            {
+                "shard": shard.index,
+                "devices": len(shard.names),
+                "alive": shard.process.is_alive(),
+                "events": shard.events,
+                "batches": shard.batches,
+            }
+            for shard in self._shards
+        ]
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from typing import Callable
+
+
+class StartupScheduler:
+    """Paced start of many device connections.
+
+    Devices are started in priority order, at most one every ``interval``
+    seconds, and no more than ``max_concurrent`` may be starting at the same
+    time. A device stops counting as starting once it is connected, its
+    connect task ends or ``timeout`` expires (it keeps retrying in the
+    background). This spreads the TLS handshakes and setup requests of a
+    large fleet instead of sending them all in the first second after boot.
+
+    The time each device took to reach ``is_connected`` is kept in ``report``
+    (None if it did not connect within ``timeout``).
+
+    Args:
+        max_concurrent: Devices allowed to be starting at the same time
+        interval: Minimum seconds between two device starts
+        timeout: Seconds a device may hold a startup slot
+        poll: Seconds between checks of ``is_connected``
+    """
+
+    def __init__(self, max_concurrent: int = 16, interval: float = 0.05, timeout: float = 30.0, poll: float = 0.05):
+        self.max_concurrent = max_concurrent
+        self.interval = interval
+        self.timeout = timeout
+        self.poll = poll
+        self.report: dict[str, float | None] = {}
+        self.started = 0
+
+    async def run(self, devices: list, start: Callable, priority: Callable | None = None):
+        """Start ``devices`` and wait until every one is connected or timed out.
+
+        Args:
+            devices: Devices to start
+            start: Called with a device to start it; returns its connect task,
+                or None if the device should be skipped
+            priority: Returns the priority of a device (higher starts first)
+        """
+        if priority is not None:
+            # sorted() is stable, so devices of equal priority keep their order
+            devices = sorted(devices, key=priority, reverse=True)
+
+        self.report = {}
+        self.started = 0
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        watchers = []
+        began = time.monotonic()
+        next_start = began
+        try:
+            for device in devices:
+                await semaphore.acquire()
+                delay = next_start - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_start = time.monotonic() + self.interval
+
+                task = start(device)
+                if task is None:
+                    semaphore.release()
+                    continue
+                self.started += 1
+                watchers.append(asyncio.create_task(self._watch(device, task, semaphore)))
+            await asyncio.gather(*watchers)
+        finally:
+            for watcher in watchers:
+                watcher.cancel()
+
+        connected = sum(1 for elapsed in self.report.values() if elapsed is not None)
+        logging.info(
+            f"⏱️ Startup finished in {time.monotonic() - began:.1f}s: {connected}/{len(self.report)} device(s) connected"
+        )
+
+    async def _watch(self, device, task: asyncio.Task, semaphore: asyncio.Semaphore):
+        began = time.monotonic()
+        elapsed = None
+        try:
+            deadline = began + self.timeout
+            while not task.done() and time.monotonic() < deadline:
+                if device.is_connected:
+                    elapsed = time.monotonic() - began
+                    logging.info(f"⏱️ '{device.name}' connected in {elapsed:.2f}s")
+                    break
+                await asyncio.sleep(self.poll)
+            else:
+                logging.warning(f"⏱️ '{device.name}' not connected after {time.monotonic() - began:.1f}s")
+            self.report[device.name] = elapsed
+        finally:
+            semaphore.release()
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+
+from smartx_rfid.devices.RFID.X714.tcp_protocol import TCPLineProtocol
+
+
+class _PeerProtocol(TCPLineProtocol):
+    """Accepted reader connection; bound to a device once the peer is identified."""
+
+    def __init__(self, listener: "TCPListenerService", key: tuple[str, int]):
+        super().__init__(None, buffer_size=listener.buffer_size)
+        self.listener = listener
+        self.key = key
+        self.peer: str | None = None
+        self._hello_handle: asyncio.TimerHandle | None = None
+
+    def connection_made(self, transport):
+        super().connection_made(transport)
+        peername = transport.get_extra_info("peername")
+        self.peer = peername[0] if peername else None
+
+        device = self.listener._match_ip(self.key, self.peer)
+        if device is not None:
+            self.listener._attach(device, self)
+        elif self.listener._expects_hello(self.key):
+            # Wait for the hello line naming the reader
+            self._hello_handle = self._loop.call_later(self.listener.hello_timeout, self._on_hello_timeout)
+        else:
+            logging.warning(f"🚫 [LISTENER] Unknown peer {self.peer} on port {self.key[1]}")
+            transport.close()
+
+    def buffer_updated(self, nbytes):
+        super().buffer_updated(nbytes)
+        # A full read means more is waiting: grow the buffer of busy peers only
+        if nbytes == len(self._buffer) and nbytes < self.listener.max_buffer_size:
+            self._buffer = bytearray(min(nbytes * 2, self.listener.max_buffer_size))
+            self._view = memoryview(self._buffer)
+
+    def on_line(self, line: bytes):
+        if self.device is not None:
+            self.device.on_receive(line)
+            return
+
+        if self._hello_handle is not None:
+            self._hello_handle.cancel()
+            self._hello_handle = None
+        hello = line.decode(errors="ignore").strip()
+        device = self.listener._match_hello(self.key, hello)
+        if device is None:
+            logging.warning(f"🚫 [LISTENER] Unknown hello '{hello}' from {self.peer}")
+            self.close()
+            return
+        self.listener._attach(device, self)
+
+    def _on_hello_timeout(self):
+        self._hello_handle = None
+        logging.warning(f"⏱️ [LISTENER] No hello from {self.peer}")
+        self.close()
+
+    def connection_lost(self, exc):
+        if self._hello_handle is not None:
+            self._hello_handle.cancel()
+            self._hello_handle = None
+        super().connection_lost(exc)
+        if self.device is not None:
+            self.device.detach_tcp_peer(self)
+
+
+class TCPListenerService:
+    """Accept reader connections instead of dialing out to each reader.
+
+    Readers behind NAT connect to one port of this host. Each accepted socket
+    is identified by its peer IP or, for devices registered with a ``hello``,
+    by the first line it sends, and is then attached to the matching device:
+    from there on it is the device's ``writer`` and every line goes through
+    the device's normal ``on_receive`` path.
+
+    Accepted sockets use the same buffered protocol as outbound connections
+    and need no task of their own, so one loop holds thousands of them. Their
+    receive buffer starts at ``buffer_size`` and doubles, up to
+    ``max_buffer_size``, only when a read fills it.
+    Servers are started when the first device registers on a port and closed
+    when the last one leaves.
+
+    Args:
+        hello_timeout: Seconds an unidentified peer may take to send its hello line
+        backlog: Listen backlog of each server
+        buffer_size: Initial receive buffer of each accepted socket
+        max_buffer_size: Size the receive buffer of a busy socket may grow to
+    """
+
+    def __init__(
+        self, hello_timeout: float = 5.0, backlog: int = 1024, buffer_size: int = 4096, max_buffer_size: int = 65536
+    ):
+        self.hello_timeout = hello_timeout
+        self.backlog = backlog
+        self.buffer_size = buffer_size
+        self.max_buffer_size = max_buffer_size
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        # (host, port) -> server
+        self._servers: dict[tuple[str, int], asyncio.AbstractServer] = {}
+        # (host, port) -> {peer ip -> device} / {hello -> device}
+        self._by_ip: dict[tuple[str, int], dict[str, object]] = {}
+        self._by_hello: dict[tuple[str, int], dict[str, object]] = {}
+        # device -> (host, port)
+        self._devices: dict[object, tuple[str, int]] = {}
+
+    async def register(self, device, port: int, host: str = "0.0.0.0", ip: str | None = None, hello: str | None = None):
+        """Accept connections for a device on ``host:port``.
+
+        Args:
+            device: Device with ``attach_tcp_peer`` and ``detach_tcp_peer``
+            port: Listening port (shared by every device registered on it)
+            host: Listening address
+            ip: Peer IP identifying the device (used when ``hello`` is None)
+            hello: First line the reader sends to identify itself
+        """
+        if hello is None and ip is None:
+            raise ValueError(f"{device.name}: listener mode needs an IP or a hello line")
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Servers of another (closed) loop can not be reused
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._servers.clear()
+            self._by_ip.clear()
+            self._by_hello.clear()
+            self._devices.clear()
+
+        key = (host, port)
+        self.unregister(device)
+
+        # Bind before registering so a failed bind leaves no stale registration
+        async with self._lock:
+            if key not in self._servers:
+                self._servers[key] = await loop.create_server(
+                    lambda: _PeerProtocol(self, key), host, port, backlog=self.backlog, reuse_address=True
+                )
+                logging.info(f"👂 [LISTENER] Listening on {host}:{port}")
+
+        if hello is not None:
+            self._by_hello.setdefault(key, {})[hello] = device
+        else:
+            self._by_ip.setdefault(key, {})[ip] = device
+        self._devices[device] = key
+
+    def unregister(self, device):
+        """Stop accepting connections for a device; close the server if it was the last one."""
+        key = self._devices.pop(device, None)
+        if key is None:
+            return
+        for table in (self._by_ip.get(key, {}), self._by_hello.get(key, {})):
+            for name in [n for n, d in table.items() if d is device]:
+                del table[name]
+
+        if key not in self._devices.values():
+            self._by_ip.pop(key, None)
+            self._by_hello.pop(key, None)
+            server = self._servers.pop(key, None)
+            if server is not None:
+                server.close()
+                logging.info(f"👂 [LISTENER] Stopped listening on {key[0]}:{key[1]}")
+
+    def get_peers(self) -> dict[str, str | None]:
+        """Return the peer IP of each registered device (None while not connected)."""
+        peers = {}
+        for device in self._devices:
+            writer = getattr(device, "writer", None)
+            peers[device.name] = writer.peer if isinstance(writer, _PeerProtocol) else None
+        return peers
+
+    def _match_ip(self, key: tuple[str, int], peer: str | None):
+        return self._by_ip.get(key, {}).get(peer)
+
+    def _match_hello(self, key: tuple[str, int], hello: str):
+        return self._by_hello.get(key, {}).get(hello)
+
+    def _expects_hello(self, key: tuple[str, int]) -> bool:
+        return bool(self._by_hello.get(key))
+
+    def _attach(self, device, protocol: _PeerProtocol):
+        protocol.device = device
+        logging.info(f"✅ [LISTENER] {device.name} connected from {protocol.peer}")
+        device.attach_tcp_peer(protocol)
+
+
+# Process-wide listener shared by all devices in TCP server mode
+tcp_listener = TCPListenerService()
@@ -1,3 +1,4 @@
 from .regex import regex_hex
 from .tag_list import TagList
 from .logger_manager import LoggerManager
+from .crc import crc16, verify_crc, crc16_many
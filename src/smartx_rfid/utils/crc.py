@@ -0,0 +1,76 @@
+from functools import lru_cache
+from typing import Iterable
+
+
+@lru_cache(maxsize=8)
+def _crc16_table(poly: int) -> tuple[int, ...]:
+    """Build the 256-entry lookup table for a reflected CRC-16 polynomial."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ poly
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+def crc16(data: bytes, poly: int = 0x8408, init: int = 0xFFFF) -> int:
+    """
+    Calculate a reflected CRC-16 with a lookup table (one step per byte).
+
+    With the defaults this is CRC-16/MCRF4XX (poly 0x8408, init 0xFFFF, no final XOR),
+    the checksum used by the generic SERIAL device.
+
+    Args:
+        data: Input bytes
+        poly: Reflected CRC polynomial
+        init: Initial CRC value
+
+    Returns:
+        int: 16-bit checksum value
+    """
+    table = _crc16_table(poly)
+    crc = init
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc & 0xFFFF
+
+
+def verify_crc(frame: bytes, poly: int = 0x8408) -> bool:
+    """
+    Check a frame whose last two bytes are its CRC-16, low byte first.
+
+    Args:
+        frame: Received frame including the CRC
+        poly: Reflected CRC polynomial
+
+    Returns:
+        bool: True if the CRC matches
+    """
+    if len(frame) < 2:
+        return False
+    return crc16(frame[:-2], poly) == frame[-2] | (frame[-1] << 8)
+
+
+def crc16_many(frames: Iterable[bytes], poly: int = 0x8408) -> list[int]:
+    """
+    Calculate the CRC-16 of several frames, reusing one lookup table.
+
+    Args:
+        frames: Input frames
+        poly: Reflected CRC polynomial
+
+    Returns:
+        list[int]: Checksum of each frame, in order
+    """
+    table = _crc16_table(poly)
+    results = []
+    for data in frames:
+        crc = 0xFFFF
+        for byte in data:
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+        results.append(crc)
+    return results
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 
@@ -70,6 +72,138 @@ class TestR700_IOT:
             result = await r700_device.start_inventory()
             assert result is True
 
+    @pytest.mark.asyncio
+    async def test_send_write_command_reuses_session(self):
+        """Test that writes go through the persistent session when it is open"""
+        with patch("smartx_rfid.devices.RFID.R700_IOT._main.on_event", Mock()):
+            r700_device = R700_IOT(reading_config=R700_IOT_config_example)
+            r700_device._session = Mock(is_closed=False)
+            r700_device.post_to_reader = AsyncMock(return_value=True)
+
+            result = await r700_device.send_write_command({"accessCommands": []})
+
+            assert result is True
+            session, endpoint = r700_device.post_to_reader.call_args[0]
+            assert session is r700_device._session
+            assert endpoint == r700_device.endpoint_write
+
+    @pytest.mark.asyncio
+    async def test_write_epc_many_single_request(self):
+        """Test that write_epc_many packs valid tags in one request and reports per-tag results"""
+        with patch("smartx_rfid.devices.RFID.R700_IOT._main.on_event", Mock()):
+            r700_device = R700_IOT(reading_config=R700_IOT_config_example)
+            r700_device.post_to_reader = AsyncMock(return_value=True)
+
+            tags = [
+                {
+                    "target_identifier": "epc",
+                    "target_value": "0" * 23 + "1",
+                    "new_epc": "0" * 23 + "2",
+                    "password": "00000000",
+                },
+                {"target_identifier": None, "target_value": None, "new_epc": "invalid", "password": "00000000"},
+                {
+                    "target_identifier": "tid",
+                    "target_value": "e" * 24,
+                    "new_epc": "0" * 23 + "3",
+                    "password": "00000000",
+                },
+            ]
+            results = await r700_device.write_epc_many(tags)
+
+            r700_device.post_to_reader.assert_called_once()
+            payload = r700_device.post_to_reader.call_args.kwargs["payload"]
+            assert len(payload["accessConfigurations"]) == 2
+            identifiers = [
+                cmd["identifier"] for config in payload["accessConfigurations"] for cmd in config["accessCommands"]
+            ]
+            assert len(identifiers) == len(set(identifiers))
+
+            assert [r["success"] for r in results] == [True, False, True]
+            assert results[1]["error"] is not None
+
+    @pytest.mark.asyncio
+    async def test_write_epc_waits_for_tag_access_event(self):
+        """Test that concurrent writes are resolved by their own tagAccessEvent results"""
+        with patch("smartx_rfid.devices.RFID.R700_IOT._main.on_event", Mock()):
+            r700_device = R700_IOT(reading_config=R700_IOT_config_example)
+            r700_device.post_to_reader = AsyncMock(return_value=True)
+
+            first = asyncio.create_task(r700_device.write_epc(None, None, "0" * 23 + "1", "00000000", wait=True))
+            second = asyncio.create_task(r700_device.write_epc(None, None, "0" * 23 + "2", "00000000", wait=True))
+            await asyncio.sleep(0)
+            assert len(r700_device._pending_writes) == 2
+            first_id, second_id = list(r700_device._pending_writes)
+
+            r700_device.on_tag_access({"accessCommandResults": [{"identifier": f"{second_id}-1", "result": "failure"}]})
+            r700_device.on_tag_access(
+                {"accessCommandResults": [{"identifier": f"{first_id}-{n}", "result": "success"} for n in (1, 2, 3)]}
+            )
+
+            assert await first is True
+            assert await second is False
+            assert r700_device._pending_writes == {}
+
+    @pytest.mark.asyncio
+    async def test_unrecognized_tag_access_does_not_fail_write(self):
+        """Test that unknown tagAccessEvent payloads are passed on and leave the write pending"""
+        on_event = Mock()
+        with patch("smartx_rfid.devices.RFID.R700_IOT._main.on_event", on_event):
+            r700_device = R700_IOT(reading_config=R700_IOT_config_example)
+            r700_device.on_event = on_event
+            r700_device.post_to_reader = AsyncMock(return_value=True)
+
+            write = asyncio.create_task(r700_device.write_epc(None, None, "0" * 23 + "1", "00000000", wait=True))
+            await asyncio.sleep(0)
+            (write_id,) = list(r700_device._pending_writes)
+
+            unknown_status = {"accessCommandResults": [{"identifier": f"{write_id}-1", "result": "pending"}]}
+            unknown_payload = {"someOtherField": 1}
+            r700_device.on_tag_access(unknown_status)
+            r700_device.on_tag_access(unknown_payload)
+
+            assert not write.done()
+            on_event.assert_any_call(r700_device.name, "tag_access", unknown_status)
+            on_event.assert_any_call(r700_device.name, "tag_access", unknown_payload)
+
+            r700_device.on_tag_access(
+                {"accessCommandResults": [{"identifier": f"{write_id}-{n}", "result": "success"} for n in (1, 2, 3)]}
+            )
+            assert await write is True
+
+    @pytest.mark.asyncio
+    async def test_epc_fallback_ignores_failed_status(self):
+        """Test that a failed access on a tag already carrying the target EPC is not a success"""
+        on_event = Mock()
+        with patch("smartx_rfid.devices.RFID.R700_IOT._main.on_event", on_event):
+            r700_device = R700_IOT(reading_config=R700_IOT_config_example)
+            r700_device.on_event = on_event
+            r700_device.post_to_reader = AsyncMock(return_value=True)
+
+            new_epc = "0" * 23 + "1"
+            write = asyncio.create_task(r700_device.write_epc(None, None, new_epc, "00000000", wait=True))
+            await asyncio.sleep(0)
+
+            failed = {"epcHex": new_epc.upper(), "result": "tag-not-found"}
+            r700_device.on_tag_access(failed)
+            assert not write.done()
+            on_event.assert_any_call(r700_device.name, "tag_access", failed)
+
+            r700_device.on_tag_access({"epcHex": new_epc.upper(), "result": "success"})
+            assert await write is True
+
+    @pytest.mark.asyncio
+    async def test_write_epc_wait_timeout(self):
+        """Test that a write without result event fails after the timeout"""
+        with patch("smartx_rfid.devices.RFID.R700_IOT._main.on_event", Mock()):
+            r700_device = R700_IOT(reading_config=R700_IOT_config_example)
+            r700_device.post_to_reader = AsyncMock(return_value=True)
+
+            result = await r700_device.write_epc(None, None, "0" * 24, "00000000", wait=True, timeout=0.01)
+
+            assert result is False
+            assert r700_device._pending_writes == {}
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 
@@ -160,7 +163,8 @@ class TestX714:
             assert call_args["ant"] == 1
             assert call_args["rssi"] == 75
 
-    def test_on_receive_read_start_stop(self):
+    @pytest.mark.asyncio
+    async def test_on_receive_read_start_stop(self):
         """Test on_receive method with read start/stop commands"""
         with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
             x714_device = X714()
@@ -213,6 +217,166 @@ class TestX714:
             result = await x714_device.start_inventory()
             assert result is True
 
+    @pytest.mark.asyncio
+    async def test_configure_waits_for_set_cmd_reply(self):
+        """Test that configure resolves when the reader echoes #set_cmd"""
+        with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
+            x714_device = X714()
+            sent = []
+            x714_device.write = lambda to_send, verbose=True: sent.append(to_send)
+
+            task = asyncio.create_task(x714_device.configure())
+            await asyncio.sleep(0)
+            assert sent[0].startswith("#set_cmd:")
+
+            x714_device.on_receive("#SET_CMD:OK\r\n")
+            assert await task is True
+            assert "#hotspot:on" in sent
+
+    @pytest.mark.asyncio
+    async def test_configure_timeout(self):
+        """Test that configure reports failure when no reply arrives"""
+        with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
+            x714_device = X714(command_timeout=0.01)
+            x714_device.write = Mock()
+
+            assert await x714_device.configure() is False
+            assert x714_device._pending_commands == {}
+
+    @pytest.mark.asyncio
+    async def test_start_stop_clear_wait_for_replies(self):
+        """Test that start, stop and clear resolve on the reader's confirmation"""
+        with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
+            x714_device = X714()
+            x714_device.is_connected = True
+            sent = []
+            x714_device.write = lambda to_send, verbose=True: sent.append(to_send)
+
+            start = asyncio.create_task(x714_device.start_inventory())
+            await asyncio.sleep(0)
+            assert sent == ["#READ:ON"] and not start.done()
+            x714_device.on_receive("#READ:ON\r\n")
+            assert await start is True
+            assert x714_device.is_reading is True
+
+            # on_start clears the tags, confirmed by #tags_cleared
+            await asyncio.sleep(0)
+            assert sent[-1] == "#CLEAR"
+            x714_device.on_receive("#TAGS_CLEARED\r\n")
+            await asyncio.sleep(0.01)
+            assert x714_device._pending_commands == {}
+
+            stop = asyncio.create_task(x714_device.stop_inventory())
+            await asyncio.sleep(0)
+            x714_device.on_receive("#READ:OFF\r\n")
+            assert await stop is True
+            assert x714_device.is_reading is False
+
+    @pytest.mark.asyncio
+    async def test_connect_setup_waits_for_each_reply(self):
+        """Test that the connect-time setup sends start only after #set_cmd is confirmed"""
+        with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
+            x714_device = X714(start_reading=True)
+            x714_device.is_connected = True
+            sent = []
+            x714_device.write = lambda to_send, verbose=True: sent.append(to_send)
+
+            setup = asyncio.create_task(x714_device.setup_reader())
+            await asyncio.sleep(0)
+            assert len(sent) == 1 and sent[0].startswith("#set_cmd:")
+
+            x714_device.on_receive("#SET_CMD:OK\r\n")
+            await asyncio.sleep(0.01)
+            assert "#hotspot:on" in sent
+            assert sent[-1] == "#READ:ON"
+            x714_device.on_receive("#READ:ON\r\n")
+            assert await setup is True
+            await x714_device.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_write_epc_many_sends_all_commands(self):
+        """Test that bulk writes send one command per valid tag without waiting for replies"""
+        with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
+            x714_device = X714()
+            sent = []
+            x714_device.write = lambda to_send, verbose=True: sent.append(to_send)
+
+            tags = [
+                {"target_identifier": None, "target_value": None, "new_epc": f"{n:024x}", "password": "00000000"}
+                for n in range(3)
+            ]
+            tags.append({"target_identifier": None, "target_value": None, "new_epc": "xyz", "password": "00000000"})
+            assert await x714_device.write_epc_many(tags) == [True, True, True, False]
+            assert sent == [f"#WRITE:{n:024x};00000000" for n in range(3)]
+            assert x714_device._pending_commands == {}
+
+    @pytest.mark.asyncio
+    async def test_tcp_writes_are_coalesced(self):
+        """Test that TCP commands sent in the same loop iteration become one write"""
+        with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
+            x714_device = X714(connection_type="TCP")
+            x714_device.write_tcp = AsyncMock()
+
+            x714_device.write("#hotspot:on")
+            x714_device.write("#prefix:")
+            x714_device.write("#protected_inventory:off")
+            await asyncio.sleep(0.01)
+
+            x714_device.write_tcp.assert_called_once_with(
+                "#hotspot:on\n#prefix:\n#protected_inventory:off", verbose=False
+            )
+
+    def test_pack_ble_lines_respects_mtu(self):
+        """Test that BLE packets keep order and stay within the MTU payload"""
+        lines = ["#hotspot:on", "#prefix:", "#protected_inventory:off", "#read:on"]
+        packets = X714.pack_ble_lines(lines, 24)
+
+        assert b"\n".join(packets).decode().split("\n") == lines
+        assert all(len(packet) <= 24 for packet in packets)
+        assert len(packets) == 3
+
+    @pytest.mark.asyncio
+    async def test_ble_runs_on_caller_loop_by_default(self):
+        """Test that the BLE loop runs as a task on the running loop without a thread"""
+        with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
+            x714_device = X714(connection_type="BLE")
+            seen = {}
+
+            async def fake_connect_and_run():
+                seen["loop"] = asyncio.get_running_loop()
+                seen["thread"] = threading.current_thread()
+
+            x714_device.connect_and_run = fake_connect_and_run
+            await x714_device.connect()
+
+            assert seen["loop"] is asyncio.get_running_loop()
+            assert seen["thread"] is threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_ble_thread_callbacks_marshalled_in_batches(self):
+        """Test that callbacks from the BLE thread run on the caller's loop in one batch"""
+        with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
+            x714_device = X714(connection_type="BLE", ble_thread=True)
+            loop = asyncio.get_running_loop()
+            x714_device._ble_main_loop = loop
+            received = []
+
+            def on_receive(data):
+                received.append((data, threading.current_thread()))
+
+            x714_device.on_receive = on_receive
+            with patch.object(loop, "call_soon_threadsafe", wraps=loop.call_soon_threadsafe) as call_soon:
+                worker = threading.Thread(
+                    target=lambda: [x714_device._post_to_main(x714_device.on_receive, f"#line{n}") for n in range(50)]
+                )
+                worker.start()
+                worker.join()
+                await asyncio.sleep(0.01)
+
+            assert [data for data, _ in received] == [f"#line{n}" for n in range(50)]
+            assert all(thread is threading.main_thread() for _, thread in received)
+            assert call_soon.call_count == 1
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
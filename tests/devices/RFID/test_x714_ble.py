@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from unittest.mock import Mock, patch
+
+from smartx_rfid.devices.RFID.X714._main import X714
+from smartx_rfid.devices.RFID.X714.ble_protocol import CHARACTERISTIC_RX
+
+
+class FakeBleakClient:
+    """Bleak client stand-in recording GATT writes."""
+
+    def __init__(self, mtu_size: int = 23):
+        self.mtu_size = mtu_size
+        self.is_connected = True
+        self.writes = []
+
+    async def write_gatt_char(self, uuid, data):
+        self.writes.append((uuid, bytes(data)))
+
+
+@pytest.fixture
+def ble_device():
+    with patch("smartx_rfid.devices.RFID.X714._main.on_event", Mock()):
+        device = X714(connection_type="BLE")
+        device.on_receive = Mock()
+        yield device
+
+
+class TestX714BLE:
+    """Test suite for X714 BLE framing and writes"""
+
+    @pytest.mark.asyncio
+    async def test_lines_split_across_notifications(self, ble_device):
+        """Test that a tag line split over notifications is delivered once, whole"""
+        ble_device.on_ble_data(bytearray(b"#t+@e2001234567890123456|3008"))
+        ble_device.on_ble_data(bytearray(b"33b2ddd901148000000f|1|-75\r\n"))
+
+        ble_device.on_receive.assert_called_once_with(b"#t+@e2001234567890123456|300833b2ddd901148000000f|1|-75\r")
+
+    @pytest.mark.asyncio
+    async def test_several_lines_in_one_notification(self, ble_device):
+        """Test that every line packed in a notification is delivered in order"""
+        ble_device.on_ble_data(bytearray(b"#read:on\n#t+@aa|bb|1|-70\n#t+@cc|dd|2|-71\n#tags"))
+
+        lines = [call.args[0] for call in ble_device.on_receive.call_args_list]
+        assert lines == [b"#read:on", b"#t+@aa|bb|1|-70", b"#t+@cc|dd|2|-71"]
+        assert ble_device.ble_rx_buffer == bytearray(b"#tags")
+
+    @pytest.mark.asyncio
+    async def test_unterminated_notification_flushed_when_idle(self, ble_device):
+        """Test that a notification without newline is still delivered after the idle period"""
+        ble_device.on_ble_data(bytearray(b"#set_cmd:ok"))
+        ble_device.on_receive.assert_not_called()
+
+        await asyncio.sleep(0.15)
+        ble_device.on_receive.assert_called_once_with(b"#set_cmd:ok")
+
+    @pytest.mark.asyncio
+    async def test_write_chunked_to_mtu(self, ble_device):
+        """Test that writes longer than the MTU payload are split in order"""
+        client = FakeBleakClient(mtu_size=23)
+        ble_device.client_ble = client
+        command = ble_device.get_config_cmd().encode()
+
+        assert await ble_device.write_ble(command) is True
+
+        chunks = [data for _, data in client.writes]
+        assert all(uuid == CHARACTERISTIC_RX for uuid, _ in client.writes)
+        assert all(len(chunk) <= 20 for chunk in chunks)
+        assert b"".join(chunks) == command
+
+    @pytest.mark.asyncio
+    async def test_write_uses_negotiated_mtu(self, ble_device):
+        """Test that a larger negotiated MTU sends the command in one write"""
+        client = FakeBleakClient(mtu_size=247)
+        ble_device.client_ble = client
+
+        assert await ble_device.write_ble(ble_device.get_config_cmd().encode()) is True
+        assert len(client.writes) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import pytest
+from unittest.mock import Mock
+
+from smartx_rfid.devices.RFID.X714.tcp_protocol import TCPLineProtocol
+
+
+async def start_server():
+    """Start a local server and return it with a queue of accepted writers."""
+    writers = asyncio.Queue()
+
+    async def handle(reader, writer):
+        await writers.put(writer)
+        await reader.read()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], writers
+
+
+async def legacy_receive(reader):
+    """Polling receive loop used before TCPLineProtocol, kept for the benchmark."""
+    buffer = ""
+    while True:
+        try:
+            data = await asyncio.wait_for(reader.read(1024), timeout=0.1)
+        except asyncio.TimeoutError:
+            buffer = ""
+            continue
+        if not data:
+            return
+        buffer += data.decode(errors="ignore")
+
+
+class TestTCPLineProtocol:
+    """Test suite for the X714 TCP receive protocol"""
+
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self):
+        """Test that lines are delivered whole regardless of chunk boundaries"""
+        server, port, writers = await start_server()
+        device = Mock()
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_connection(lambda: TCPLineProtocol(device), "127.0.0.1", port)
+        peer = await writers.get()
+
+        peer.write(b"#t+@aaa|bbb|1|-70\n#read:")
+        await peer.drain()
+        await asyncio.sleep(0.02)
+        peer.write(b"on\n\n#tags_cleared\n")
+        await peer.drain()
+        await asyncio.sleep(0.02)
+
+        lines = [call.args[0] for call in device.on_receive.call_args_list]
+        assert lines == [b"#t+@aaa|bbb|1|-70", b"#read:on", b"#tags_cleared"]
+
+        protocol.close()
+        await protocol.wait_closed()
+        server.close()
+        await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_drains_while_paused(self):
+        """Every coroutine waiting in drain() is released, not only the last one"""
+        server, port, writers = await start_server()
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_connection(lambda: TCPLineProtocol(Mock()), "127.0.0.1", port)
+        await writers.get()
+
+        protocol.pause_writing()
+        drains = [asyncio.create_task(protocol.drain()) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        assert not any(task.done() for task in drains)
+        protocol.resume_writing()
+        await asyncio.wait_for(asyncio.gather(*drains), 1)
+
+        # Waiters still paused when the connection drops fail instead of hanging
+        protocol.pause_writing()
+        drains = [asyncio.create_task(protocol.drain()) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        protocol.close()
+        results = await asyncio.wait_for(asyncio.gather(*drains, return_exceptions=True), 1)
+        assert all(isinstance(result, ConnectionResetError) for result in results)
+
+        server.close()
+        await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_partial_line_flushed_when_idle(self):
+        """Test that a line without delimiter is flushed after the idle period"""
+        server, port, writers = await start_server()
+        device = Mock()
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_connection(lambda: TCPLineProtocol(device, idle_flush=0.05), "127.0.0.1", port)
+        peer = await writers.get()
+
+        peer.write(b"#set_cmd:ok")
+        await peer.drain()
+        await asyncio.sleep(0.01)
+        device.on_receive.assert_not_called()
+
+        await asyncio.sleep(0.1)
+        device.on_receive.assert_called_once_with(b"#set_cmd:ok")
+
+        peer.close()
+        await protocol.wait_closed()
+        assert protocol.is_closing()
+        server.close()
+        await server.wait_closed()
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_idle_cpu_benchmark_100_readers(self):
+        """Benchmark: CPU used by 100 idle connections, protocol vs legacy polling loop"""
+        readers = 100
+        duration = 1.0
+        server, port, writers = await start_server()
+        loop = asyncio.get_running_loop()
+
+        # Legacy wait_for polling
+        streams = [await asyncio.open_connection("127.0.0.1", port) for _ in range(readers)]
+        tasks = [asyncio.create_task(legacy_receive(reader)) for reader, _ in streams]
+        start = time.process_time()
+        await asyncio.sleep(duration)
+        legacy_cpu = time.process_time() - start
+        for task in tasks:
+            task.cancel()
+        for _, writer in streams:
+            writer.close()
+
+        # Event-driven protocol
+        protocols = [
+            (await loop.create_connection(lambda: TCPLineProtocol(Mock()), "127.0.0.1", port))[1]
+            for _ in range(readers)
+        ]
+        start = time.process_time()
+        await asyncio.sleep(duration)
+        protocol_cpu = time.process_time() - start
+        for protocol in protocols:
+            protocol.close()
+
+        print(
+            f"\nidle CPU for {readers} readers over {duration}s: legacy={legacy_cpu:.4f}s protocol={protocol_cpu:.4f}s"
+        )
+        assert protocol_cpu < legacy_cpu
+
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+from unittest.mock import Mock
+
+from smartx_rfid.devices import (
+    SERIAL,
+    TCP,
+    DelimiterDecoder,
+    FixedSizeDecoder,
+    LengthPrefixedDecoder,
+    StxEtxDecoder,
+    get_decoder,
+)
+from smartx_rfid.utils.crc import crc16
+
+
+def feed_bytewise(decoder, data: bytes) -> list[bytes]:
+    frames = []
+    for i in range(len(data)):
+        frames.extend(bytes(frame) for frame in decoder.feed(data[i : i + 1]))
+    return frames
+
+
+def stx_etx_frame(payload: bytes) -> bytes:
+    crc = crc16(payload)
+    return b"\x02" + payload + b"\x03" + bytes([crc & 0xFF, crc >> 8])
+
+
+class TestDecoders:
+    """Frame decoders fed whole and byte by byte"""
+
+    def test_delimiter(self):
+        decoder = DelimiterDecoder(b"\r\n")
+        frames = decoder.feed(b"abc\r\ndef\r\ngh")
+        assert [bytes(f) for f in frames] == [b"abc", b"def"]
+        assert decoder.pending == 2
+        assert [bytes(f) for f in decoder.feed(b"i\r")] == []
+        assert decoder.feed(b"\nx") == [b"ghi"]
+
+    def test_delimiter_bytewise(self):
+        data = b"one\r\ntwo\r\n\r\nthree\r\n"
+        assert feed_bytewise(DelimiterDecoder(b"\r\n"), data) == [b"one", b"two", b"", b"three"]
+
+    def test_delimiter_max_length(self):
+        decoder = DelimiterDecoder(max_length=4)
+        assert decoder.feed(b"0123456789") == []
+        assert decoder.pending == 0
+        assert [bytes(f) for f in decoder.feed(b"ab\n")] == [b"ab"]
+
+    def test_zero_copy_frames(self):
+        """Frames of a chunk parsed with an empty buffer are views of that chunk"""
+        data = b"\x00\x03abc\x00\x01d"
+        frames = LengthPrefixedDecoder().feed(data)
+        assert all(isinstance(f, memoryview) for f in frames)
+        assert [bytes(f) for f in frames] == [b"\x00\x03abc", b"\x00\x01d"]
+        assert frames[0].obj is data
+
+    def test_fixed_size(self):
+        decoder = FixedSizeDecoder(4)
+        assert [bytes(f) for f in decoder.feed(b"abcdefghij")] == [b"abcd", b"efgh"]
+        assert decoder.feed(b"kl") == [b"ijkl"]
+        assert feed_bytewise(FixedSizeDecoder(3), b"abcdef") == [b"abc", b"def"]
+
+    def test_length_prefixed(self):
+        decoder = LengthPrefixedDecoder(length_size=1, length_offset=1, length_adjustment=2)
+        frame = b"\xaa\x02hiCC"
+        assert feed_bytewise(decoder, frame * 3) == [frame] * 3
+
+    def test_length_prefixed_little_endian(self):
+        decoder = LengthPrefixedDecoder(length_size=2, byteorder="little")
+        assert [bytes(f) for f in decoder.feed(b"\x02\x00ok")] == [b"\x02\x00ok"]
+
+    def test_length_prefixed_resync(self):
+        decoder = LengthPrefixedDecoder(length_size=1, max_length=8)
+        assert [bytes(f) for f in decoder.feed(b"\xff\x02ab")] == [b"\x02ab"]
+
+    def test_stx_etx(self):
+        data = b"noise" + stx_etx_frame(b"tag1") + stx_etx_frame(b"tag2")
+        assert feed_bytewise(StxEtxDecoder(), data) == [b"tag1", b"tag2"]
+
+    def test_stx_etx_bad_crc(self):
+        decoder = StxEtxDecoder()
+        bad = bytearray(stx_etx_frame(b"tag1"))
+        bad[-1] ^= 0xFF
+        frames = decoder.feed(bytes(bad) + stx_etx_frame(b"tag2"))
+        assert [bytes(f) for f in frames] == [b"tag2"]
+        assert decoder.crc_errors == 1
+
+    def test_stx_etx_without_crc(self):
+        decoder = StxEtxDecoder(crc=False)
+        assert [bytes(f) for f in decoder.feed(b"\x02abc\x03\x02de")] == [b"abc"]
+        assert decoder.feed(b"\x03") == [b"de"]
+
+    def test_reset(self):
+        decoder = FixedSizeDecoder(4)
+        decoder.feed(b"ab")
+        decoder.reset()
+        assert decoder.pending == 0
+        assert [bytes(f) for f in decoder.feed(b"cdef")] == [b"cdef"]
+
+    def test_get_decoder(self):
+        assert get_decoder(None) is None
+        assert isinstance(get_decoder("DELIMITER"), DelimiterDecoder)
+
+        decoder = get_decoder({"TYPE": "delimiter", "DELIMITER": "\r\n"})
+        assert decoder.delimiter == b"\r\n"
+
+        decoder = get_decoder({"TYPE": "LENGTH_PREFIXED", "LENGTH_SIZE": 4, "BYTEORDER": "little"})
+        assert (decoder.length_size, decoder.byteorder) == (4, "little")
+
+        assert get_decoder({"TYPE": "FIXED_SIZE", "SIZE": 8}).size == 8
+        assert get_decoder({"TYPE": "STX_ETX", "CRC": False}).crc_size == 0
+
+        with pytest.raises(ValueError):
+            get_decoder({"TYPE": "UNKNOWN"})
+
+
+class TestDeviceDecoders:
+    """SERIAL and TCP emit decoded frames"""
+
+    @pytest.mark.asyncio
+    async def test_serial_frames(self):
+        device = SERIAL(decoder=FixedSizeDecoder(3))
+        device.on_event = Mock()
+        device.data_received(b"abcd")
+        device.data_received(b"ef")
+
+        frames = [bytes(call.args[2]) for call in device.on_event.call_args_list]
+        assert frames == [b"abc", b"def"]
+        assert all(call.args[1] == "frame" for call in device.on_event.call_args_list)
+        assert device._timeout_handle is not None
+        device.connection_lost(None)
+
+    @pytest.mark.asyncio
+    async def test_serial_timeout_resets_decoder(self, monkeypatch):
+        monkeypatch.setattr("smartx_rfid.devices.generic.SERIAL._main.RX_TIMEOUT", 0.01)
+        device = SERIAL(decoder=FixedSizeDecoder(3))
+        device.on_event = Mock()
+        device.data_received(b"ab")
+        await asyncio.sleep(0.05)
+        assert device.decoder.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_tcp_frames(self):
+        device = TCP(decoder=StxEtxDecoder())
+        device.on_event = Mock()
+        device.reader = asyncio.StreamReader()
+        device.reader.feed_data(stx_etx_frame(b"tag1") + stx_etx_frame(b"tag2")[:3])
+        device.reader.feed_data(stx_etx_frame(b"tag2")[3:])
+        device.reader.feed_eof()
+
+        await device.receive_data()
+
+        frames = [bytes(call.args[2]) for call in device.on_event.call_args_list]
+        assert frames == [b"tag1", b"tag2"]
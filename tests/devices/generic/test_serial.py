@@ -1,6 +1,55 @@
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
 import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from smartx_rfid.devices import SERIAL, PortDiscoveryService
+
+
+def recorded_stream(lines: int = 5000, seed: int = 7) -> list[bytes]:
+    """Tag-reader style byte stream split into the small chunks a 115200 bps port delivers."""
+    rng = random.Random(seed)
+    data = b"".join(
+        f"#t+@{rng.getrandbits(96):024x}|{rng.getrandbits(96):024x}|{rng.randint(1, 4)}|-{rng.randint(40, 90)}".encode()
+        + rng.choice([b"\n", b"\r\n", b"\r"])
+        for _ in range(lines)
+    )
+    chunks = []
+    position = 0
+    while position < len(data):
+        size = rng.randint(1, 32)
+        chunks.append(data[position : position + size])
+        position += size
+    return chunks
+
+
+def legacy_data_received(device, data):
+    """data_received before the single-timer rewrite, kept for the benchmark."""
+    now = time.time()
+    device.rx_buffer += data
+    device.last_byte_time = now
+
+    if getattr(device, "_legacy_task", None) and not device._legacy_task.done():
+        device._legacy_task.cancel()
+
+    async def timeout_clear():
+        await asyncio.sleep(0.3)
+        if device.last_byte_time and (time.time() - device.last_byte_time) >= 0.3:
+            if device.rx_buffer:
+                device.rx_buffer.clear()
 
-from smartx_rfid.devices import SERIAL
+    device._legacy_task = asyncio.get_running_loop().create_task(timeout_clear())
+
+    while b"\n" in device.rx_buffer or b"\r" in device.rx_buffer:
+        positions = [p for p in [device.rx_buffer.find(b"\n"), device.rx_buffer.find(b"\r")] if p != -1]
+        pos = min(positions)
+        message = device.rx_buffer[:pos].decode(errors="ignore").strip("\r\n")
+        device.rx_buffer = device.rx_buffer[pos + 1 :]
+        if message:
+            device.on_event(device.name, "receive", message)
 
 
 class TestSERIAL:
@@ -32,6 +81,125 @@ class TestSERIAL:
         assert serial_device.port == "COM3"
         assert serial_device.is_auto is False
 
+    @pytest.mark.asyncio
+    async def test_data_received_splits_on_any_delimiter(self):
+        """Test that messages split on CR, LF and CRLF across chunks"""
+        serial_device = SERIAL(name="TEST_SERIAL")
+        serial_device.on_event = Mock()
+
+        serial_device.data_received(b"first\r\nsec")
+        serial_device.data_received(b"ond\rthird\n\nfour")
+
+        messages = [call.args[2] for call in serial_device.on_event.call_args_list]
+        assert messages == ["first", "second", "third"]
+        assert serial_device.rx_buffer == bytearray(b"four")
+
+    @pytest.mark.asyncio
+    async def test_incomplete_message_cleared_after_timeout(self):
+        """Test that one timer clears an incomplete message only after 300 ms of silence"""
+        serial_device = SERIAL(name="TEST_SERIAL")
+        serial_device.on_event = Mock()
+
+        serial_device.data_received(b"par")
+        handle = serial_device._timeout_handle
+        await asyncio.sleep(0.2)
+        serial_device.data_received(b"tial")
+        assert serial_device._timeout_handle is handle
+
+        await asyncio.sleep(0.2)
+        assert serial_device.rx_buffer == bytearray(b"partial")
+
+        await asyncio.sleep(0.2)
+        assert serial_device.rx_buffer == bytearray()
+        assert serial_device._timeout_handle is None
+
+    @pytest.mark.asyncio
+    async def test_failed_open_releases_port(self):
+        """Test that a port which fails to open is not kept reserved for the device"""
+        discovery = PortDiscoveryService(comports=lambda: [SimpleNamespace(vid=1, pid=1, device="COM3")], ttl=5)
+        serial_device = SERIAL(name="SERIAL_1", reconnection_time=0)
+        serial_device.port_discovery = discovery
+        serial_device.backoff.wait = AsyncMock()
+
+        async def fail_open(*args, **kwargs):
+            serial_device._running = False
+            raise OSError("could not open port COM3")
+
+        serial_device._running = True
+        with patch("serial_asyncio.create_serial_connection", side_effect=fail_open):
+            await serial_device.connect()
+
+        assert await discovery.acquire(1, 1, object(), timeout=0) == "COM3"
+
+    @pytest.mark.asyncio
+    async def test_missing_port_backs_off(self):
+        """Test that a missing port waits the backoff instead of spinning on the cached scan"""
+        discovery = PortDiscoveryService(comports=lambda: [], ttl=60)
+        serial_device = SERIAL(name="SERIAL_1", reconnection_time=0)
+        serial_device.port_discovery = discovery
+        waits = []
+
+        async def backoff_wait(name):
+            waits.append(name)
+            if len(waits) == 3:
+                serial_device._running = False
+            await asyncio.sleep(0)
+
+        serial_device.backoff.wait = backoff_wait
+        serial_device._running = True
+        await asyncio.wait_for(serial_device.connect(), 1)
+
+        assert waits == ["SERIAL_1"] * 3
+
+    @pytest.mark.asyncio
+    async def test_data_received_matches_legacy(self):
+        """Test that a recorded stream yields the same messages as the legacy implementation"""
+        chunks = recorded_stream()
+
+        legacy_device = SERIAL(name="LEGACY")
+        legacy_device.on_event = Mock()
+        for chunk in chunks:
+            legacy_data_received(legacy_device, chunk)
+        legacy_device._legacy_task.cancel()
+
+        serial_device = SERIAL(name="NEW")
+        serial_device.on_event = Mock()
+        for chunk in chunks:
+            serial_device.data_received(chunk)
+        if serial_device._timeout_handle is not None:
+            serial_device._timeout_handle.cancel()
+
+        legacy_messages = [call.args[2] for call in legacy_device.on_event.call_args_list]
+        messages = [call.args[2] for call in serial_device.on_event.call_args_list]
+        assert messages == legacy_messages
+        assert len(messages) == 5000
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_data_received_benchmark(self):
+        """Benchmark: recorded stream through data_received, new vs legacy implementation"""
+        chunks = recorded_stream()
+
+        legacy_device = SERIAL(name="LEGACY")
+        legacy_device.on_event = Mock()
+        start = time.perf_counter()
+        for chunk in chunks:
+            legacy_data_received(legacy_device, chunk)
+        legacy_time = time.perf_counter() - start
+        legacy_device._legacy_task.cancel()
+
+        serial_device = SERIAL(name="NEW")
+        serial_device.on_event = Mock()
+        start = time.perf_counter()
+        for chunk in chunks:
+            serial_device.data_received(chunk)
+        new_time = time.perf_counter() - start
+        if serial_device._timeout_handle is not None:
+            serial_device._timeout_handle.cancel()
+
+        print(f"\n{len(chunks)} chunks: legacy={legacy_time:.4f}s new={new_time:.4f}s")
+        assert new_time < legacy_time
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,9 +1,78 @@
+import asyncio
+
 import pytest
+import pytest_asyncio
 from unittest.mock import Mock, patch
 
 from smartx_rfid.devices import TCP
 
 
+class PeerServer:
+    """Local asyncio server: echoes what the device sends and can push raw bytes."""
+
+    def __init__(self):
+        self.server = None
+        self.writer = None
+        self.connected = asyncio.Event()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader, writer):
+        self.writer = writer
+        self.connected.set()
+        while data := await reader.read(1024):
+            writer.write(data)
+
+    async def send(self, data: bytes):
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def received_lines(device) -> list[str]:
+    return [call.args[2] for call in device.on_event.call_args_list if call.args[1] == "receive"]
+
+
+async def wait_for_lines(device, count: int, timeout: float = 2.0) -> list[str]:
+    async def received():
+        while len(received_lines(device)) < count:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(received(), timeout)
+    return received_lines(device)
+
+
+@pytest_asyncio.fixture
+async def peer():
+    server = PeerServer()
+    port = await server.start()
+    devices = []
+
+    async def connect(**kwargs):
+        device = TCP(ip="127.0.0.1", port=port, heartbeat_interval=1000, **kwargs)
+        device.on_event = Mock()
+        task = asyncio.create_task(device.connect())
+        await asyncio.wait_for(server.connected.wait(), 2)
+        devices.append((device, task))
+        return device
+
+    server.connect = connect
+    yield server
+
+    for device, task in devices:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await device.close()
+    await server.close()
+
+
 class TestTCP:
     """Simple test suite for TCP class"""
 
@@ -42,5 +111,119 @@ class TestTCP:
             assert tcp_device.is_connected is False
 
 
+class TestTCPReceive:
+    """Line framing against a local asyncio server"""
+
+    @pytest.mark.asyncio
+    async def test_echo(self, peer):
+        device = await peer.connect()
+        await device.write("hello", verbose=False)
+        await device.write("world", verbose=False)
+        assert await wait_for_lines(device, 2) == ["hello", "world"]
+
+    @pytest.mark.asyncio
+    async def test_lines_batched_per_read(self, peer):
+        device = await peer.connect()
+        batches = []
+        emit_lines = device.emit_lines
+        device.emit_lines = lambda lines: (batches.append(len(lines)), emit_lines(lines))
+
+        await peer.send(b"a\nb\r\n\nc\n")
+        assert await wait_for_lines(device, 3) == ["a", "b", "c"]
+        assert batches == [4]
+
+    @pytest.mark.asyncio
+    async def test_partial_line_flushed_on_timeout(self, peer):
+        device = await peer.connect(partial_timeout=0.05)
+        await peer.send(b"abc")
+        assert await wait_for_lines(device, 1) == ["abc"]
+
+        # The next bytes start a new line
+        await peer.send(b"def\n")
+        assert await wait_for_lines(device, 2) == ["abc", "def"]
+
+    @pytest.mark.asyncio
+    async def test_line_split_across_segments(self, peer):
+        device = await peer.connect(partial_timeout=0.1)
+        for _ in range(5):
+            await peer.send(b"abcd")
+            await asyncio.sleep(0.02)
+            await peer.send(b"efgh\n")
+        assert await wait_for_lines(device, 5) == ["abcdefgh"] * 5
+
+        # The idle timer restarts with every segment
+        for chunk in (b"ab", b"cd", b"ef", b"gh\n"):
+            await peer.send(chunk)
+            await asyncio.sleep(0.06)
+        assert await wait_for_lines(device, 6) == ["abcdefgh"] * 6
+
+    @pytest.mark.asyncio
+    async def test_partial_line_waits_without_timeout(self, peer):
+        device = await peer.connect(partial_timeout=None)
+        await peer.send(b"abc")
+        await asyncio.sleep(0.15)
+        assert received_lines(device) == []
+
+        await peer.send(b"def\n")
+        assert await wait_for_lines(device, 1) == ["abcdef"]
+
+    @pytest.mark.asyncio
+    async def test_custom_separator(self, peer):
+        device = await peer.connect(separator="\r")
+        await peer.send(b"one\rtwo\r")
+        assert await wait_for_lines(device, 2) == ["one", "two"]
+
+    @pytest.mark.asyncio
+    async def test_oversized_line_dropped(self, peer):
+        device = await peer.connect(limit=16, partial_timeout=None)
+        await peer.send(b"x" * 40)
+        await peer.send(b"x" * 40 + b"\nok\n")
+        assert await wait_for_lines(device, 1) == ["ok"]
+
+    @pytest.mark.asyncio
+    async def test_partial_line_at_eof(self, peer):
+        device = await peer.connect(partial_timeout=None)
+        await peer.send(b"tail")
+        peer.writer.close()
+        assert await wait_for_lines(device, 1) == ["tail"]
+
+
+class TestTCPSend:
+    """Outbound queue and write coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_writes_coalesced(self, peer):
+        device = await peer.connect()
+        # Below the high-water mark write() does not yield to the loop
+        for i in range(100):
+            await device.write(f"cmd{i}", verbose=False)
+        assert device.get_send_stats()["queue_depth"] == 100
+
+        assert await wait_for_lines(device, 100) == [f"cmd{i}" for i in range(100)]
+        stats = device.get_send_stats()
+        assert stats["writes"] == 1
+        assert stats["messages_sent"] == 100
+        assert stats["bytes_sent"] == sum(len(f"cmd{i}\n") for i in range(100))
+        assert stats["max_queue_depth"] == 100
+        assert stats["queue_depth"] == stats["queued_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_write_waits_above_high_water(self, peer):
+        device = await peer.connect(high_water=8)
+        await device.write("short", verbose=False)
+        assert device.get_send_stats()["queue_depth"] == 1
+
+        # Over the high-water mark: returns once the writer task took the queue
+        await asyncio.wait_for(device.write("a longer command", verbose=False), 1)
+        assert device.get_send_stats()["queue_depth"] == 0
+        assert await wait_for_lines(device, 2) == ["short", "a longer command"]
+
+    @pytest.mark.asyncio
+    async def test_write_when_disconnected(self):
+        device = TCP()
+        await device.write("lost", verbose=False)
+        assert device.get_send_stats()["queue_depth"] == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,86 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from smartx_rfid.devices import BLEScannerService
+
+
+class FakeScanner:
+    """Scanner backend that emits advertisements on demand."""
+
+    instances = []
+
+    def __init__(self, detection_callback):
+        self.detection_callback = detection_callback
+        self.running = False
+        FakeScanner.instances.append(self)
+
+    async def start(self):
+        self.running = True
+
+    async def stop(self):
+        self.running = False
+
+    def advertise(self, address: str, name: str, rssi: int = -60):
+        self.detection_callback(
+            SimpleNamespace(address=address, name=name), SimpleNamespace(local_name=name, rssi=rssi)
+        )
+
+
+@pytest.fixture
+def scanner_service():
+    FakeScanner.instances = []
+    return BLEScannerService(scanner_factory=FakeScanner)
+
+
+class TestBLEScannerService:
+    """Test suite for the shared BLE scanner"""
+
+    @pytest.mark.asyncio
+    async def test_waiters_share_one_scan_and_resolve_on_advertisement(self, scanner_service):
+        """Test that several devices share one scan and resolve as soon as they advertise"""
+        first = asyncio.create_task(scanner_service.find("SMTX", owner="reader_1"))
+        second = asyncio.create_task(scanner_service.find("SMTX", owner="reader_2"))
+        await asyncio.sleep(0)
+
+        assert len(FakeScanner.instances) == 1
+        scanner = FakeScanner.instances[0]
+        assert scanner.running
+
+        scanner.advertise("AA:00", "OTHER")
+        scanner.advertise("AA:01", "SMTX_1")
+        scanner.advertise("AA:02", "SMTX_2")
+
+        assert {await first, await second} == {"AA:01", "AA:02"}
+        assert not scanner.running
+        assert set(scanner_service.get_devices()) == {"AA:00", "AA:01", "AA:02"}
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_scan(self, scanner_service):
+        """Test that a fresh cached advertisement resolves without scanning"""
+        scanner_service.on_detection(
+            SimpleNamespace(address="AA:01", name="SMTX_1"), SimpleNamespace(local_name="SMTX_1", rssi=-70)
+        )
+
+        assert await scanner_service.find("SMTX", owner="reader_1") == "AA:01"
+        assert FakeScanner.instances == []
+
+    @pytest.mark.asyncio
+    async def test_claimed_address_and_expired_cache_are_skipped(self, scanner_service):
+        """Test that claimed or expired addresses are not handed out"""
+        scanner_service.cache_ttl = 0.05
+        scanner_service.on_detection(
+            SimpleNamespace(address="AA:01", name="SMTX_1"), SimpleNamespace(local_name="SMTX_1", rssi=-70)
+        )
+        assert await scanner_service.find("SMTX", owner="reader_1") == "AA:01"
+        assert await scanner_service.find("SMTX", owner="reader_2", timeout=0.01) is None
+
+        scanner_service.release("reader_1")
+        await asyncio.sleep(0.06)
+        assert await scanner_service.find("SMTX", owner="reader_2", timeout=0.01) is None
+        assert scanner_service.get_devices() == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
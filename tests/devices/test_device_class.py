@@ -1,7 +1,43 @@
+import asyncio
+import json
+import time
+
 import pytest
 from smartx_rfid.devices import DeviceManager
 
 
+def write_devices(path, count: int):
+    for i in range(count):
+        (path / f"TCP_{i}.json").write_text(json.dumps({"READER": "TCP", "IP": "127.0.0.1", "PORT": 4000 + i}))
+
+
+class FakeReader:
+    device_type = "rfid"
+
+    def __init__(self, name: str, delay: float = 0.1, gpi: bool = False):
+        self.name = name
+        self.delay = delay
+        self.is_connected = True
+        self.is_reading = False
+        self.is_gpi_trigger_on = gpi
+
+    async def start_inventory(self):
+        await asyncio.sleep(self.delay)
+        self.is_reading = True
+
+    async def stop_inventory(self):
+        await asyncio.sleep(self.delay)
+        self.is_reading = False
+
+
+def manager_with(readers) -> DeviceManager:
+    manager = DeviceManager(devices_path="devices")
+    for reader in readers:
+        manager.devices.append(reader)
+        manager._devices_by_name[reader.name] = reader
+    return manager
+
+
 class TestDeviceManager:
     def test_device_manager(self):
         devices = DeviceManager(devices_path="devices")
@@ -10,6 +46,179 @@ class TestDeviceManager:
         devices.load_devices()
         assert len(devices) == 2
 
+    def test_name_index(self, tmp_path):
+        write_devices(tmp_path, 3)
+        manager = DeviceManager(devices_path=str(tmp_path))
+        manager.load_devices()
+
+        assert manager.get_device("TCP_1") is next(d for d in manager.devices if d.name == "TCP_1")
+        assert manager.get_device("missing") is None
+        assert manager.get_device_config("TCP_2")["PORT"] == 4002
+        assert manager.get_device_config("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_index_follows_disconnect(self, tmp_path):
+        write_devices(tmp_path, 2)
+        manager = DeviceManager(devices_path=str(tmp_path))
+        manager.load_devices()
+
+        await manager.disconnect_devices()
+        assert manager.get_device("TCP_0") is None
+        assert manager.get_device_info() == []
+
+        manager.load_devices()
+        assert manager.get_device("TCP_0") is not None
+
+    def test_device_info_single_pass(self, tmp_path, monkeypatch):
+        write_devices(tmp_path, 300)
+        manager = DeviceManager(devices_path=str(tmp_path))
+        manager.load_devices()
+
+        # Listing all devices must not look each one up again
+        monkeypatch.setattr(manager, "get_device", lambda name: pytest.fail("get_device called"))
+        info = manager.get_device_info()
+        assert len(info) == 300
+        assert info[0] == {
+            "name": manager.devices[0].name,
+            "is_connected": False,
+            "is_reading": False,
+            "device_type": "generic",
+            "is_gpi_trigger_on": False,
+        }
+        monkeypatch.undo()
+        assert manager.get_device_info("TCP_7")[0]["name"] == "TCP_7"
+
+
+class TestInventoryAll:
+    """Concurrent start/stop across devices"""
+
+    @pytest.mark.asyncio
+    async def test_devices_commanded_concurrently(self):
+        manager = manager_with([FakeReader(f"R{i}") for i in range(20)])
+
+        started = time.perf_counter()
+        results = await manager.stop_inventory_all()
+        assert time.perf_counter() - started < 0.5
+        assert results == {f"R{i}": True for i in range(20)}
+
+        results = await manager.start_inventory_all(detailed=True)
+        assert all(r["success"] and r["error"] is None and r["elapsed"] >= 0.09 for r in results.values())
+        assert manager.any_device_reading()
+
+    @pytest.mark.asyncio
+    async def test_per_device_timeout(self):
+        manager = manager_with([FakeReader("FAST"), FakeReader("SLOW", delay=5)])
+
+        started = time.perf_counter()
+        results = await manager.stop_inventory_all(timeout=0.2, detailed=True)
+        assert time.perf_counter() - started < 0.5
+        assert results["FAST"]["success"] is True
+        assert results["SLOW"] == {"success": False, "elapsed": pytest.approx(0.2, abs=0.1), "error": "timeout"}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        manager = manager_with([FakeReader(f"R{i}") for i in range(4)])
+
+        started = time.perf_counter()
+        results = await manager.start_inventory_all(concurrency=2)
+        assert time.perf_counter() - started >= 0.19
+        assert all(results.values())
+
+    @pytest.mark.asyncio
+    async def test_gpi_devices_skipped(self):
+        manager = manager_with([FakeReader("R0"), FakeReader("GPI", gpi=True)])
+        results = await manager.start_inventory_all(detailed=True)
+        assert results["R0"]["success"] is True
+        assert results["GPI"]["error"] == "gpi_trigger"
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
+
+
+def write_x714(path, name: str, **data):
+    config = {"READER": "X714", "CONNECTION_TYPE": "TCP", "IP": "127.0.0.1", "ANT_DICT": {"1": {"active": True}}}
+    config.update(data)
+    (path / f"{name}.json").write_text(json.dumps(config))
+
+
+class TestReloadDevices:
+    """Applying device file changes without restarting everything"""
+
+    @pytest.mark.asyncio
+    async def test_added_and_removed(self, tmp_path):
+        write_devices(tmp_path, 2)
+        manager = DeviceManager(devices_path=str(tmp_path))
+        manager.load_devices()
+        kept = manager.get_device("TCP_0")
+
+        (tmp_path / "TCP_1.json").unlink()
+        (tmp_path / "NEW.json").write_text(json.dumps({"READER": "TCP", "IP": "127.0.0.1", "PORT": 5000}))
+        report = await manager.reload_devices()
+
+        assert report == {"added": ["NEW"], "removed": ["TCP_1"], "restarted": [], "updated": []}
+        assert manager.get_device("TCP_0") is kept
+        assert manager.get_device("TCP_1") is None
+        assert sorted(d.name for d in manager.devices) == ["NEW", "TCP_0"]
+
+    @pytest.mark.asyncio
+    async def test_changed_device_restarted(self, tmp_path):
+        write_devices(tmp_path, 2)
+        manager = DeviceManager(devices_path=str(tmp_path))
+        manager.load_devices()
+        untouched, old = manager.get_device("TCP_0"), manager.get_device("TCP_1")
+
+        (tmp_path / "TCP_1.json").write_text(json.dumps({"READER": "TCP", "IP": "127.0.0.1", "PORT": 6000}))
+        report = await manager.reload_devices()
+
+        assert report["restarted"] == ["TCP_1"]
+        assert manager.get_device("TCP_0") is untouched
+        assert manager.get_device("TCP_1") is not old
+        assert manager.get_device("TCP_1").port == 6000
+        assert len(manager) == 2
+
+    @pytest.mark.asyncio
+    async def test_runtime_settings_updated_in_place(self, tmp_path):
+        write_x714(tmp_path, "X1")
+        manager = DeviceManager(devices_path=str(tmp_path))
+        manager.load_devices()
+        device = manager.get_device("X1")
+
+        write_x714(tmp_path, "X1", ANT_DICT={"1": {"active": True}, "2": {"active": True}}, SESSION=2)
+        report = await manager.reload_devices()
+
+        assert report["updated"] == ["X1"]
+        assert manager.get_device("X1") is device
+        assert "2" in device.ant_dict and device.session == 2
+
+        # A connection setting needs a restart
+        write_x714(tmp_path, "X1", ANT_DICT={"1": {"active": True}, "2": {"active": True}}, SESSION=2, IP="10.0.0.9")
+        assert (await manager.reload_devices())["restarted"] == ["X1"]
+        assert manager.get_device("X1") is not device
+
+    @pytest.mark.asyncio
+    async def test_unreadable_file_keeps_device(self, tmp_path):
+        write_devices(tmp_path, 1)
+        manager = DeviceManager(devices_path=str(tmp_path))
+        manager.load_devices()
+        device = manager.get_device("TCP_0")
+
+        # e.g. caught half-written
+        (tmp_path / "TCP_0.json").write_text('{"READER": "TC')
+        report = await manager.reload_devices()
+        assert not any(report.values())
+        assert manager.get_device("TCP_0") is device
+
+    @pytest.mark.asyncio
+    async def test_watch_picks_up_new_file(self, tmp_path):
+        manager = DeviceManager(devices_path=str(tmp_path))
+        manager.load_devices()
+        manager.start_watching(interval=0.02)
+
+        write_devices(tmp_path, 1)
+        for _ in range(100):
+            if manager.get_device("TCP_0") is not None:
+                break
+            await asyncio.sleep(0.01)
+        await manager.stop_watching()
+        assert manager.get_device("TCP_0") is not None
@@ -0,0 +1,122 @@
+import asyncio
+import socket
+import time
+
+import pytest
+from unittest.mock import Mock
+
+from smartx_rfid.devices import X714, DNSCache
+
+
+class StubResolver:
+    """getaddrinfo stand-in that blocks a worker thread like a slow DNS server."""
+
+    def __init__(self, delay: float = 0.0, address: str | None = "10.1.2.3"):
+        self.delay = delay
+        self.address = address
+        self.calls = []
+
+    def blocking(self, host, port):
+        self.calls.append(host)
+        time.sleep(self.delay)
+        if self.address is None:
+            raise socket.gaierror(f"unknown host {host}")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (self.address, port))]
+
+    async def __call__(self, host, port, family=0, type=0):
+        return await asyncio.get_running_loop().run_in_executor(None, self.blocking, host, port)
+
+
+class TestDNSCache:
+    """Cached, non-blocking name resolution"""
+
+    @pytest.mark.asyncio
+    async def test_ip_literal_not_resolved(self):
+        resolver = StubResolver()
+        cache = DNSCache(getaddrinfo=resolver)
+        assert await cache.resolve("192.168.1.10", 23) == "192.168.1.10"
+        assert resolver.calls == []
+
+    @pytest.mark.asyncio
+    async def test_cached_until_ttl(self):
+        resolver = StubResolver()
+        cache = DNSCache(ttl=0.05, getaddrinfo=resolver)
+        assert await cache.resolve("reader.local", 23) == "10.1.2.3"
+        assert await cache.resolve("reader.local", 23) == "10.1.2.3"
+        assert resolver.calls == ["reader.local"]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        await asyncio.sleep(0.06)
+        await cache.resolve("reader.local", 23)
+        assert len(resolver.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_shared(self):
+        resolver = StubResolver(delay=0.05)
+        cache = DNSCache(getaddrinfo=resolver)
+        results = await asyncio.gather(*(cache.resolve("reader.local", 23) for _ in range(10)))
+        assert results == ["10.1.2.3"] * 10
+        assert resolver.calls == ["reader.local"]
+
+    @pytest.mark.asyncio
+    async def test_failures_cached(self):
+        resolver = StubResolver(address=None)
+        cache = DNSCache(negative_ttl=10, getaddrinfo=resolver)
+        for _ in range(2):
+            with pytest.raises(OSError):
+                await cache.resolve("missing.local", 23)
+        assert resolver.calls == ["missing.local"]
+
+        cache.invalidate("missing.local")
+        with pytest.raises(OSError):
+            await cache.resolve("missing.local", 23)
+        assert len(resolver.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_resolution_does_not_stall_other_devices(self):
+        """One reader's hostname resolves for 0.5 s while another keeps delivering tags."""
+        writers = asyncio.Queue()
+
+        async def handle(reader, writer):
+            await writers.put(writer)
+            await reader.read()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        resolver = StubResolver(delay=0.5, address="127.0.0.1")
+        slow = X714(name="SLOW", connection_type="TCP", ip="slow.example", tcp_port=port)
+        fast = X714(name="FAST", connection_type="TCP", ip="127.0.0.1", tcp_port=port)
+        for device in (slow, fast):
+            device.dns_cache = DNSCache(getaddrinfo=resolver)
+            device.on_event = Mock()
+
+        fast_task = asyncio.create_task(fast.connect())
+        fast_peer = await asyncio.wait_for(writers.get(), 1)
+        slow_task = asyncio.create_task(slow.connect())
+        await asyncio.sleep(0.05)
+        assert resolver.calls == ["slow.example"] and not slow.is_connected
+
+        # Loop stays responsive and the other reader's lines are processed meanwhile
+        lag = 0.0
+        for _ in range(20):
+            fast_peer.write(b"#tags_cleared\n")
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - started - 0.01)
+        await asyncio.sleep(0.02)
+
+        cleared = [c for c in fast.on_event.call_args_list if c.args[1] == "tags_cleared"]
+        assert len(cleared) == 20
+        assert not slow.is_connected
+        assert lag < 0.1
+
+        # The slow reader connects once its name resolves
+        await asyncio.wait_for(writers.get(), 2)
+
+        for task in (fast_task, slow_task):
+            task.cancel()
+        await asyncio.gather(fast_task, slow_task, return_exceptions=True)
+        for device in (slow, fast):
+            await device.close()
+        server.close()
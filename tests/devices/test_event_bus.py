@@ -0,0 +1,207 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from smartx_rfid.devices import DeviceManager, EventBus
+
+
+class TestEventBus:
+    """Topic subscriptions with bounded per-subscriber queues"""
+
+    @pytest.mark.asyncio
+    async def test_filters(self):
+        bus = EventBus()
+        everything, tags, r1_connection, one_tag = [], [], [], []
+        bus.subscribe(lambda *e: everything.append(e))
+        bus.subscribe(lambda *e: tags.append(e), event_types=["tag"])
+        bus.subscribe(lambda *e: r1_connection.append(e), devices=["R1"], event_types=["connection"])
+        bus.subscribe(lambda *e: one_tag.append(e), tags=["E2801"])
+
+        bus.publish("R1", "connection", True)
+        bus.publish("R2", "connection", True)
+        bus.publish("R1", "tag", {"epc": "E2801", "tid": None})
+        bus.publish("R2", "tag", {"epc": "E2802", "tid": None})
+        await bus.drain(1)
+
+        assert len(everything) == 4
+        assert [e[2]["epc"] for e in tags] == ["E2801", "E2802"]
+        assert r1_connection == [("R1", "connection", True)]
+        assert one_tag == [("R1", "tag", {"epc": "E2801", "tid": None})]
+
+    @pytest.mark.asyncio
+    async def test_async_subscriber(self):
+        bus = EventBus()
+        received = []
+
+        async def handler(name, event_type, data):
+            await asyncio.sleep(0.001)
+            received.append(data)
+
+        bus.subscribe(handler)
+        for i in range(10):
+            bus.publish("R1", "tag", i)
+        await bus.drain(1)
+        assert received == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_drop_policies(self):
+        bus = EventBus()
+        gate = asyncio.Event()
+        oldest, newest = [], []
+
+        def blocked(into):
+            async def handler(name, event_type, data):
+                await gate.wait()
+                into.append(data)
+
+            return handler
+
+        drop_oldest = bus.subscribe(blocked(oldest), maxsize=3, policy="drop_oldest")
+        drop_newest = bus.subscribe(blocked(newest), maxsize=3, policy="drop_newest")
+        # Both subscribers pick the first event up and block on it
+        bus.publish("R1", "tag", 0)
+        await asyncio.sleep(0.01)
+        for i in range(1, 10):
+            bus.publish("R1", "tag", i)
+
+        gate.set()
+        await bus.drain(1)
+        assert oldest == [0, 7, 8, 9]
+        assert newest == [0, 1, 2, 3]
+        assert drop_oldest.dropped == drop_newest.dropped == 6
+
+    @pytest.mark.asyncio
+    async def test_block_policy_keeps_every_event(self):
+        bus = EventBus()
+        received = []
+
+        async def slow(name, event_type, data):
+            await asyncio.sleep(0.001)
+            received.append(data)
+
+        subscription = bus.subscribe(slow, maxsize=5, policy="block")
+        for i in range(50):
+            bus.publish("R1", "tag", i)
+        assert subscription.get_metrics()["queue_depth"] == 50
+        await bus.drain(2)
+        assert received == list(range(50))
+        assert subscription.dropped == 0
+
+        # Producers that can wait are held back instead
+        received.clear()
+        for i in range(50):
+            await bus.publish_async("R1", "tag", i)
+            assert subscription.depth <= 5
+        await bus.drain(2)
+        assert received == list(range(50))
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_does_not_block_publisher(self):
+        bus = EventBus()
+        fast = []
+        bus.subscribe(lambda *e: time.sleep(0.01), name="slow_db", maxsize=10)
+        bus.subscribe(lambda *e: fast.append(e), name="fast")
+
+        started = time.perf_counter()
+        for i in range(1000):
+            bus.publish("R1", "tag", i)
+        # Publishing only enqueues
+        assert time.perf_counter() - started < 0.1
+
+        await asyncio.sleep(0.05)
+        metrics = {m["name"]: m for m in bus.get_metrics()["subscribers"]}
+        assert metrics["slow_db"]["dropped"] == 990
+        assert metrics["slow_db"]["max_depth"] == 10
+        assert metrics["fast"]["dropped"] == 0
+        assert bus.get_metrics()["published"] == 1000
+        bus.close()
+
+    @pytest.mark.asyncio
+    async def test_blocking_subscriber_does_not_stall_loop(self):
+        bus = EventBus()
+        handled = []
+
+        def save(name, event_type, data):
+            time.sleep(0.2)
+            handled.append(data)
+
+        bus.subscribe(save)
+        for i in range(3):
+            bus.publish("R1", "tag", i)
+
+        lag = 0.0
+        for _ in range(30):
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - started - 0.01)
+        assert lag < 0.1
+
+        await bus.drain(2)
+        # Still one event at a time and in order
+        assert handled == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_block_overflow_bounded(self):
+        bus = EventBus()
+        gate = asyncio.Event()
+
+        async def handler(name, event_type, data):
+            await gate.wait()
+
+        subscription = bus.subscribe(handler, maxsize=5, policy="block", max_overflow=10)
+        for i in range(30):
+            bus.publish("R1", "tag", i)
+        metrics = subscription.get_metrics()
+        assert (metrics["queue_depth"], metrics["overflow"], metrics["dropped"]) == (15, 10, 15)
+
+        gate.set()
+        await bus.drain(1)
+        assert subscription.delivered == 15
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_counted(self):
+        bus = EventBus()
+        subscription = bus.subscribe(lambda *e: 1 / 0)
+        bus.publish("R1", "tag", None)
+        bus.publish("R1", "tag", None)
+        await bus.drain(1)
+        assert subscription.errors == 2
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe(self):
+        bus = EventBus()
+        received = []
+        subscription = bus.subscribe(lambda *e: received.append(e))
+        bus.unsubscribe(subscription)
+        bus.publish("R1", "tag", None)
+        await asyncio.sleep(0.01)
+        assert received == [] and len(bus) == 0
+        assert bus.get_metrics()["unmatched"] == 1
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            EventBus().subscribe(print, policy="wait")
+
+
+class TestDeviceManagerEventBus:
+    def test_devices_publish_to_bus(self, tmp_path):
+        (tmp_path / "TCP_0.json").write_text(json.dumps({"READER": "TCP", "IP": "127.0.0.1", "PORT": 1}))
+        bus = EventBus()
+        received = []
+        manager = DeviceManager(devices_path=str(tmp_path), event_func=lambda *e: received.append(e), event_bus=bus)
+        manager.load_devices()
+
+        device = manager.get_device("TCP_0")
+        assert device.on_event == bus.publish
+        assert len(bus) == 1
+        # event_func used to get every event, so its subscription does not drop any
+        assert bus.get_metrics()["subscribers"][0]["policy"] == "block"
+
+        async def emit():
+            device.on_event(device.name, "receive", "line")
+            await bus.drain(1)
+
+        asyncio.run(emit())
+        assert received == [("TCP_0", "receive", "line")]
@@ -0,0 +1,180 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from smartx_rfid.devices import DeviceManager, ThreadedDispatcher
+
+
+class TestThreadedDispatcher:
+    """Blocking handlers off the event loop, serial per device"""
+
+    def test_order_kept_per_device(self):
+        seen = {}
+        active = {}
+        overlaps = []
+        lock = threading.Lock()
+
+        def handler(name, event_type, data):
+            with lock:
+                if active.get(name):
+                    overlaps.append(name)
+                active[name] = True
+            time.sleep(0.0005)
+            with lock:
+                active[name] = False
+                seen.setdefault(name, []).append(data)
+
+        dispatcher = ThreadedDispatcher(handler, max_workers=4, batch=5)
+        for i in range(100):
+            for name in ("R1", "R2", "R3"):
+                dispatcher(name, "tag", i)
+        assert dispatcher.wait_idle(5)
+
+        assert overlaps == []
+        assert seen == {name: list(range(100)) for name in ("R1", "R2", "R3")}
+        dispatcher.close()
+
+    def test_devices_run_in_parallel(self):
+        dispatcher = ThreadedDispatcher(lambda *e: time.sleep(0.05), max_workers=8)
+        started = time.perf_counter()
+        for i in range(8):
+            dispatcher(f"R{i}", "tag", None)
+        assert dispatcher.wait_idle(2)
+        # One device alone would take 0.4 s
+        assert time.perf_counter() - started < 0.2
+        dispatcher.close()
+
+    def test_latency_distribution(self):
+        dispatcher = ThreadedDispatcher(lambda name, event_type, data: time.sleep(data), max_workers=2)
+        for i in range(20):
+            dispatcher("R1", "tag", 0.02 if i == 0 else 0.001)
+        dispatcher.wait_idle(5)
+
+        stats = dispatcher.get_stats()
+        assert stats["handled"] == 20 and stats["pending"] == 0
+        latency = stats["latency"]
+        assert latency["count"] == 20
+        assert 0.001 <= latency["p50"] < latency["max"]
+        assert latency["max"] >= 0.02
+        # Later events waited behind the slow first one
+        assert stats["wait"]["max"] >= 0.015
+        dispatcher.close()
+
+    def test_bounded_and_errors(self):
+        gate = threading.Event()
+
+        def handler(name, event_type, data):
+            gate.wait()
+            if data == "bad":
+                raise ValueError("bad event")
+
+        dispatcher = ThreadedDispatcher(handler, max_workers=1, max_pending=3)
+        for data in ("bad", "ok", "ok", "dropped"):
+            dispatcher("R1", "tag", data)
+        gate.set()
+        dispatcher.wait_idle(2)
+
+        stats = dispatcher.get_stats()
+        assert (stats["handled"], stats["errors"], stats["dropped"]) == (2, 1, 1)
+
+        dispatcher.close()
+        dispatcher("R1", "tag", "late")
+        assert dispatcher.get_stats()["dropped"] == 2
+
+    def test_close_without_waiting(self):
+        gate = threading.Event()
+        dispatcher = ThreadedDispatcher(lambda *e: gate.wait(), max_workers=1)
+        for i in range(5):
+            dispatcher("R1", "tag", i)
+            dispatcher("R2", "tag", i)
+
+        dispatcher.close(wait=False)
+        # Queued events are discarded, nothing is left to wait for
+        assert dispatcher.wait_idle(0.5)
+        gate.set()
+        stats = dispatcher.get_stats()
+        assert stats["pending"] <= 1 and stats["active_lanes"] == 0
+        assert stats["dropped"] >= 8
+
+        dispatcher.start()
+        dispatcher("R1", "tag", None)
+        assert dispatcher.wait_idle(1)
+        dispatcher.close()
+
+    def test_stale_runner_exits_after_restart(self):
+        gate = threading.Event()
+        lock = threading.Lock()
+        active = []
+        overlap = []
+        handled = []
+
+        def handler(name, event_type, data):
+            if data == "old":
+                gate.wait()
+                return
+            with lock:
+                active.append(data)
+                overlap.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(data)
+                handled.append(data)
+
+        dispatcher = ThreadedDispatcher(handler, max_workers=1)
+        dispatcher("R1", "tag", "old")
+        time.sleep(0.05)
+        dispatcher.close(wait=False)
+        dispatcher.start()
+        for i in range(5):
+            dispatcher("R1", "tag", i)
+        time.sleep(0.01)
+        gate.set()
+
+        assert dispatcher.wait_idle(2)
+        assert handled == list(range(5))
+        assert max(overlap) == 1
+        dispatcher.close()
+
+    def test_submit_failure_counts_as_dropped(self):
+        dispatcher = ThreadedDispatcher(lambda *e: None)
+        dispatcher._executor.shutdown()
+        dispatcher("R1", "tag", None)
+        stats = dispatcher.get_stats()
+        assert (stats["dropped"], stats["pending"], stats["active_lanes"]) == (1, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_loop_not_blocked(self):
+        dispatcher = ThreadedDispatcher(lambda *e: time.sleep(0.05), max_workers=2)
+        started = time.perf_counter()
+        for i in range(20):
+            dispatcher("R1", "tag", i)
+        await asyncio.sleep(0)
+        assert time.perf_counter() - started < 0.05
+        dispatcher.close(wait=False)
+
+
+class TestDeviceManagerHandlerThreads:
+    def test_event_func_wrapped(self, tmp_path):
+        (tmp_path / "TCP_0.json").write_text(json.dumps({"READER": "TCP", "IP": "127.0.0.1", "PORT": 1}))
+        threads = []
+        manager = DeviceManager(
+            devices_path=str(tmp_path),
+            event_func=lambda *e: threads.append(threading.current_thread()),
+            handler_threads=2,
+        )
+        manager.load_devices()
+
+        device = manager.get_device("TCP_0")
+        assert device.on_event is manager.dispatcher
+        device.on_event(device.name, "receive", "line")
+        manager.dispatcher.wait_idle(1)
+        assert threads and threads[0] is not threading.main_thread()
+
+        # The handler threads stop with the devices
+        asyncio.run(manager.disconnect_devices())
+        assert manager.dispatcher._executor._shutdown
+        device.on_event(device.name, "receive", "late")
+        assert manager.dispatcher.get_stats()["dropped"] == 1
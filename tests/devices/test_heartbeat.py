@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from unittest.mock import Mock
+
+from smartx_rfid.devices import HeartbeatService
+
+
+class FakeDevice:
+    def __init__(self, name: str):
+        self.name = name
+        self.pings = []
+
+
+class TestHeartbeatService:
+    """Test suite for the shared heartbeat scheduler"""
+
+    @pytest.mark.asyncio
+    async def test_pings_each_device_on_its_interval(self):
+        """Test that devices are pinged on their own intervals from one scheduler"""
+        service = HeartbeatService(jitter=0)
+        loop = asyncio.get_running_loop()
+        fast, slow = FakeDevice("fast"), FakeDevice("slow")
+        service.register(fast, ping=lambda: fast.pings.append(loop.time()), interval=0.02)
+        service.register(slow, ping=lambda: slow.pings.append(loop.time()), interval=0.1)
+
+        await asyncio.sleep(0.25)
+        service.unregister(fast)
+        service.unregister(slow)
+
+        assert len(fast.pings) >= 8
+        assert 2 <= len(slow.pings) <= 3
+        assert service._handle is None
+
+    @pytest.mark.asyncio
+    async def test_first_pings_are_spread(self):
+        """Test that devices registered together do not ping at the same instant"""
+        service = HeartbeatService()
+        loop = asyncio.get_running_loop()
+        devices = [FakeDevice(f"reader_{n}") for n in range(20)]
+        for device in devices:
+            service.register(device, ping=lambda d=device: d.pings.append(loop.time()), interval=0.1)
+
+        await asyncio.sleep(0.11)
+        for device in devices:
+            service.unregister(device)
+
+        first_pings = {round(device.pings[0], 3) for device in devices}
+        assert len(first_pings) > 1
+
+    @pytest.mark.asyncio
+    async def test_dead_peer_detected_by_last_rx(self):
+        """Test that a silent device is reported dead and a talking one is not"""
+        service = HeartbeatService(jitter=0)
+        silent, talking = FakeDevice("silent"), FakeDevice("talking")
+        on_dead_silent, on_dead_talking = Mock(), Mock()
+        service.register(silent, ping=Mock(), interval=0.02, timeout=0.05, on_dead=on_dead_silent)
+        service.register(talking, ping=Mock(), interval=0.02, timeout=0.05, on_dead=on_dead_talking)
+
+        for _ in range(8):
+            await asyncio.sleep(0.015)
+            service.mark_rx(talking)
+
+        on_dead_silent.assert_called_once()
+        on_dead_talking.assert_not_called()
+        assert len(service) == 1
+        service.unregister(talking)
+
+    @pytest.mark.asyncio
+    async def test_is_alive_and_rx_after_ping(self):
+        """Test that a closed connection is dead and the time from ping to the next data is reported"""
+        service = HeartbeatService(jitter=0)
+        device = FakeDevice("reader")
+        alive = {"value": True}
+        on_dead = Mock()
+
+        async def ping():
+            await asyncio.sleep(0.01)
+            service.mark_rx(device)
+
+        service.register(device, ping=ping, interval=0.02, is_alive=lambda: alive["value"], on_dead=on_dead)
+        await asyncio.sleep(0.05)
+
+        stats = service.get_stats()["reader"]
+        assert stats["rx_after_ping"] is not None and stats["rx_after_ping"] >= 0.01
+        assert "rtt" not in stats
+
+        alive["value"] = False
+        await asyncio.sleep(0.05)
+        on_dead.assert_called_once()
+        assert len(service) == 0
+
+    @pytest.mark.asyncio
+    async def test_rx_after_ping_measured_once_per_ping(self):
+        """Only the first data after a ping is timed; later data does not overwrite it"""
+        service = HeartbeatService(jitter=0)
+        device = FakeDevice("reader")
+        pinged = asyncio.Event()
+
+        service.register(device, ping=pinged.set, interval=0.05)
+        await asyncio.wait_for(pinged.wait(), 1)
+        service.mark_rx(device)
+        first = service.get_stats()["reader"]["rx_after_ping"]
+        await asyncio.sleep(0.02)
+        service.mark_rx(device)
+
+        assert first < 0.01
+        assert service.get_stats()["reader"]["rx_after_ping"] == first
+        service.unregister(device)
+
+    @pytest.mark.asyncio
+    async def test_other_running_loop_not_wiped(self):
+        """Registering from a second running loop fails instead of dropping live devices"""
+        service = HeartbeatService()
+        device = FakeDevice("reader")
+        service.register(device, ping=lambda: None, interval=10)
+
+        async def register_elsewhere():
+            service.register(FakeDevice("other"), ping=lambda: None, interval=10)
+
+        with pytest.raises(RuntimeError):
+            await asyncio.to_thread(asyncio.run, register_elsewhere())
+        assert len(service) == 1
+        service.unregister(device)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from smartx_rfid.devices import PortDiscoveryService
+
+
+class FakeComports:
+    """comports() stand-in counting enumerations and the threads they run on."""
+
+    def __init__(self, ports):
+        self.ports = list(ports)
+        self.calls = 0
+        self.threads = set()
+
+    def __call__(self):
+        self.calls += 1
+        self.threads.add(threading.current_thread())
+        return [SimpleNamespace(vid=vid, pid=pid, device=device) for vid, pid, device in self.ports]
+
+
+class TestPortDiscoveryService:
+    """Test suite for the shared serial port discovery"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_devices_share_one_enumeration(self):
+        """Test that many devices reconnecting together enumerate once, off the loop thread"""
+        comports = FakeComports([(1, 1, f"/dev/ttyUSB{n:02d}") for n in range(16)] + [(2, 2, "/dev/ttyACM0")])
+        discovery = PortDiscoveryService(comports=comports, ttl=5)
+        owners = [object() for _ in range(16)]
+
+        ports = await asyncio.gather(*(discovery.acquire(1, 1, owner, timeout=0) for owner in owners))
+
+        assert comports.calls == 1
+        assert threading.main_thread() not in comports.threads
+        assert sorted(ports) == [f"/dev/ttyUSB{n:02d}" for n in range(16)]
+        assert await discovery.get_ports(2, 2) == ["/dev/ttyACM0"]
+
+    @pytest.mark.asyncio
+    async def test_same_vid_pid_gets_distinct_and_stable_ports(self):
+        """Test that devices with the same VID/PID get distinct ports and keep theirs"""
+        comports = FakeComports([(1, 1, "COM3"), (1, 1, "COM4")])
+        discovery = PortDiscoveryService(comports=comports, ttl=0)
+        first, second, third = object(), object(), object()
+
+        assert await discovery.acquire(1, 1, first, timeout=0) == "COM3"
+        assert await discovery.acquire(1, 1, second, timeout=0) == "COM4"
+        assert await discovery.acquire(1, 1, third, timeout=0) is None
+        assert await discovery.acquire(1, 1, second, timeout=0) == "COM4"
+
+        discovery.release(first)
+        assert await discovery.acquire(1, 1, third, timeout=0) == "COM3"
+
+    @pytest.mark.asyncio
+    async def test_waiting_device_woken_when_port_appears(self):
+        """Test that a waiting device gets the port from the next enumeration that finds it"""
+        comports = FakeComports([])
+        discovery = PortDiscoveryService(comports=comports, ttl=0.01, poll_interval=0.02)
+        owner = object()
+
+        task = asyncio.create_task(discovery.acquire(0x0403, 0x6001, owner, timeout=1))
+        await asyncio.sleep(0.03)
+        assert not task.done()
+
+        comports.ports.append((0x0403, 0x6001, "/dev/ttyUSB0"))
+        assert await asyncio.wait_for(task, timeout=0.2) == "/dev/ttyUSB0"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
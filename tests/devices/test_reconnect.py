@@ -0,0 +1,100 @@
+import asyncio
+import socket
+
+import pytest
+
+from smartx_rfid.devices import TCP, X714, ConnectLimiter, ReconnectPolicy, get_policy
+from smartx_rfid.devices.reconnect import Backoff
+
+
+class TestReconnectPolicy:
+    """Backoff delays and per-type configuration"""
+
+    def test_full_jitter_bounds(self):
+        policy = ReconnectPolicy(base=1.0, cap=8.0, factor=2.0)
+        for attempt, upper in [(0, 1.0), (1, 2.0), (2, 4.0), (3, 8.0), (10, 8.0), (10_000, 8.0)]:
+            delays = [policy.delay(attempt) for _ in range(200)]
+            assert all(0 <= d <= upper for d in delays)
+        # Devices failing together do not retry together
+        assert len({round(policy.delay(3), 3) for _ in range(50)}) > 40
+
+    def test_backoff_state(self):
+        backoff = Backoff(ReconnectPolicy(base=1.0, cap=100.0))
+        for _ in range(5):
+            backoff.next_delay()
+        assert backoff.attempt == 5
+        backoff.reset()
+        assert backoff.attempt == 0
+        assert backoff.next_delay() <= 1.0
+
+    def test_from_config(self):
+        default = get_policy("R700_IOT")
+        assert ReconnectPolicy.from_config(None, default) is default
+
+        policy = ReconnectPolicy.from_config({"CAP": 5}, default)
+        assert (policy.base, policy.cap, policy.factor) == (default.base, 5, default.factor)
+
+    def test_device_policies(self):
+        assert X714().backoff.policy is get_policy("X714")
+        assert TCP().backoff.policy is get_policy("TCP")
+
+        custom = ReconnectPolicy(base=0.5, cap=2)
+        assert X714(reconnect_policy=custom).backoff.policy is custom
+
+
+class TestConnectLimiter:
+    """Global limit on concurrent connection attempts"""
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrent_attempts(self):
+        limiter = ConnectLimiter(3)
+        active = peak = 0
+
+        async def attempt():
+            nonlocal active, peak
+            async with limiter.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(attempt() for _ in range(20)))
+        assert peak == 3
+        assert limiter.in_flight == limiter.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_set_limit(self):
+        limiter = ConnectLimiter(1)
+        async with limiter.slot():
+            pass
+        limiter.set_limit(2)
+
+        entered = 0
+
+        async def attempt():
+            nonlocal entered
+            async with limiter.slot():
+                entered += 1
+                await asyncio.sleep(0.05)
+
+        tasks = [asyncio.create_task(attempt()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert entered == 2
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_device_retries_with_backoff(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        device = TCP(ip="127.0.0.1", port=port, reconnect_policy=ReconnectPolicy(base=0.01, cap=0.02))
+        device.connect_limiter = ConnectLimiter(1)
+        task = asyncio.create_task(device.connect())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        # Refused connections are retried quickly but never without a delay
+        assert device.backoff.attempt > 3
+        assert not device.is_connected
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import multiprocessing
+
+import pytest
+import pytest_asyncio
+
+from smartx_rfid.devices import ShardedDeviceManager
+from smartx_rfid.devices.sharding import _ShardWorker
+from smartx_rfid.schemas.tag import WriteTagValidator
+
+
+class LineServer:
+    """Accepts the devices' connections and echoes every line back."""
+
+    def __init__(self):
+        self.writers = []
+
+    async def handle(self, reader, writer):
+        self.writers.append(writer)
+        while line := await reader.readline():
+            writer.write(line)
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        for writer in self.writers:
+            writer.close()
+        self.server.close()
+
+
+def write_tcp_devices(path, port, count: int, **extra):
+    for i in range(count):
+        config = {"READER": "TCP", "IP": "127.0.0.1", "PORT": port, **extra.get(f"TCP_{i}", {})}
+        (path / f"TCP_{i}.json").write_text(json.dumps(config))
+
+
+def received_lines(events) -> list:
+    """Lines received by the devices, without the heartbeat pings the echo server sends back."""
+    return [e[2] for e in events if e[1] == "receive" and e[2] != "ping"]
+
+
+async def wait_until(condition, timeout: float = 10.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest_asyncio.fixture
+async def server():
+    async with LineServer() as server:
+        yield server
+
+
+class TestShardedDeviceManager:
+    """Devices spread over worker processes"""
+
+    def test_assign_shards(self, tmp_path):
+        write_tcp_devices(tmp_path, 1, 7, TCP_5={"SHARD": 0}, TCP_6={"SHARD": 0})
+        shards = ShardedDeviceManager(str(tmp_path), workers=3).assign_shards()
+
+        assert sorted(name for names in shards for name in names) == [f"TCP_{i}" for i in range(7)]
+        assert {"TCP_5", "TCP_6"} <= set(shards[0])
+        assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+    @pytest.mark.asyncio
+    async def test_events_and_commands(self, tmp_path, server):
+        write_tcp_devices(tmp_path, server.port, 4)
+        events = []
+        manager = ShardedDeviceManager(str(tmp_path), event_func=lambda *event: events.append(event), workers=2)
+        try:
+            await manager.connect_devices()
+            await wait_until(lambda: len(server.writers) == 4)
+            await wait_until(lambda: sum(1 for e in events if e[1:] == ("connection", True)) == 4)
+            assert {manager.get_shard(f"TCP_{i}") for i in range(4)} == {0, 1}
+
+            # Lines from every device reach the parent's event_func
+            for i, writer in enumerate(server.writers):
+                writer.write(b"tag-%d\n" % i)
+            await wait_until(lambda: len(received_lines(events)) == 4)
+            assert sorted(received_lines(events)) == [f"tag-{i}" for i in range(4)]
+
+            info = await manager.get_device_info()
+            assert sorted(d["name"] for d in info) == [f"TCP_{i}" for i in range(4)]
+            assert all(d["is_connected"] for d in info)
+            assert (await manager.get_device_info("TCP_1"))[0]["name"] == "TCP_1"
+
+            # Commands are run by the worker that owns the device
+            assert await manager.start_inventory("TCP_0") is False  # not an RFID reader
+            assert await manager.start_inventory("missing") is False
+            ok, error = await manager.write_epc(
+                "TCP_2",
+                WriteTagValidator(target_identifier=None, target_value=None, new_epc="A" * 24, password="0" * 8),
+            )
+            assert not ok and "does not support" in error
+            assert await manager.any_device_reading() is False
+
+            stats = manager.get_ipc_stats()
+            assert sum(s["events"] for s in stats) == len(events)
+            assert all(s["alive"] for s in stats)
+        finally:
+            await manager.close()
+        assert manager.get_ipc_stats() == []
+
+    @pytest.mark.asyncio
+    async def test_events_are_batched(self, tmp_path, server):
+        write_tcp_devices(tmp_path, server.port, 1)
+        received = []
+        manager = ShardedDeviceManager(
+            str(tmp_path), event_func=lambda *e: received.append(e), workers=1, flush_interval=0.05
+        )
+        try:
+            await manager.connect_devices()
+            await wait_until(lambda: len(server.writers) == 1)
+            await wait_until(lambda: len(received) == 1)
+
+            server.writers[0].write(b"".join(b"line-%d\n" % i for i in range(500)))
+            await wait_until(lambda: len(received_lines(received)) == 500)
+            assert received_lines(received) == [f"line-{i}" for i in range(500)]
+            assert manager.get_ipc_stats()[0]["batches"] < 50
+        finally:
+            await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_reload_routes_new_devices(self, tmp_path, server):
+        write_tcp_devices(tmp_path, server.port, 2)
+        manager = ShardedDeviceManager(str(tmp_path), workers=2)
+        try:
+            await manager.connect_devices()
+            await wait_until(lambda: len(server.writers) == 2)
+
+            (tmp_path / "TCP_0.json").unlink()
+            (tmp_path / "NEW.json").write_text(json.dumps({"READER": "TCP", "IP": "127.0.0.1", "PORT": server.port}))
+            report = await manager.reload_devices()
+
+            assert report["added"] == ["NEW"] and report["removed"] == ["TCP_0"]
+            assert manager.get_shard("NEW") is not None and manager.get_shard("TCP_0") is None
+            await wait_until(lambda: len(server.writers) == 3)
+            names = sorted(d["name"] for d in await manager.get_device_info())
+            assert names == ["NEW", "TCP_1"]
+        finally:
+            await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_stop_answers_calls_in_flight(self, tmp_path):
+        parent, child = multiprocessing.Pipe()
+        worker = _ShardWorker(child, str(tmp_path), [], batch_size=10, flush_interval=0.01, options={})
+
+        async def never_returns():
+            await asyncio.Event().wait()
+
+        worker.manager.get_startup_report = never_returns
+        run = asyncio.create_task(worker.run())
+        assert await asyncio.to_thread(parent.recv) == ("ready", None)
+
+        parent.send(("call", 1, "get_startup_report", (), {}))
+        await wait_until(lambda: len(worker._calls) == 1)
+        parent.send(("stop",))
+
+        reply = await asyncio.wait_for(asyncio.to_thread(parent.recv), 5)
+        assert reply[:2] == ("error", 1) and "CancelledError" in reply[2]
+        await asyncio.wait_for(run, 5)
+        assert worker._calls == set()
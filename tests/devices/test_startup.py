@@ -0,0 +1,133 @@
+import asyncio
+import json
+
+import pytest
+
+from smartx_rfid.devices import DeviceManager, StartupScheduler
+
+
+class FakeDevice:
+    def __init__(self, name: str, connect_after: float | None = 0.02):
+        self.name = name
+        self.connect_after = connect_after
+        self.is_connected = False
+
+    async def connect(self):
+        if self.connect_after is not None:
+            await asyncio.sleep(self.connect_after)
+            self.is_connected = True
+        await asyncio.Event().wait()
+
+
+class Starter:
+    """Starts fake devices and tracks how many are still connecting."""
+
+    def __init__(self):
+        self.order = []
+        self.tasks = []
+        self.connecting = self.peak = 0
+
+    def __call__(self, device):
+        self.order.append(device.name)
+        self.tasks.append(asyncio.create_task(self.run(device)))
+        return self.tasks[-1]
+
+    async def run(self, device):
+        self.connecting += 1
+        self.peak = max(self.peak, self.connecting)
+        connect = asyncio.create_task(device.connect())
+        while not device.is_connected and not connect.done():
+            await asyncio.sleep(0.005)
+        self.connecting -= 1
+        await connect
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+class TestStartupScheduler:
+    """Paced, prioritized device startup"""
+
+    @pytest.mark.asyncio
+    async def test_limits_devices_connecting(self):
+        scheduler = StartupScheduler(max_concurrent=4, interval=0, poll=0.005)
+        starter = Starter()
+        devices = [FakeDevice(f"D{i}") for i in range(20)]
+
+        await scheduler.run(devices, starter)
+
+        assert starter.peak <= 4
+        assert len(scheduler.report) == 20
+        assert all(0 < elapsed < 1 for elapsed in scheduler.report.values())
+        await starter.stop()
+
+    @pytest.mark.asyncio
+    async def test_paced_starts(self):
+        scheduler = StartupScheduler(max_concurrent=100, interval=0.02, poll=0.005)
+        starter = Starter()
+        loop = asyncio.get_running_loop()
+        started = []
+
+        def start(device):
+            started.append(loop.time())
+            return starter(device)
+
+        await scheduler.run([FakeDevice(f"D{i}", connect_after=0) for i in range(5)], start)
+        gaps = [b - a for a, b in zip(started, started[1:])]
+        assert min(gaps) >= 0.015
+        await starter.stop()
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        scheduler = StartupScheduler(max_concurrent=1, interval=0, poll=0.005)
+        starter = Starter()
+        priorities = {"low": 0, "high": 10, "mid": 5, "also_low": 0}
+        devices = [FakeDevice(name) for name in priorities]
+
+        await scheduler.run(devices, starter, priority=lambda d: priorities[d.name])
+        assert starter.order == ["high", "mid", "low", "also_low"]
+        await starter.stop()
+
+    @pytest.mark.asyncio
+    async def test_timeout_releases_slot(self):
+        scheduler = StartupScheduler(max_concurrent=1, interval=0, timeout=0.05, poll=0.005)
+        starter = Starter()
+        devices = [FakeDevice("dead", connect_after=None), FakeDevice("ok")]
+
+        await asyncio.wait_for(scheduler.run(devices, starter), 1)
+        assert scheduler.report["dead"] is None
+        assert scheduler.report["ok"] is not None
+        # The device that did not connect keeps trying
+        assert not starter.tasks[0].done()
+        await starter.stop()
+
+    @pytest.mark.asyncio
+    async def test_skipped_devices(self):
+        scheduler = StartupScheduler(interval=0)
+        await scheduler.run([FakeDevice("gone")], lambda device: None)
+        assert scheduler.report == {} and scheduler.started == 0
+
+
+class TestDeviceManagerStartup:
+    @pytest.mark.asyncio
+    async def test_connect_devices_report(self, tmp_path):
+        server = await asyncio.start_server(lambda r, w: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        for name, priority in [("A", 0), ("B", 5), ("C", 1)]:
+            config = {"READER": "TCP", "IP": "127.0.0.1", "PORT": port, "PRIORITY": priority}
+            (tmp_path / f"{name}.json").write_text(json.dumps(config))
+
+        manager = DeviceManager(devices_path=str(tmp_path), startup_concurrency=1, startup_interval=0)
+        await manager.connect_devices()
+        await asyncio.wait_for(manager.wait_startup(), 5)
+
+        report = manager.get_startup_report()
+        assert list(report) == ["B", "C", "A"]
+        assert all(elapsed is not None for elapsed in report.values())
+        assert all(device.is_connected for device in manager.devices)
+
+        await manager.cancel_connect_tasks()
+        await manager.disconnect_devices()
+        server.close()
@@ -0,0 +1,223 @@
+import asyncio
+import socket
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from smartx_rfid.devices import X714, TCPListenerService
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_reader(listener, port, **kwargs) -> X714:
+    kwargs.setdefault("ip", "127.0.0.1")
+    device = X714(connection_type="TCP", tcp_mode="SERVER", listen_host="127.0.0.1", tcp_port=port, **kwargs)
+    device.tcp_listener = listener
+    device.on_event = Mock()
+    return device
+
+
+async def wait_until(condition, timeout: float = 2.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+async def start(devices):
+    tasks = [asyncio.create_task(device.connect()) for device in devices]
+    # Wait until every device is registered and its server is listening
+    for device in devices:
+        listener = device.tcp_listener
+        await wait_until(lambda: listener._devices.get(device) in listener._servers)
+    return tasks
+
+
+async def stop(devices, tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for device in devices:
+        await device.close()
+
+
+def events(device, event_type):
+    return [call.args[2] for call in device.on_event.call_args_list if call.args[1] == event_type]
+
+
+class TestTCPListener:
+    """Readers connecting in to the shared listener"""
+
+    @pytest.mark.asyncio
+    async def test_identified_by_ip(self):
+        listener, port = TCPListenerService(), free_port()
+        device = make_reader(listener, port)
+        tasks = await start([device])
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await wait_until(lambda: device.is_connected)
+        # Reader setup is sent on connection
+        assert await asyncio.wait_for(reader.readline(), 1)
+
+        writer.write(b"#read:on\n")
+        await wait_until(lambda: device.is_reading)
+        assert listener.get_peers() == {device.name: "127.0.0.1"}
+
+        writer.close()
+        await wait_until(lambda: not device.is_connected)
+        assert events(device, "connection") == [False]
+        assert listener.get_peers() == {device.name: None}
+
+        await stop([device], tasks)
+
+    @pytest.mark.asyncio
+    async def test_identified_by_hello(self):
+        listener, port = TCPListenerService(), free_port()
+        devices = [make_reader(listener, port, name=f"R{i}", tcp_hello=f"hello-{i}") for i in range(2)]
+        tasks = await start(devices)
+
+        _, writer1 = await asyncio.open_connection("127.0.0.1", port)
+        _, writer0 = await asyncio.open_connection("127.0.0.1", port)
+        writer1.write(b"hello-1\n#tags_cleared\n")
+        writer0.write(b"hello-0\n")
+        await wait_until(lambda: all(d.is_connected for d in devices))
+
+        await wait_until(lambda: events(devices[1], "tags_cleared") == [True])
+        assert events(devices[0], "tags_cleared") == []
+
+        for writer in (writer0, writer1):
+            writer.close()
+        await stop(devices, tasks)
+
+    @pytest.mark.asyncio
+    async def test_unknown_peers_closed(self):
+        listener, port = TCPListenerService(hello_timeout=0.1), free_port()
+        by_ip = make_reader(listener, port, name="BY_IP", ip="10.0.0.1")
+        tasks = await start([by_ip])
+
+        # Unknown IP and nobody expects a hello
+        reader, _ = await asyncio.open_connection("127.0.0.1", port)
+        assert await asyncio.wait_for(reader.read(), 1) == b""
+
+        by_hello = make_reader(listener, port, name="BY_HELLO", tcp_hello="me")
+        tasks += await start([by_hello])
+
+        # Wrong hello
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"someone else\n")
+        assert await asyncio.wait_for(reader.read(), 1) == b""
+
+        # No hello in time
+        reader, _ = await asyncio.open_connection("127.0.0.1", port)
+        assert await asyncio.wait_for(reader.read(), 1) == b""
+        assert not by_ip.is_connected and not by_hello.is_connected
+
+        await stop([by_ip, by_hello], tasks)
+
+    @pytest.mark.asyncio
+    async def test_reconnect_replaces_connection(self):
+        listener, port = TCPListenerService(), free_port()
+        device = make_reader(listener, port, tcp_hello="r")
+        tasks = await start([device])
+
+        old_reader, old_writer = await asyncio.open_connection("127.0.0.1", port)
+        old_writer.write(b"r\n")
+        await wait_until(lambda: device.is_connected)
+        first = device.writer
+
+        _, new_writer = await asyncio.open_connection("127.0.0.1", port)
+        new_writer.write(b"r\n")
+        await wait_until(lambda: device.writer is not first)
+
+        # The old socket is closed and its loss does not disconnect the device
+        assert await asyncio.wait_for(old_reader.read(), 1) is not None
+        await asyncio.sleep(0.05)
+        assert device.is_connected
+
+        new_writer.close()
+        await stop([device], tasks)
+
+    @pytest.mark.asyncio
+    async def test_server_closed_with_last_device(self):
+        listener, port = TCPListenerService(), free_port()
+        device = make_reader(listener, port)
+        tasks = await start([device])
+        assert len(listener._servers) == 1
+
+        await stop([device], tasks)
+        assert listener._servers == {}
+        with pytest.raises(OSError):
+            await asyncio.open_connection("127.0.0.1", port)
+
+    @pytest.mark.asyncio
+    async def test_many_readers_one_port(self):
+        listener, port = TCPListenerService(), free_port()
+        devices = [make_reader(listener, port, name=f"R{i}", tcp_hello=f"R{i}") for i in range(300)]
+        tasks = await start(devices)
+
+        writers = []
+        for i in range(len(devices)):
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"R{i}\n#tags_cleared\n".encode())
+            writers.append(writer)
+
+        await wait_until(lambda: all(events(d, "tags_cleared") == [True] for d in devices), timeout=10)
+        assert len(listener._servers) == 1
+
+        for writer in writers:
+            writer.close()
+        await stop(devices, tasks)
+
+    @pytest.mark.asyncio
+    async def test_bind_failure_retried(self):
+        listener, port = TCPListenerService(), free_port()
+        device = make_reader(listener, port)
+
+        async def pause(name):
+            await asyncio.sleep(0.01)
+
+        device.backoff.wait = AsyncMock(side_effect=pause)
+
+        blocker = socket.socket()
+        blocker.bind(("127.0.0.1", port))
+        blocker.listen()
+        task = asyncio.create_task(device.connect())
+        await wait_until(lambda: device.backoff.wait.await_count >= 1)
+        # The failed bind left nothing registered
+        assert listener._devices == {} and listener._servers == {}
+
+        blocker.close()
+        await wait_until(lambda: listener._devices.get(device) in listener._servers)
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        await wait_until(lambda: device.is_connected)
+
+        writer.close()
+        await writer.wait_closed()
+        await stop([device], [task])
+
+    @pytest.mark.asyncio
+    async def test_peer_buffer_grows_only_when_filled(self):
+        listener, port = TCPListenerService(buffer_size=1024, max_buffer_size=4096), free_port()
+        devices = [make_reader(listener, port, name=f"R{i}", tcp_hello=f"R{i}") for i in range(2)]
+        tasks = await start(devices)
+
+        writers = []
+        for i, payload in enumerate((b"#tags_cleared\n", b"#tags_cleared\n" + b"x" * 20_000 + b"\n")):
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"R{i}\n".encode() + payload)
+            writers.append(writer)
+        await wait_until(lambda: all(events(d, "tags_cleared") == [True] for d in devices))
+        await asyncio.sleep(0.05)
+
+        quiet, busy = (device.writer for device in devices)
+        assert len(quiet._buffer) == 1024
+        assert len(busy._buffer) == 4096
+
+        for writer in writers:
+            writer.close()
+        await stop(devices, tasks)
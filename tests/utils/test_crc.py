@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from smartx_rfid.devices import SERIAL
+from smartx_rfid.utils import crc16, crc16_many, verify_crc
+
+
+def bitwise_crc16(data: bytes, poly=0x8408):
+    """Bit-by-bit CRC16 previously used by SERIAL.crc16, kept as reference."""
+    crc = 0xFFFF
+    for byte in data[:-2]:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ poly
+            else:
+                crc >>= 1
+    return crc & 0xFFFF
+
+
+def random_frames(count: int = 500, seed: int = 3) -> list[bytes]:
+    rng = random.Random(seed)
+    return [bytes(rng.getrandbits(8) for _ in range(rng.randint(2, 300))) for _ in range(count)]
+
+
+class TestCRC16:
+    def test_matches_bitwise_reference(self):
+        """Differential test of the table implementation against the bitwise one"""
+        serial_device = SERIAL()
+        for frame in random_frames():
+            assert serial_device.crc16(frame) == bitwise_crc16(frame)
+            assert crc16(frame[:-2]) == bitwise_crc16(frame)
+
+    def test_other_polynomial(self):
+        """Test that a different polynomial gets its own table"""
+        for frame in random_frames(50):
+            assert crc16(frame[:-2], poly=0xA001) == bitwise_crc16(frame, poly=0xA001)
+
+    def test_known_check_value(self):
+        """CRC-16/MCRF4XX check value for '123456789'"""
+        assert crc16(b"123456789") == 0x6F91
+
+    def test_verify_crc(self):
+        """Test that frames written by SERIAL verify and corrupted ones do not"""
+        serial_device = SERIAL()
+        for frame in random_frames(100):
+            crc = serial_device.crc16(frame)
+            sent = frame[:-2] + bytes([crc & 0xFF, crc >> 8])
+            assert verify_crc(sent)
+            assert serial_device.verify_crc(sent)
+            corrupted = bytes([sent[0] ^ 0x01]) + sent[1:]
+            assert not verify_crc(corrupted)
+        assert not verify_crc(b"\x01")
+
+    def test_crc16_many(self):
+        """Test that the batch API matches per-frame results"""
+        frames = [frame[:-2] for frame in random_frames(100)]
+        assert crc16_many(frames) == [crc16(frame) for frame in frames]
+        assert crc16_many([]) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])